@@ -0,0 +1,309 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_workbook import generate_survey_frames, write_workbook
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# AppTest로 실행할 벤치마크 대상 (모듈, file_id를 받는 함수)
+PAGE_CASES = {
+    "page.respondent": ("frontend.pages.respondent_analysis", "show_basic_status"),
+    "page.oci": ("frontend.pages.oci_analysis", "show_oci_analysis"),
+    "page.cgs": ("frontend.pages.cgs_analysis", "show_cgs_analysis"),
+    "page.correlation": ("frontend.pages.correlation_analysis", "show_correlation_analysis"),
+    "page.trend": ("frontend.pages.trend_analysis", "show_trend_analysis"),
+    "report.comprehensive": ("frontend.services.ai_analysis", "generate_comprehensive_report")
+}
+
+def _render_page(module_name, func_name, file_id):
+    # AppTest.from_function은 이 함수 본문만 스크립트로 실행하므로 import를 내부에 둠
+    import importlib
+    page = importlib.import_module(module_name)
+    getattr(page, func_name)(file_id)
+
+def _render_editor(file_id):
+    # fragment rerun 시 실행되는 범위 = AI 분석 컴포넌트 본문
+    from frontend.components.ai_analysis import show_ai_analysis
+    show_ai_analysis(file_id, None, ("respondent", "department"), "dept")
+
+def timed(func, repeat=1):
+    """func를 repeat회 실행하고 (마지막 결과, 초 단위 측정값 목록) 반환"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+def record(results, name, timings, **extra):
+    results[name] = {
+        "runs": [round(t, 4) for t in timings],
+        "median_s": round(statistics.median(timings), 4),
+        "min_s": round(min(timings), 4),
+        **extra
+    }
+    print(f"{name:<28} median {results[name]['median_s']:>9.4f}s  {extra if extra else ''}")
+
+def compute_aggregates(frames, instrument):
+    """페이지 SQL과 동일한 집계(응답자별 카테고리 평균 -> 부서별 평균/표준편차)를 pandas로 계산
+
+    페이지와 같이 부서를 정수 코드로 인코딩해 집계하고 마지막에 라벨로 되돌림
+    """
+    respondents = frames["Respondent"][["respondent_id", "department"]]
+    department_code, departments = pd.factorize(respondents["department"])
+    respondents = respondents.assign(department_code=department_code)[["respondent_id", "department_code"]]
+
+    responses = frames[f"{instrument}_R"].merge(frames[f"{instrument}_Q"], on="survey_id")
+    responses = responses.merge(respondents, on="respondent_id")
+    per_respondent = responses.groupby(
+        ["question_category", "department_code", "respondent_id"], sort=False
+    )["response"].mean()
+    agg = per_respondent.groupby(["question_category", "department_code"]).agg(
+        ["count", "mean", "min", "max", "std"]
+    )
+    return agg.rename(index=dict(enumerate(departments)), level="department_code")
+
+def respondent_scores(frames, instrument):
+    """통계 검정 입력(응답자 x 카테고리 평균, 부서 코드)을 페이지 SQL과 같은 형태로 계산"""
+    respondents = frames["Respondent"][["respondent_id", "department"]]
+    department_code, _ = pd.factorize(respondents["department"])
+    respondents = respondents.assign(department_code=department_code)[["respondent_id", "department_code"]]
+
+    responses = frames[f"{instrument}_R"].merge(frames[f"{instrument}_Q"], on="survey_id")
+    responses = responses.merge(respondents, on="respondent_id")
+    return responses.groupby(
+        ["question_category", "department_code", "respondent_id"], sort=False
+    )["response"].mean().rename("score").reset_index()
+
+def run_statistics_benchmarks(frames, params, args, results):
+    """카테고리별 부서 간 검정(ANOVA/Kruskal-Wallis/Cohen's d)과 bootstrap 신뢰구간 계산 시간"""
+    from frontend.services.statistics import department_tests, bootstrap_intervals, BOOTSTRAP_RESAMPLES
+
+    if args.stats_respondents != params["respondents"]:
+        frames = generate_survey_frames(**{**params, "respondents": args.stats_respondents})
+    for instrument in ("OCI", "CGS"):
+        scores = respondent_scores(frames, instrument)
+        (summary, pairs), timings = timed(lambda: department_tests(scores), args.repeat)
+        record(results, f"stats.{instrument.lower()}", timings,
+               respondents=args.stats_respondents, categories=len(summary), pairs=len(pairs))
+        intervals, timings = timed(lambda: bootstrap_intervals(scores), args.repeat)
+        record(results, f"stats.{instrument.lower()}_bootstrap", timings,
+               cells=len(intervals), resamples=BOOTSTRAP_RESAMPLES)
+
+    # OCI circumplex 스타일/클러스터/백분위 점수
+    from frontend.services.circumplex import score_styles
+    scores = respondent_scores(frames, "OCI")
+    (styles, departments, _), timings = timed(lambda: score_styles(scores), args.repeat)
+    record(results, "stats.circumplex", timings, respondents=len(styles), departments=len(departments))
+
+    # OCI 카테고리 점수 기준 문화 세그먼트 (응답자 x 카테고리 행렬)
+    from frontend.services.segments import segment_matrix, DEFAULT_SEGMENTS
+    matrix = respondent_scores(frames, "OCI").pivot_table(
+        index="respondent_id", columns="question_category", values="score")
+    matrix = matrix.fillna(matrix.mean())
+    for method in ("kmeans", "gmm"):
+        labels, timings = timed(lambda: segment_matrix(matrix, DEFAULT_SEGMENTS, method), args.repeat)
+        record(results, f"stats.segments_{method}", timings,
+               respondents=len(matrix), segments=int(labels.max()) + 1)
+
+    # 자격증/기술 태그 정규화, 의견 토큰화와 부서별 TF-IDF (업로드 후처리의 계산 부분)
+    from frontend.services.text_analytics import build_text_index
+    respondents = frames["Respondent"].assign(
+        department_code=pd.factorize(frames["Respondent"]["department"])[0] + 1)
+    (tags, terms, top), timings = timed(lambda: build_text_index(respondents), args.repeat)
+    record(results, "stats.text_index", timings, tags=len(tags), terms=len(terms), department_terms=len(top))
+
+def run_offline_benchmarks(frames, args, results):
+    """DB 없이 가능한 벤치마크: 워크북 쓰기/파싱, 집계 계산"""
+    buffer = io.BytesIO()
+    _, timings = timed(lambda: write_workbook(frames, buffer), 1)
+    record(results, "workbook.write", timings, bytes=buffer.getbuffer().nbytes)
+
+    def parse():
+        buffer.seek(0)
+        xls = pd.ExcelFile(buffer)
+        return {name: xls.parse(name) for name in xls.sheet_names}
+    parsed, timings = timed(parse, args.repeat)
+    record(results, "workbook.parse", timings, rows=sum(len(df) for df in parsed.values()))
+
+    for instrument in ("OCI", "CGS"):
+        agg, timings = timed(lambda: compute_aggregates(frames, instrument), args.repeat)
+        record(results, f"aggregate.{instrument.lower()}", timings, cells=len(agg))
+
+    return buffer
+
+def _app_test(args, script, *script_args):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_function(script, args=script_args, default_timeout=args.page_timeout)
+    at.secrets["DATABASE_URL"] = os.environ["DATABASE_URL"]
+    at.secrets["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "benchmark")
+    return at
+
+def count_queries(func):
+    """func 실행 중 get_db_connection() 연결에서 실행된 쿼리 수"""
+    from frontend.database import get_query_count
+    before = get_query_count()
+    start = time.perf_counter()
+    func()
+    return get_query_count() - before, time.perf_counter() - start
+
+def run_interaction_benchmarks(file_id, args, results):
+    """AI 분석 편집기 상호작용(입력/저장)당 쿼리 수: 전체 rerun vs fragment rerun"""
+    text_key = f"analysis_dept_{file_id}"
+
+    # fragment 적용 전: 상호작용마다 페이지 스크립트 전체가 다시 실행됨
+    page = _app_test(args, _render_page, "frontend.pages.respondent_analysis", "show_basic_status", file_id)
+    page.run()
+    queries, elapsed = count_queries(lambda: page.text_area(key=text_key).input("benchmark").run())
+    record(results, "interaction.full_rerun", [elapsed], queries=queries)
+
+    # fragment 적용 후: 상호작용 시 AI 분석 컴포넌트만 다시 실행됨
+    editor = _app_test(args, _render_editor, file_id)
+    editor.run()
+    queries, elapsed = count_queries(lambda: editor.text_area(key=text_key).input("benchmark").run())
+    record(results, "interaction.fragment_type", [elapsed], queries=queries)
+    save = next(b for b in editor.button if b.key == f"btn_save_dept_{file_id}")
+    queries, elapsed = count_queries(lambda: save.click().run())
+    record(results, "interaction.fragment_save", [elapsed], queries=queries)
+
+    # OCI 페이지의 AI 분석 요청: 페이지가 부르는 분석 함수에 검정 결과가 넘어가 텍스트에 포함되는지 확인
+    oci = _app_test(args, _render_page, "frontend.pages.oci_analysis", "show_oci_analysis", file_id)
+    oci.run()
+    request = next(b for b in oci.button if (b.key or "").startswith("request_oci_"))
+    queries, elapsed = count_queries(lambda: request.click().run())
+    text = oci.text_area(key=request.key.replace("request_", "analysis_", 1)).value or ""
+    record(results, "interaction.oci_ai_request", [elapsed], queries=queries,
+           exceptions=len(oci.exception), errors=len(oci.error), statistics="부서 간 차이" in text)
+    assert not oci.exception and not oci.error, [e.value for e in oci.error] + [e.message for e in oci.exception]
+    assert "부서 간 차이" in text, "OCI AI 분석 텍스트에 검정 결과가 없음"
+
+def run_db_benchmarks(buffer, args, results):
+    """DATABASE_URL이 설정된 경우: 적재, 페이지별 쿼리+렌더링, 리포트 생성, 상호작용"""
+    from frontend.database import get_db_connection, get_query_count
+    from frontend.pages.upload import ingest_workbook
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    file_name = f"benchmark_{datetime.now():%Y%m%d_%H%M%S}"
+
+    def ingest():
+        buffer.seek(0)
+        return ingest_workbook(cur, file_name, buffer, notify=lambda message: None)
+    file_id, timings = timed(ingest, 1)
+    conn.commit()
+    record(results, "ingest.workbook", timings, file_id=file_id)
+
+    try:
+        for name, (module_name, func_name) in PAGE_CASES.items():
+            def render():
+                at = _app_test(args, _render_page, module_name, func_name, file_id)
+                at.run()
+                return at
+            before = get_query_count()
+            at, timings = timed(render, args.repeat)
+            record(results, name, timings, exceptions=len(at.exception), errors=len(at.error),
+                   queries=(get_query_count() - before) // args.repeat)
+        run_interaction_benchmarks(file_id, args, results)
+    finally:
+        if not args.keep:
+            from frontend.services.maintenance import purge_file
+            deleted, timings = timed(lambda: purge_file(cur, file_id), 1)
+            record(results, "purge.file", timings, rows=sum(deleted.values()))
+        cur.close()
+        conn.close()
+
+def run_startup_benchmarks(args, results):
+    """홈 화면 콜드 스타트: 매번 새 프로세스에서 benchmarks.startup 실행 (시간, 최대 메모리, 무거운 모듈)"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    probes = []
+    for _ in range(args.repeat):
+        output = subprocess.check_output([sys.executable, "-m", "benchmarks.startup"], cwd=root,
+                                         stderr=subprocess.DEVNULL)
+        probes.append(json.loads(output.decode().strip().splitlines()[-1]))
+    last = probes[-1]
+    record(results, "startup.home", [probe["home_cold_s"] for probe in probes],
+           total_s=last["total_s"], max_rss_mb=last["max_rss_mb"],
+           heavy_modules=last["heavy_modules"], exceptions=last["exceptions"])
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="OCI/CGS 분석 벤치마크")
+    parser.add_argument("--respondents", type=int, default=1000)
+    parser.add_argument("--departments", type=int, default=12)
+    parser.add_argument("--oci-items", type=int, default=8)
+    parser.add_argument("--cgs-items", type=int, default=5)
+    parser.add_argument("--cgs-categories", type=int, default=8)
+    parser.add_argument("--skew", type=float, default=1.5)
+    parser.add_argument("--messy-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--page-timeout", type=float, default=300)
+    parser.add_argument("--stats-respondents", type=int, default=10000,
+                        help="부서 간 검정 벤치마크용 응답자 수")
+    parser.add_argument("--offline", action="store_true", help="DB 벤치마크 생략")
+    parser.add_argument("--keep", action="store_true", help="벤치마크용 업로드 파일을 삭제하지 않음")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    params = {
+        "respondents": args.respondents,
+        "departments": args.departments,
+        "oci_items_per_category": args.oci_items,
+        "cgs_items_per_category": args.cgs_items,
+        "cgs_categories": args.cgs_categories,
+        "skew": args.skew,
+        "messy_ratio": args.messy_ratio,
+        "seed": args.seed
+    }
+
+    results = {}
+    run_startup_benchmarks(args, results)
+    frames, timings = timed(lambda: generate_survey_frames(**params), 1)
+    record(results, "generate.frames", timings,
+           rows={name: len(df) for name, df in frames.items()})
+
+    buffer = run_offline_benchmarks(frames, args, results)
+    run_statistics_benchmarks(frames, params, args, results)
+
+    if args.offline or not os.getenv("DATABASE_URL"):
+        print("DATABASE_URL이 없어 DB 벤치마크를 건너뜁니다.")
+    else:
+        run_db_benchmarks(buffer, args, results)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "params": params,
+        "repeat": args.repeat,
+        "results": results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+if __name__ == "__main__":
+    main()
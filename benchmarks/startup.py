@@ -0,0 +1,58 @@
+"""앱 콜드 스타트 측정: 새 프로세스에서 홈 화면 첫 렌더링까지의 시간/최대 메모리와 불러온 무거운 모듈
+
+run_benchmarks가 별도 프로세스로 실행함 (이미 pandas 등을 불러온 프로세스에서는 콜드 스타트가 아니므로).
+직접 실행: python -m benchmarks.startup
+"""
+import os
+import sys
+import json
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "app.py")
+
+# 홈 화면에서는 불러오지 않아야 하는 모듈 (streamlit이 plotly 패키지 자체는 불러오므로 graph_objects 기준)
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "plotly.graph_objects", "openai", "pyarrow", "openpyxl")
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return round(rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024, 1)
+
+def measure(timeout=60):
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    runtime_s = time.perf_counter() - started
+    runtime_rss = max_rss_mb()
+    preloaded = {name for name in HEAVY_MODULES if name in sys.modules}
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    if os.getenv("DATABASE_URL"):
+        at.secrets["DATABASE_URL"] = os.environ["DATABASE_URL"]
+    render_started = time.perf_counter()
+    at.run()
+    home_s = time.perf_counter() - render_started
+
+    warm_started = time.perf_counter()
+    at.run()
+    warm_s = time.perf_counter() - warm_started
+
+    return {
+        "streamlit_import_s": round(runtime_s, 4),
+        "home_cold_s": round(home_s, 4),
+        "home_warm_s": round(warm_s, 4),
+        "total_s": round(time.perf_counter() - started, 4),
+        "streamlit_rss_mb": runtime_rss,
+        "max_rss_mb": max_rss_mb(),
+        "heavy_modules": sorted(name for name in HEAVY_MODULES if name in sys.modules and name not in preloaded),
+        "exceptions": len(at.exception)
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(measure()))
@@ -0,0 +1,211 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+# OCI 12개 스타일 (oci_analysis.get_category_from_survey_id 키워드와 동일)
+OCI_STYLES = [
+    ('인간적', '인간적-도움 (Humanistic-Helpful)'),
+    ('친화적', '친화적 (Affiliative)'),
+    ('승인', '승인 (Approval)'),
+    ('전통적', '전통적 (Conventional)'),
+    ('의존적', '의존적 (Dependent)'),
+    ('회피적', '회피적 (Avoidance)'),
+    ('반대적', '반대적 (Oppositional)'),
+    ('권력', '권력 (Power)'),
+    ('경쟁', '경쟁적 (Competitive)'),
+    ('능력', '유능/완벽주의적 (Competence/Perfectionistic)'),
+    ('성취', '성취 (Achievement)'),
+    ('자아', '자기 실현적 (Self-Actualizing)')
+]
+
+CGS_CATEGORIES = [
+    '리더십', '의사결정', '투명성', '책임성', '공정성', '소통', '윤리경영', '성과관리'
+]
+
+OCI_MEANINGS = {
+    1: '전혀 그렇지 않다', 2: '그렇지 않다', 3: '보통이다', 4: '그렇다', 5: '매우 그렇다'
+}
+
+CGS_MEANINGS = {
+    1: '전혀 아니다', 2: '아니다', 3: '약간 아니다', 4: '보통이다',
+    5: '약간 그렇다', 6: '그렇다', 7: '매우 그렇다'
+}
+
+DEPARTMENT_NAMES = [
+    '경영기획팀', '인사팀', '재무팀', '영업1팀', '영업2팀', '마케팅팀', '연구개발팀',
+    '품질관리팀', '생산1팀', '생산2팀', '구매팀', '법무팀', '정보전략팀', '고객지원팀',
+    '디자인팀', '데이터분석팀', '해외사업팀', '안전환경팀', '총무팀', '홍보팀'
+]
+
+AGE_GROUPS = ['20대', '30대', '40대', '50대', '60대 이상']
+EDUCATION_LEVELS = ['고졸', '전문대졸', '대졸', '석사', '박사']
+MAJORS = ['경영학', '경제학', '컴퓨터공학', '전자공학', '기계공학', '산업공학', '통계학', '법학', '디자인', '인문학']
+EXPERIENCE_BANDS = ['1년 미만', '1~3년', '3~5년', '5~10년', '10년 이상']
+CERTIFICATIONS = ['정보처리기사', 'SQLD', 'ADsP', 'PMP', '전기기사', '산업안전기사', 'TOEIC 900', 'CPA', '컴퓨터활용능력 1급']
+SKILLS = ['Python', 'SQL', 'Java', 'R', 'Excel VBA', 'JavaScript', 'C++']
+COMMENT_PHRASES = [
+    '부서 간 소통이 원활했으면 좋겠습니다',
+    '의사결정 과정이 투명하지 않습니다',
+    '업무량이 많아 교육 참여가 어렵습니다',
+    '팀장님의 리더십에 만족합니다',
+    '성과 평가 기준이 명확했으면 합니다',
+    '새로운 시도를 장려하는 분위기입니다',
+    '회의가 너무 많습니다',
+    '복지 제도가 개선되었으면 합니다'
+]
+
+def _skewed_probabilities(rng, n_cells, scale, skew):
+    """(n_cells, scale) 응답 확률표 - 셀마다 치우친 중심값을 갖는 이산 분포"""
+    centers = rng.beta(2 + skew, 2, size=n_cells) * (scale - 1) + 1
+    spread = rng.uniform(0.6, 1.4, size=n_cells)
+    scores = np.arange(1, scale + 1)
+    logits = -((scores[None, :] - centers[:, None]) ** 2) / (2 * spread[:, None] ** 2)
+    probs = np.exp(logits)
+    return probs / probs.sum(axis=1, keepdims=True)
+
+def _sample_responses(rng, probs):
+    """행별 확률표에서 응답값(1부터) 추출"""
+    cumulative = probs.cumsum(axis=1)
+    draws = rng.random(len(probs))[:, None]
+    return (draws > cumulative).sum(axis=1) + 1
+
+def _messy(rng, values, ratio):
+    """일부 셀에 앞뒤 공백이 붙은 정제되지 않은 값 삽입"""
+    values = np.asarray(values, dtype=object)
+    mask = rng.random(len(values)) < ratio
+    values[mask] = [f" {v} " if i % 2 else f"{v} " for i, v in enumerate(values[mask])]
+    return values
+
+def _multi_valued(rng, pool, n, missing_ratio, max_items=3):
+    """쉼표/슬래시 등 구분자가 섞인 다중값 텍스트 (일부는 빈 셀)"""
+    separators = [', ', ',', ' / ', '; ', '\n']
+    result = []
+    for _ in range(n):
+        if rng.random() < missing_ratio:
+            result.append(np.nan)
+            continue
+        k = rng.integers(1, max_items + 1)
+        items = rng.choice(pool, size=k, replace=False)
+        result.append(separators[rng.integers(len(separators))].join(items))
+    return result
+
+def _questions(prefix_pairs, items_per_category, instrument):
+    rows = []
+    for keyword, category in prefix_pairs:
+        for i in range(1, items_per_category + 1):
+            rows.append({
+                "survey_id": f"{instrument}_{keyword}_{i:02d}",
+                "question_category": category,
+                "question_text": f"{category} 관련 문항 {i}"
+            })
+    return pd.DataFrame(rows)
+
+def _responses(rng, respondents, questions, dept_codes, scale, meanings, skew, missing_ratio):
+    """부서 x 카테고리별로 치우친 응답 분포를 갖는 long-format 응답 데이터"""
+    categories = questions["question_category"].unique()
+    cat_codes = pd.Categorical(questions["question_category"], categories=categories).codes
+    n_depts = dept_codes.max() + 1
+
+    # 부서 x 카테고리 셀마다 분포 생성
+    probs = _skewed_probabilities(rng, n_depts * len(categories), scale, skew)
+    cell = (dept_codes[:, None] * len(categories) + cat_codes[None, :]).ravel()
+    values = _sample_responses(rng, probs[cell])
+
+    df = pd.DataFrame({
+        "respondent_id": np.repeat(respondents["respondent_id"].to_numpy(), len(questions)),
+        "survey_id": np.tile(questions["survey_id"].to_numpy(), len(respondents)),
+        "response": values
+    })
+
+    # 미응답 문항은 행 자체가 빠진 형태로 표현
+    if missing_ratio > 0:
+        df = df[rng.random(len(df)) >= missing_ratio].reset_index(drop=True)
+
+    df["response_meaning"] = df["response"].map(meanings)
+    return df
+
+def generate_survey_frames(respondents=500, departments=10, oci_items_per_category=8,
+                           cgs_items_per_category=5, cgs_categories=8, skew=1.5,
+                           messy_ratio=0.05, seed=42):
+    """upload.py가 기대하는 5개 시트(OCI_Q, CGS_Q, Respondent, OCI_R, CGS_R)의 DataFrame 생성"""
+    rng = np.random.default_rng(seed)
+
+    dept_names = [
+        DEPARTMENT_NAMES[i] if i < len(DEPARTMENT_NAMES) else f"부서{i + 1:02d}"
+        for i in range(departments)
+    ]
+    # 부서 크기는 지프 분포처럼 치우치게 (큰 부서 소수 + 작은 부서 다수)
+    weights = 1.0 / np.arange(1, departments + 1) ** 0.8
+    dept_codes = rng.choice(departments, size=respondents, p=weights / weights.sum())
+
+    respondent_df = pd.DataFrame({
+        "respondent_id": [f"R{i + 1:06d}" for i in range(respondents)],
+        "department": _messy(rng, [dept_names[c] for c in dept_codes], messy_ratio),
+        "gender": rng.choice(['남성', '여성'], size=respondents, p=[0.58, 0.42]),
+        "age_group": rng.choice(AGE_GROUPS, size=respondents, p=[0.18, 0.34, 0.28, 0.17, 0.03]),
+        "education_level": rng.choice(EDUCATION_LEVELS, size=respondents, p=[0.08, 0.14, 0.52, 0.21, 0.05]),
+        "major": _messy(rng, rng.choice(MAJORS, size=respondents), messy_ratio),
+        "experience_innovation": rng.choice(EXPERIENCE_BANDS, size=respondents),
+        "experience_total": rng.choice(EXPERIENCE_BANDS, size=respondents, p=[0.1, 0.2, 0.2, 0.25, 0.25]),
+        "certifications": _multi_valued(rng, CERTIFICATIONS, respondents, 0.35 + messy_ratio),
+        "programming_skills": _multi_valued(rng, SKILLS, respondents, 0.5 + messy_ratio),
+        "comments": [
+            np.nan if rng.random() < 0.4 + messy_ratio
+            else ". ".join(rng.choice(COMMENT_PHRASES, size=rng.integers(1, 3), replace=False))
+            for _ in range(respondents)
+        ]
+    })
+
+    oci_q = _questions(OCI_STYLES, oci_items_per_category, "OCI")
+    cgs_names = CGS_CATEGORIES[:cgs_categories] + [
+        f"CGS 영역{i + 1}" for i in range(len(CGS_CATEGORIES), cgs_categories)
+    ]
+    cgs_q = _questions([(name, name) for name in cgs_names], cgs_items_per_category, "CGS")
+
+    oci_r = _responses(rng, respondent_df, oci_q, dept_codes, 5, OCI_MEANINGS, skew, messy_ratio / 2)
+    cgs_r = _responses(rng, respondent_df, cgs_q, dept_codes, 7, CGS_MEANINGS, skew, messy_ratio / 2)
+
+    return {
+        "OCI_Q": oci_q,
+        "CGS_Q": cgs_q,
+        "Respondent": respondent_df,
+        "OCI_R": oci_r,
+        "CGS_R": cgs_r
+    }
+
+def write_workbook(frames, path):
+    """시트별 DataFrame을 xlsx로 저장 (엑셀 시트당 최대 1,048,576행)"""
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, df in frames.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="OCI/CGS 합성 설문 워크북 생성")
+    parser.add_argument("output", help="저장할 xlsx 경로")
+    parser.add_argument("--respondents", type=int, default=500)
+    parser.add_argument("--departments", type=int, default=10)
+    parser.add_argument("--oci-items", type=int, default=8, help="OCI 카테고리당 문항 수")
+    parser.add_argument("--cgs-items", type=int, default=5, help="CGS 카테고리당 문항 수")
+    parser.add_argument("--cgs-categories", type=int, default=8)
+    parser.add_argument("--skew", type=float, default=1.5, help="응답 분포 치우침 정도")
+    parser.add_argument("--messy-ratio", type=float, default=0.05, help="정제되지 않은 셀 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frames = generate_survey_frames(
+        respondents=args.respondents,
+        departments=args.departments,
+        oci_items_per_category=args.oci_items,
+        cgs_items_per_category=args.cgs_items,
+        cgs_categories=args.cgs_categories,
+        skew=args.skew,
+        messy_ratio=args.messy_ratio,
+        seed=args.seed
+    )
+    write_workbook(frames, args.output)
+    for name, df in frames.items():
+        print(f"{name}: {len(df):,} rows")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 import sys
 import os
+import importlib
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import streamlit as st
-from frontend.pages.upload import show_upload_page
-from frontend.pages.analysis_dashboard import show_analysis_dashboard
-from frontend.pages.manage import show_manage_page
-from frontend.pages.comprehensive_analysis import show_comprehensive_analysis
 from frontend.database import init_database
+from frontend.services.profiler import start_rerun, show_profiler_sidebar
+from frontend.services.maintenance import start_maintenance_scheduler
+
+# 페이지별 (모듈, 함수) - 처음 이동할 때 import해서 홈 화면은 pandas/plotly/openai 없이 시작
+PAGES = {
+    "upload": ("frontend.pages.upload", "show_upload_page"),
+    "manage": ("frontend.pages.manage", "show_manage_page"),
+    "analysis": ("frontend.pages.analysis_dashboard", "show_analysis_dashboard"),
+    "comprehensive": ("frontend.pages.comprehensive_analysis", "show_comprehensive_analysis")
+}
+
+def load_page(page):
+    """페이지 함수를 반환 (모듈은 프로세스당 한 번만 import되고 이후에는 sys.modules에서 가져옴)"""
+    module_name, func_name = PAGES[page]
+    return getattr(importlib.import_module(module_name), func_name)
 
 def main():
     # 페이지 기본 설정
@@ -16,6 +28,8 @@ def main():
         page_icon="🏢",
         layout="wide"
     )
+    start_rerun(st.session_state.get('page', 'home'))
+    start_maintenance_scheduler()  # OCI_MAINTENANCE_INTERVAL_HOURS 설정 시에만 동작
     hide_streamlit_style = """
         <style>
             [data-testid="stSidebarNav"] { display: none; }  /* 자동 생성되는 기본 사이드바 숨김 */
@@ -209,14 +223,13 @@ def main():
                 st.rerun()
 
     # 페이지 라우팅
-    elif st.session_state.get('page') == 'upload':
-        show_upload_page()
-    elif st.session_state.get('page') == 'manage':
-        show_manage_page()
-    elif st.session_state.get('page') == 'analysis':
-        show_analysis_dashboard()
     elif st.session_state.get('page') == 'comprehensive':
-        show_comprehensive_analysis(st.session_state.get('selected_file_id'))
+        load_page('comprehensive')(st.session_state.get('selected_file_id'))
+    elif st.session_state.get('page') in PAGES:
+        load_page(st.session_state['page'])()
+
+    # 프로파일링 모드일 때만 사이드바에 측정 결과 표시
+    show_profiler_sidebar()
 
 def get_menu_description(key):
     descriptions = {
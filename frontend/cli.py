@@ -0,0 +1,182 @@
+"""화면 없이 워크북 적재 + 전체 분석 + 리포트 생성 (여러 파일을 프로세스 풀로 병렬 처리)
+
+예)
+    python -m frontend.cli data/*.xlsx --output reports --workers 4
+    python -m frontend.cli --file-id 3 4 --ai --ai-workers 4
+    python -m frontend.cli --file-id 3 --parquet exports
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INSTRUMENTS = ("oci", "cgs")
+
+def _log(message):
+    print(message, flush=True)
+
+def _write_csv(df, path, index=False):
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    df.to_csv(path, index=index, encoding="utf-8-sig")
+    return path
+
+def ingest_file(path, file_name):
+    """워크북 하나를 업로드 페이지와 같은 방식(autocommit)으로 적재하고 file_id 반환
+
+    파일마다 응답 파티션 DDL이 있어 긴 트랜잭션으로 묶으면 동시 적재끼리 교착되므로
+    페이지와 같이 문장 단위로 커밋하고, 실패한 파일은 status가 'pending'으로 남음
+    """
+    from frontend.database import get_db_connection
+    from frontend.pages.upload import ingest_workbook
+
+    conn = get_db_connection()
+    if conn is None:
+        raise RuntimeError("데이터베이스에 연결할 수 없습니다 (DATABASE_URL 확인)")
+    cur = conn.cursor()
+    try:
+        return ingest_workbook(cur, file_name, path, notify=lambda message: None)
+    finally:
+        cur.close()
+        conn.close()
+
+def analyze_file(file_id, output_dir):
+    """페이지와 같은 서비스 함수로 통계/신뢰도/상관/circumplex를 계산해 CSV로, 종합 리포트를 마크다운으로 저장"""
+    from frontend.services.statistics import get_department_statistics, get_bootstrap_intervals
+    from frontend.services.reliability import get_reliability
+    from frontend.services.correlation import get_correlations, strongest_pairs
+    from frontend.services.circumplex import get_style_scores
+    from frontend.services.text_analytics import get_tag_counts, get_department_terms
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for instrument in INSTRUMENTS:
+        summary, effect_sizes = get_department_statistics(file_id, instrument)
+        written.append(_write_csv(summary, os.path.join(output_dir, f"{instrument}_department_tests.csv"), index=True))
+        written.append(_write_csv(effect_sizes, os.path.join(output_dir, f"{instrument}_effect_sizes.csv")))
+        written.append(_write_csv(get_bootstrap_intervals(file_id, instrument),
+                                  os.path.join(output_dir, f"{instrument}_bootstrap_ci.csv")))
+        categories, items = get_reliability(file_id, instrument)
+        written.append(_write_csv(categories, os.path.join(output_dir, f"{instrument}_reliability.csv")))
+        written.append(_write_csv(items, os.path.join(output_dir, f"{instrument}_item_reliability.csv")))
+
+    if get_correlations(file_id)["respondents"] >= 3:
+        written.append(_write_csv(strongest_pairs(file_id, limit=50),
+                                  os.path.join(output_dir, "oci_cgs_correlations.csv")))
+
+    _, departments, overall = get_style_scores(file_id)
+    written.append(_write_csv(pd.concat([overall, departments]),
+                              os.path.join(output_dir, "circumplex.csv"), index=True))
+
+    written.append(_write_csv(get_tag_counts(file_id, "certifications"),
+                              os.path.join(output_dir, "certifications.csv")))
+    written.append(_write_csv(get_tag_counts(file_id, "programming_skills"),
+                              os.path.join(output_dir, "programming_skills.csv")))
+    written.append(_write_csv(get_department_terms(file_id), os.path.join(output_dir, "department_terms.csv")))
+
+    from frontend.services.ai_analysis import generate_comprehensive_report
+    report = generate_comprehensive_report(file_id)
+    if report:
+        path = os.path.join(output_dir, "report.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+        written.append(path)
+    return written
+
+def process_file(source, output_root, parquet_root=None):
+    """프로세스 풀 작업 단위: (워크북 경로 또는 file_id) -> 적재/분석 결과 요약
+
+    각 프로세스가 자체 DB 연결과 서비스 캐시를 가지므로 파일끼리 공유하는 상태가 없음
+    """
+    started = time.perf_counter()
+    result = {"source": str(source), "file_id": None, "outputs": [], "error": None}
+    try:
+        if isinstance(source, int):
+            file_id = source
+        else:
+            file_name = os.path.splitext(os.path.basename(source))[0]
+            file_id = ingest_file(source, file_name)
+        result["file_id"] = file_id
+        result["outputs"] = analyze_file(file_id, os.path.join(output_root, f"file_{file_id}"))
+        if parquet_root:
+            from frontend.services.parquet_export import export_file, export_dir
+            export_file(file_id, parquet_root)
+            result["outputs"].append(export_dir(file_id, parquet_root))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    return result
+
+def run_ai_analyses(file_ids, output_root, workers):
+    """AI 종합 분석을 스레드로 동시에 요청 (API 대기 시간이 대부분이므로 프로세스 대신 스레드)"""
+    from frontend.services.ai_analysis import run_ai_analysis
+
+    def analyze(file_id):
+        text = run_ai_analysis(file_id)
+        path = os.path.join(output_root, f"file_{file_id}", "ai_analysis.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text or "")
+        return file_id, path
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze, file_id) for file_id in file_ids]
+        for future in as_completed(futures):
+            try:
+                file_id, path = future.result()
+                _log(f"✅ AI 분석 저장: file_id={file_id} -> {path}")
+            except Exception as e:
+                _log(f"❌ AI 분석 실패: {e}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCI/CGS 워크북 일괄 적재/분석")
+    parser.add_argument("workbooks", nargs="*", help="적재할 엑셀 워크북 (파일 이름이 업로드 이름)")
+    parser.add_argument("--file-id", type=int, nargs="*", default=[], help="이미 적재된 파일도 분석")
+    parser.add_argument("--output", default="reports", help="결과 폴더 (파일별 file_<id> 하위 폴더)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="동시 처리 파일 수")
+    parser.add_argument("--ai", action="store_true", help="OpenAI 종합 분석도 실행")
+    parser.add_argument("--ai-workers", type=int, default=4, help="동시 AI 요청 수")
+    parser.add_argument("--parquet", metavar="DIR", help="BI용 Parquet 스냅샷도 DIR/file_<id>에 저장")
+    args = parser.parse_args(argv)
+
+    sources = list(args.workbooks) + list(args.file_id)
+    if not sources:
+        parser.error("워크북 경로 또는 --file-id를 지정하세요")
+    missing = [path for path in args.workbooks if not os.path.exists(path)]
+    if missing:
+        parser.error(f"파일이 없습니다: {', '.join(missing)}")
+
+    # 스키마는 부모 프로세스에서 한 번만 맞추고 작업 프로세스는 적재/분석만
+    from frontend.database import init_database
+    init_database()
+    os.makedirs(args.output, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(sources)))) as pool:
+        futures = {pool.submit(process_file, source, args.output, args.parquet): source for source in sources}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result["error"]:
+                _log(f"❌ {result['source']}: {result['error']} ({result['seconds']}s)")
+            else:
+                _log(f"✅ {result['source']} -> file_id={result['file_id']}, "
+                     f"{len(result['outputs'])}개 파일 ({result['seconds']}s)")
+
+    file_ids = [result["file_id"] for result in results if result["file_id"] and not result["error"]]
+    if args.workbooks:
+        # 적재가 모두 끝난 뒤 PowerBI 뷰를 한 번만 갱신
+        from frontend.services.powerbi_views import refresh_powerbi_views
+        _log(f"✅ PowerBI 뷰 갱신: {refresh_powerbi_views()}")
+    if args.ai and file_ids:
+        run_ai_analyses(file_ids, args.output, args.ai_workers)
+
+    failed = sum(1 for result in results if result["error"])
+    _log(f"완료: {len(results) - failed}개 성공, {failed}개 실패 (결과 폴더: {args.output})")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,37 @@
 import streamlit as st
-from frontend.database import get_db_connection, save_analysis, load_existing_analysis
+from frontend.database import get_db_connection
+from frontend.services.analysis_store import (
+    get_analysis,
+    stage_analysis,
+    stage_widget_edit,
+    set_analysis,
+    flush_analyses
+)
 from frontend.services.ai_analysis import generate_department_analysis
+from frontend.services.profiler import profiled
+from frontend.components.fragment import fragment, rerun_fragment
 import pandas as pd
 
+@profiled()
+@fragment
 def show_ai_analysis(file_id, df, analysis_type, key_prefix):
-    """AI 분석 공통 컴포넌트"""
+    """AI 분석 공통 컴포넌트 (fragment: 입력/버튼 클릭 시 이 컴포넌트만 다시 실행)"""
     with st.expander("📊 AI 분석"):
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            existing = load_existing_analysis(file_id, analysis_type[0], analysis_type[1])
             text_key = f"analysis_{key_prefix}_{file_id}"
             
+            # 저장된 분석은 파일 단위 저장소에서 처음 한 번만 가져오고, 이후에는 위젯 상태를 그대로 사용
+            if text_key not in st.session_state:
+                st.session_state[text_key] = get_analysis(file_id, analysis_type[0], analysis_type[1])
+            
             edited_text = st.text_area(
                 "분석 내용",
-                value=existing if existing else "",
                 height=300,
-                key=text_key
+                key=text_key,
+                on_change=stage_widget_edit,
+                args=(file_id, analysis_type[0], analysis_type[1], text_key)
             )
         
         with col2:
@@ -102,12 +117,15 @@ def show_ai_analysis(file_id, df, analysis_type, key_prefix):
                     analysis = generate_department_analysis(analysis_data, analysis_type[1])
                     
                     if analysis:
-                        save_analysis(file_id, analysis_type[0], analysis_type[1], analysis)
-                        st.success("분석 완료!")
-                        st.rerun()
+                        set_analysis(file_id, analysis_type[0], analysis_type[1], analysis)
+                        # 위젯 상태를 비워 다음 실행에서 새 분석을 불러옴
+                        del st.session_state[text_key]
+                        rerun_fragment()
             
             if st.button("💾 저장",
                         key=f"btn_save_{key_prefix}_{file_id}",
                         use_container_width=True):
-                save_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
-                st.success("저장 완료!") 
\ No newline at end of file
+                # 이 파일에서 편집 중인 다른 분석도 함께 한 번에 저장
+                stage_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
+                saved = flush_analyses(file_id)
+                st.success(f"저장 완료! ({saved}건)") 
\ No newline at end of file
@@ -0,0 +1,43 @@
+import plotly.graph_objects as go
+from frontend.services.circumplex import CLUSTERS
+
+def _short(style):
+    return style.split(" (")[0]
+
+def build_circumplex_figure(profile, title):
+    """OCI circumplex 차트 (12개 스타일 쐐기, 반지름 = 백분위, 색 = 클러스터)
+
+    profile: circumplex_profile() 결과 (style, cluster, clock, score, percentile)
+    """
+    fig = go.Figure()
+    for cluster, meta in CLUSTERS.items():
+        rows = profile[profile['cluster'] == cluster]
+        fig.add_trace(go.Barpolar(
+            name=meta['label'],
+            r=rows['percentile'],
+            theta=rows['clock'] * 30,
+            width=[30] * len(rows),
+            marker_color=meta['color'],
+            marker_line_color='white',
+            marker_line_width=1,
+            opacity=0.85,
+            customdata=list(zip(rows['style'], rows['score'])),
+            hovertemplate="%{customdata[0]}<br>평균 %{customdata[1]:.2f}점<br>백분위 %{r:.0f}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=title,
+        polar=dict(
+            radialaxis=dict(range=[0, 100], ticksuffix='%', angle=90, tickfont=dict(size=9)),
+            angularaxis=dict(
+                rotation=90,
+                direction='clockwise',
+                tickmode='array',
+                tickvals=(profile['clock'] * 30).tolist(),
+                ticktext=[_short(style) for style in profile['style']]
+            )
+        ),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.15, xanchor='center', x=0.5),
+        height=550
+    )
+    return fig
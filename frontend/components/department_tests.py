@@ -0,0 +1,44 @@
+import streamlit as st
+from frontend.services.statistics import (
+    SIGNIFICANCE_LEVEL,
+    category_statistics,
+    effect_size_label
+)
+
+def show_department_tests(file_id, instrument, category, limit=10):
+    """카테고리의 부서 간 차이 검정 결과 (ANOVA, Kruskal-Wallis, 부서쌍별 효과크기)"""
+    tests, pairs = category_statistics(file_id, instrument, category)
+    if tests is None or tests["departments"] < 2:
+        st.info("부서 간 비교를 위한 응답이 부족합니다.")
+        return
+
+    st.write("**부서 간 차이 검정**")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("ANOVA F", f"{tests['f_stat']:.2f}", f"p = {tests['anova_p']:.3f}", delta_color="off")
+    col2.metric("Kruskal-Wallis H", f"{tests['h_stat']:.2f}", f"p = {tests['kruskal_p']:.3f}",
+                delta_color="off")
+    col3.metric("효과크기 η²", f"{tests['eta_sq']:.3f}")
+
+    if tests["significant"]:
+        st.success(f"부서 간 평균 차이가 통계적으로 유의합니다 (p < {SIGNIFICANCE_LEVEL}).")
+    else:
+        st.info(f"부서 간 평균 차이가 통계적으로 유의하지 않습니다 (p ≥ {SIGNIFICANCE_LEVEL}).")
+
+    with st.expander(f"부서쌍별 효과크기 (Cohen's d 상위 {limit}개)"):
+        table = pairs.head(limit).assign(
+            effect=lambda d: d["cohens_d"].map(effect_size_label)
+        )[["department_a", "department_b", "mean_a", "mean_b", "n_a", "n_b", "cohens_d", "effect"]]
+        st.dataframe(
+            table.rename(columns={
+                "department_a": "부서 A",
+                "department_b": "부서 B",
+                "mean_a": "평균 A",
+                "mean_b": "평균 B",
+                "n_a": "응답자 A",
+                "n_b": "응답자 B",
+                "cohens_d": "Cohen's d",
+                "effect": "크기"
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
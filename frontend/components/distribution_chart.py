@@ -0,0 +1,44 @@
+import plotly.graph_objects as go
+from frontend.services.distribution import RESPONSE_SCALES
+
+def build_distribution_figure(percentages, instrument, title):
+    """문항 x 점수 비율 행렬로 100% 누적 막대 차트 생성 (점수 컬럼당 trace 1개)"""
+    scale = RESPONSE_SCALES[instrument]
+    survey_ids = percentages.index.tolist()
+
+    fig = go.Figure()
+    for score in percentages.columns:
+        values = percentages[score].to_numpy()
+        if not values.any():
+            continue
+        fig.add_trace(go.Bar(
+            name=f"{score}점 - {scale['meanings'][score]}",
+            x=survey_ids,
+            y=values,
+            text=[f'{v:.1f}%' for v in values],
+            textposition='auto',
+            marker_color=scale['colors'][score]
+        ))
+
+    fig.update_layout(
+        title=title,
+        barmode='stack',
+        xaxis_title='문항',
+        yaxis_title='응답 비율(%)',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+def format_distribution_table(percentages, instrument):
+    """상세 응답 분포 표 (컬럼명에 응답 의미 추가)"""
+    meanings = RESPONSE_SCALES[instrument]['meanings']
+    table = percentages.copy()
+    table.columns = [f"{score}점 - {meanings[score]}" for score in table.columns]
+    return table
@@ -0,0 +1,24 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+# Streamlit 1.37+ st.fragment, 1.33~1.36 st.experimental_fragment
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def fragment(func=None, *, run_every=None):
+    """위젯 상호작용 시 함수 본문만 다시 실행하는 fragment 데코레이터
+
+    run_every(초)를 주면 그 주기로 본문만 자동 실행 (진행 상황 표시용).
+    fragment를 지원하지 않는 Streamlit 버전에서는 일반 함수로 동작
+    """
+    if func is None:
+        return lambda func: fragment(func, run_every=run_every)
+    if _fragment is None:
+        return func
+    return _fragment(func, run_every=run_every) if run_every else _fragment(func)
+
+def rerun_fragment():
+    """현재 fragment만 다시 실행 (fragment 미지원 버전이나 전체 rerun 중이면 전체 rerun)"""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
@@ -0,0 +1,33 @@
+import streamlit as st
+from frontend.services.reliability import get_reliability, alpha_label
+
+def show_reliability(file_id, instrument, category):
+    """카테고리 문항 신뢰도 (업로드 시 계산해 저장한 값 표시)"""
+    categories, items = get_reliability(file_id, instrument)
+    row = categories[categories["question_category"] == category]
+    if row.empty:
+        st.info("신뢰도 지표가 없습니다. 파일을 다시 업로드하면 계산됩니다.")
+        return
+    row = row.iloc[0]
+
+    st.write("**문항 신뢰도**")
+    col1, col2, col3 = st.columns(3)
+    alpha = row["cronbach_alpha"]
+    col1.metric("Cronbach's α", "-" if alpha != alpha else f"{alpha:.3f}", alpha_label(alpha),
+                delta_color="off")
+    col2.metric("문항 수", int(row["items"]))
+    col3.metric("완전 응답자 수", int(row["respondents"]))
+
+    with st.expander("문항별 신뢰도"):
+        table = items[items["question_category"] == category][
+            ["survey_id", "item_total_corr", "alpha_if_deleted"]]
+        st.dataframe(
+            table.rename(columns={
+                "survey_id": "문항",
+                "item_total_corr": "수정 문항-총점 상관",
+                "alpha_if_deleted": "문항 제거 시 α"
+            }).round(3),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("문항 제거 시 α가 현재 α보다 높거나 문항-총점 상관이 0.3 미만인 문항은 검토가 필요합니다.")
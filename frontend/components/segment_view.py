@@ -0,0 +1,93 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from frontend.services.profiler import profiled
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.statistics import get_respondent_scores
+from frontend.services.segments import (
+    METHODS,
+    get_segments,
+    resegment_file,
+    segment_profiles,
+    short_category
+)
+
+SEGMENT_COUNTS = list(range(2, 9))
+METHOD_LABELS = {"kmeans": "k-means", "gmm": "가우시안 혼합"}
+
+# 차트 빌더: get_cached_figure 캐시 미스일 때만 호출됨
+def _segment_size_chart(df, title):
+    fig = px.pie(df, values='respondents', names='segment', hole=0.4, title=title)
+    fig.update_traces(textinfo='percent+label')
+    return fig
+
+def _segment_heatmap(df, title):
+    fig = go.Figure(go.Heatmap(
+        z=df.values,
+        x=[short_category(c) for c in df.columns],
+        y=df.index.tolist(),
+        text=df.round(2).values,
+        texttemplate="%{text}",
+        colorscale="Viridis",
+        colorbar=dict(title="평균")
+    ))
+    fig.update_layout(title=title, xaxis_title="카테고리", yaxis_title="세그먼트",
+                      height=max(350, 60 * len(df.index)))
+    return fig
+
+@profiled()
+def show_segment_analysis(file_id, instrument):
+    """응답자 문화 세그먼트(OCI 점수 기준 군집)별 카테고리 평균"""
+    st.subheader("문화 세그먼트 분석")
+    st.caption("OCI 카테고리 점수가 비슷한 응답자끼리 묶은 세그먼트입니다 (부서와 무관).")
+
+    segments = get_segments(file_id)
+    current = segments["segment"].nunique() if not segments.empty else None
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        k = st.selectbox(
+            "세그먼트 수", SEGMENT_COUNTS,
+            index=SEGMENT_COUNTS.index(current) if current in SEGMENT_COUNTS else 2,
+            key=f"segment_k_{instrument}_{file_id}"
+        )
+    with col2:
+        method = st.selectbox(
+            "군집 방법", METHODS,
+            index=METHODS.index(segments["method"].iloc[0]) if not segments.empty else 0,
+            format_func=METHOD_LABELS.get,
+            key=f"segment_method_{instrument}_{file_id}"
+        )
+    with col3:
+        st.write("")
+        if st.button("🔄 세그먼트 다시 계산", key=f"segment_run_{instrument}_{file_id}",
+                     use_container_width=True):
+            with st.spinner("세그먼트를 계산하는 중입니다..."):
+                resegment_file(file_id, k, method)
+            segments = get_segments(file_id)
+
+    if segments.empty:
+        st.info("저장된 세그먼트가 없습니다. '세그먼트 다시 계산'을 눌러주세요.")
+        return
+
+    # 세그먼트 이름은 항상 OCI(조직문화) 점수 기준
+    _, sizes, names = segment_profiles(get_respondent_scores(file_id, "oci"), segments)
+    means, _, _ = segment_profiles(get_respondent_scores(file_id, instrument), segments)
+    means.index = means.index.map(names)
+    size_df = sizes.rename(index=names).rename_axis("segment").reset_index(name="respondents")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fig = get_cached_figure("segment_size", size_df, _segment_size_chart, title="세그먼트 구성")
+        st.plotly_chart(fig, use_container_width=True, key=f"segment_size_{instrument}_{file_id}")
+    with col2:
+        fig = get_cached_figure(
+            "segment_heatmap", means, _segment_heatmap,
+            title=f"{instrument.upper()} 세그먼트별 카테고리 평균"
+        )
+        st.plotly_chart(fig, use_container_width=True, key=f"segment_heatmap_{instrument}_{file_id}")
+
+    st.dataframe(
+        means.round(2).rename(columns=short_category).assign(응답자수=size_df.set_index("segment")["respondents"]),
+        use_container_width=True
+    )
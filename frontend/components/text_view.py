@@ -0,0 +1,55 @@
+import streamlit as st
+import plotly.express as px
+from frontend.services.profiler import profiled
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.text_analytics import (
+    get_tag_counts,
+    get_top_terms,
+    get_department_terms
+)
+
+# 차트 빌더: get_cached_figure 캐시 미스일 때만 호출됨
+def _horizontal_bar_chart(df, x, y, title):
+    fig = px.bar(df.iloc[::-1], x=x, y=y, orientation='h', text=x, title=title)
+    fig.update_layout(height=max(350, 25 * len(df.index)), yaxis_title=None)
+    return fig
+
+@profiled()
+def show_text_analysis(file_id):
+    """응답자 의견 주요 단어, 보유 기술, 부서별 특징 단어 (업로드 시 만든 색인 조회)"""
+    st.subheader("의견/기술 분석")
+
+    terms = get_top_terms(file_id, 30)
+    skills = get_tag_counts(file_id, "programming_skills").head(20)
+    if terms.empty and skills.empty:
+        st.info("의견이나 기술 응답이 없습니다.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if not terms.empty:
+            fig = get_cached_figure(
+                "text_terms", terms, _horizontal_bar_chart,
+                x='frequency', y='term', title='의견 주요 단어'
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"text_terms_{file_id}")
+    with col2:
+        if not skills.empty:
+            fig = get_cached_figure(
+                "text_skills", skills, _horizontal_bar_chart,
+                x='count', y='tag', title='보유 기술 (응답자 수)'
+            )
+            st.plotly_chart(fig, use_container_width=True, key=f"text_skills_{file_id}")
+
+    dept_terms = get_department_terms(file_id, 5)
+    if not dept_terms.empty:
+        st.write("**부서별 특징 단어 (TF-IDF 상위 5개)**")
+        st.caption("다른 부서 의견에는 잘 나오지 않고 해당 부서 의견에 자주 나온 단어입니다.")
+        st.dataframe(
+            dept_terms.groupby("department", sort=True)["term"]
+            .agg(", ".join)
+            .rename_axis("부서")
+            .reset_index(name="특징 단어"),
+            use_container_width=True,
+            hide_index=True
+        )
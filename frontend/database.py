@@ -1,14 +1,38 @@
 import psycopg2
+from psycopg2.extras import execute_values
 import os
 from dotenv import load_dotenv
 import streamlit as st
+from frontend.services.profiler import profiled
 
 load_dotenv()
 
+# 프로세스에서 실행된 쿼리 수 (상호작용당 쿼리 수 측정용)
+_query_count = 0
+
+class _CountingCursor(psycopg2.extensions.cursor):
+    def execute(self, query, vars=None):
+        global _query_count
+        _query_count += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        global _query_count
+        _query_count += 1
+        return super().executemany(query, vars_list)
+
+def get_query_count():
+    """get_db_connection()으로 연 연결에서 지금까지 실행된 쿼리 수"""
+    return _query_count
+
+@profiled(kind="db")
 def get_db_connection():
     try:
-        # Streamlit Secrets에서 데이터베이스 URL 가져오기
-        conn = psycopg2.connect(st.secrets["DATABASE_URL"])
+        # 환경변수(.env) 우선, 없으면 Streamlit Secrets에서 데이터베이스 URL 가져오기
+        conn = psycopg2.connect(
+            os.getenv("DATABASE_URL") or st.secrets["DATABASE_URL"],
+            cursor_factory=_CountingCursor
+        )
         conn.set_session(autocommit=True)
         return conn
     except psycopg2.OperationalError as e:
@@ -24,135 +48,31 @@ def get_db_connection():
         return None
 
 def init_database():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
+    """스키마 마이그레이션 적용 (이미 최신이면 DDL 없이 바로 반환, frontend/migrations.py 참고)"""
+    from frontend.migrations import run_migrations
     try:
-        # 기본 테이블들 생성
-        cur.execute("""
-            -- 파일 업로드 테이블
-            CREATE TABLE IF NOT EXISTS uploaded_files (
-                file_id SERIAL PRIMARY KEY,
-                file_name VARCHAR(200) UNIQUE NOT NULL,
-                status VARCHAR(20),
-                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- 응답자 정보 테이블
-            CREATE TABLE IF NOT EXISTS respondents (
-                respondent_id VARCHAR(50),
-                file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
-                department VARCHAR(100),
-                gender VARCHAR(20),
-                age_group VARCHAR(20),
-                education_level VARCHAR(50),
-                major VARCHAR(100),
-                experience_innovation VARCHAR(50),
-                experience_total VARCHAR(50),
-                certifications TEXT,
-                programming_skills TEXT,
-                comments TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (respondent_id, file_id)
-            );
-
-            -- OCI 설문 문항 테이블
-            CREATE TABLE IF NOT EXISTS oci_questions (
-                survey_id VARCHAR(50) PRIMARY KEY,
-                question_category VARCHAR(100),
-                question_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- CGS 설문 문항 테이블
-            CREATE TABLE IF NOT EXISTS cgs_questions (
-                survey_id VARCHAR(50) PRIMARY KEY,
-                question_category VARCHAR(100),
-                question_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- OCI 응답 테이블
-            CREATE TABLE IF NOT EXISTS oci_responses (
-                response_id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
-                respondent_id VARCHAR(50),
-                survey_id VARCHAR(50) REFERENCES oci_questions(survey_id),
-                response INTEGER,
-                response_meaning VARCHAR(200),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- CGS 응답 테이블
-            CREATE TABLE IF NOT EXISTS cgs_responses (
-                response_id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
-                respondent_id VARCHAR(50),
-                survey_id VARCHAR(50) REFERENCES cgs_questions(survey_id),
-                response INTEGER,
-                response_meaning VARCHAR(200),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            -- AI 분석 결과 테이블
-            CREATE TABLE IF NOT EXISTS ai_analysis (
-                analysis_id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
-                analysis_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP,
-                UNIQUE(file_id)
-            );
-
-            -- 분석 결과 저장 테이블
-            CREATE TABLE IF NOT EXISTS analysis_results (
-                result_id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
-                analysis_type VARCHAR(50),
-                analysis_item VARCHAR(100),
-                analysis_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP,
-                UNIQUE(file_id, analysis_type, analysis_item)
-            );
-        """)
-
-        conn.commit()
-        print("✅ Database tables created successfully")
-        
+        run_migrations()
     except Exception as e:
         print(f"❌ Database initialization error: {str(e)}")
-        conn.rollback()
-    finally:
-        cur.close()
-        conn.close()
 
-def save_to_powerbi_table(file_id, analysis_type, data, visualization=None):
-    """PowerBI 연동용 데이터 저장"""
+def save_to_powerbi_table(file_id, analysis_type, data, key_columns=None):
+    """PowerBI 연동용 데이터 저장: powerbi_<analysis_type> 테이블에 COPY + upsert 한 번으로 병합
+
+    key_columns가 없으면 숫자가 아닌 컬럼이 키 (services/powerbi_writer 참고).
+    병합 행 수와 초당 처리량을 로그로 남기고 그 통계를 반환
+    """
+    # pandas를 쓰는 모듈이므로 앱 시작 시가 아니라 처음 저장할 때 import
+    from frontend.services.powerbi_writer import bulk_upsert
     conn = get_db_connection()
     cur = conn.cursor()
     
     try:
-        cur.execute("""
-            INSERT INTO powerbi_data (
-                file_id,
-                analysis_type,
-                data_snapshot,
-                visualization_config,
-                updated_at
-            ) VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-            ON CONFLICT (file_id, analysis_type) 
-            DO UPDATE SET 
-                data_snapshot = EXCLUDED.data_snapshot,
-                visualization_config = EXCLUDED.visualization_config,
-                updated_at = CURRENT_TIMESTAMP
-        """, (file_id, analysis_type, data.to_json(), 
-              visualization.to_json() if visualization else None))
-        
-        conn.commit()
+        stats = bulk_upsert(cur, analysis_type, file_id, data, key_columns)
+        print(f"✅ PowerBI {stats['table']} merged: {stats['rows']} rows in {stats['seconds']}s "
+              f"({stats['rows_per_second']} rows/s)")
+        return stats
     except Exception as e:
         print(f"PowerBI 데이터 저장 중 오류: {str(e)}")
-        conn.rollback()
     finally:
         cur.close()
         conn.close()
@@ -180,6 +100,7 @@ def save_analysis_state(file_id, analysis_type, data, visualization, analysis_te
     cur.close()
     conn.close()
 
+@profiled(kind="db")
 def load_existing_analysis(file_id, analysis_type, item):
     """저장된 분석 내용 불러오기"""
     conn = get_db_connection()
@@ -197,6 +118,7 @@ def load_existing_analysis(file_id, analysis_type, item):
     
     return result[0] if result else ""
 
+@profiled(kind="db")
 def save_analysis(file_id, analysis_type, item, analysis_text):
     """분석 내용 저장"""
     conn = get_db_connection()
@@ -216,6 +138,47 @@ def save_analysis(file_id, analysis_type, item, analysis_text):
     cur.close()
     conn.close()
 
+@profiled(kind="db")
+def load_analysis_map(file_id):
+    """파일의 저장된 분석 내용 전체를 한 번에 불러오기 ({(analysis_type, item): text})"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute("""
+        SELECT analysis_type, analysis_item, analysis_text
+        FROM analysis_results
+        WHERE file_id = %s
+    """, (file_id,))
+    
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    
+    return {(analysis_type, item): text or "" for analysis_type, item, text in rows}
+
+@profiled(kind="db")
+def save_analyses(file_id, analyses):
+    """여러 분석 내용을 한 번의 upsert로 저장 (analyses: {(analysis_type, item): text})"""
+    if not analyses:
+        return
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    execute_values(cur, """
+        INSERT INTO analysis_results
+            (file_id, analysis_type, analysis_item, analysis_text)
+        VALUES %s
+        ON CONFLICT (file_id, analysis_type, analysis_item)
+        DO UPDATE SET 
+            analysis_text = EXCLUDED.analysis_text,
+            updated_at = CURRENT_TIMESTAMP
+    """, [(file_id, analysis_type, item, text)
+          for (analysis_type, item), text in analyses.items()])
+    
+    conn.commit()
+    cur.close()
+    conn.close()
+
 def create_powerbi_table(cur, table_name, columns):
     """PowerBI용 테이블 생성"""
     # 컬럼 타입 매핑
@@ -248,157 +211,9 @@ def create_powerbi_table(cur, table_name, columns):
     cur.execute(create_table_sql)
 
 def maintain_database():
-    """주기적인 데이터베이스 관리"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    try:
-        # 오래된 데이터 삭제
-        cur.execute("""
-            DELETE FROM uploaded_files 
-            WHERE uploaded_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
-        """)
-        
-        # 분석 결과 정리
-        cur.execute("""
-            DELETE FROM analysis_results 
-            WHERE created_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
-        """)
-        
-        # 데이터베이스 정리
-        cur.execute("VACUUM FULL ANALYZE;")
-        
-        conn.commit()
-        print("Database maintenance completed")
-        
-    except Exception as e:
-        print(f"Database maintenance error: {str(e)}")
-        conn.rollback()
-    finally:
-        cur.close()
-        conn.close()
-
-def create_powerbi_tables():
-    """PowerBI 연동용 테이블 생성"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    try:
-        # 1. 응답자 분석 결과 테이블
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS powerbi_respondent_analysis (
-                id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id),
-                analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                department VARCHAR(100),
-                total_count INTEGER,
-                gender_ratio JSONB,
-                age_distribution JSONB,
-                education_stats JSONB,
-                major_distribution JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    """주기적인 데이터베이스 관리 (배치 삭제 + 일반 VACUUM, services/maintenance 참고)
 
-        # 2. OCI 분석 결과 테이블
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS powerbi_oci_analysis (
-                id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id),
-                analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                department VARCHAR(100),
-                question_category VARCHAR(100),
-                avg_score DECIMAL(5,2),
-                response_count INTEGER,
-                score_distribution JSONB,
-                comparison_stats JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # 3. CGS 분석 결과 테이블
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS powerbi_cgs_analysis (
-                id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id),
-                analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                department VARCHAR(100),
-                question_category VARCHAR(100),
-                avg_score DECIMAL(5,2),
-                response_count INTEGER,
-                score_distribution JSONB,
-                improvement_areas JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # 4. 종합 분석 결과 테이블
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS powerbi_comprehensive_analysis (
-                id SERIAL PRIMARY KEY,
-                file_id INTEGER REFERENCES uploaded_files(file_id),
-                analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                analysis_type VARCHAR(50),
-                category VARCHAR(100),
-                metrics JSONB,
-                insights JSONB,
-                recommendations JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        conn.commit()
-        print("✅ PowerBI 테이블 생성 완료")
-        
-    except Exception as e:
-        print(f"❌ PowerBI 테이블 생성 오류: {str(e)}")
-        conn.rollback()
-    finally:
-        cur.close()
-        conn.close()
-
-def save_analysis_for_powerbi(file_id, analysis_type, data):
-    """분석 결과를 PowerBI용 테이블에 저장"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    try:
-        if analysis_type == 'respondent':
-            cur.execute("""
-                INSERT INTO powerbi_respondent_analysis 
-                (file_id, department, total_count, gender_ratio, age_distribution, 
-                 education_stats, major_distribution)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (file_id, data['department'], data['total_count'], 
-                  data['gender_ratio'], data['age_distribution'],
-                  data['education_stats'], data['major_distribution']))
-                  
-        elif analysis_type == 'oci':
-            cur.execute("""
-                INSERT INTO powerbi_oci_analysis 
-                (file_id, department, question_category, avg_score, 
-                 response_count, score_distribution, comparison_stats)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (file_id, data['department'], data['category'], 
-                  data['avg_score'], data['count'], data['distribution'],
-                  data['comparison']))
-                  
-        elif analysis_type == 'cgs':
-            cur.execute("""
-                INSERT INTO powerbi_cgs_analysis 
-                (file_id, department, question_category, avg_score,
-                 response_count, score_distribution, improvement_areas)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (file_id, data['department'], data['category'],
-                  data['avg_score'], data['count'], data['distribution'],
-                  data['improvements']))
-
-        conn.commit()
-        print(f"✅ {analysis_type} 분석 결과 저장 완료")
-        
-    except Exception as e:
-        print(f"❌ 저장 오류: {str(e)}")
-        conn.rollback()
-    finally:
-        cur.close()
-        conn.close() 
\ No newline at end of file
+    반환값: 정리 리포트 (이미 실행 중이면 None). 실패하면 run_maintenance가 출력한 뒤 예외를 그대로 전달
+    """
+    from frontend.services.maintenance import run_maintenance
+    return run_maintenance()
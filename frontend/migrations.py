@@ -0,0 +1,324 @@
+import threading
+from frontend.database import get_db_connection
+from frontend.services.partitions import convert_response_tables
+from frontend.services.powerbi_views import POWERBI_VIEWS, create_powerbi_views
+
+# 분석 서비스(pandas/numpy/scipy)는 해당 마이그레이션을 적용할 때만 import
+# (스키마가 최신이면 앱 시작 시 버전 조회만 하고 무거운 모듈을 불러오지 않음)
+
+# 마이그레이션 실행을 여러 프로세스가 동시에 하지 않도록 잡는 advisory lock 키
+_LOCK_KEY = 0x4F43494D  # "OCIM"
+
+# 이 프로세스에서 확인한 스키마 버전 (최신이면 이후 호출은 DB에 접속하지 않음)
+_checked_version = 0
+_lock = threading.Lock()
+
+def _m001_base_schema(cur):
+    """기본 테이블 (기존 init_database의 CREATE TABLE 블록) + file_id 파티션 응답 테이블"""
+    cur.execute("""
+        -- 파일 업로드 테이블
+        CREATE TABLE IF NOT EXISTS uploaded_files (
+            file_id SERIAL PRIMARY KEY,
+            file_name VARCHAR(200) UNIQUE NOT NULL,
+            status VARCHAR(20),
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- 응답자 정보 테이블
+        CREATE TABLE IF NOT EXISTS respondents (
+            respondent_id VARCHAR(50),
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            department VARCHAR(100),
+            gender VARCHAR(20),
+            age_group VARCHAR(20),
+            education_level VARCHAR(50),
+            major VARCHAR(100),
+            experience_innovation VARCHAR(50),
+            experience_total VARCHAR(50),
+            certifications TEXT,
+            programming_skills TEXT,
+            comments TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (respondent_id, file_id)
+        );
+
+        -- OCI 설문 문항 테이블
+        CREATE TABLE IF NOT EXISTS oci_questions (
+            survey_id VARCHAR(50) PRIMARY KEY,
+            question_category VARCHAR(100),
+            question_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- CGS 설문 문항 테이블
+        CREATE TABLE IF NOT EXISTS cgs_questions (
+            survey_id VARCHAR(50) PRIMARY KEY,
+            question_category VARCHAR(100),
+            question_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- AI 분석 결과 테이블
+        CREATE TABLE IF NOT EXISTS ai_analysis (
+            analysis_id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            UNIQUE(file_id)
+        );
+
+        -- 분석 결과 저장 테이블
+        CREATE TABLE IF NOT EXISTS analysis_results (
+            result_id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_type VARCHAR(50),
+            analysis_item VARCHAR(100),
+            analysis_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            UNIQUE(file_id, analysis_type, analysis_item)
+        );
+    """)
+
+    # OCI/CGS 응답 테이블: 없으면 파티션 테이블로 생성, 기존 단일 테이블이면 변환
+    convert_response_tables(cur)
+
+def _m002_missing_tables(cur):
+    """코드에서 사용하지만 생성된 적 없는 테이블/뷰"""
+    cur.execute("""
+        -- 분석 상태 스냅샷 (save_analysis_state)
+        CREATE TABLE IF NOT EXISTS analysis_states (
+            state_id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_type VARCHAR(100),
+            data_snapshot JSONB,
+            visualization_config JSONB,
+            analysis_text TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            UNIQUE(file_id, analysis_type)
+        );
+
+        -- PowerBI 연동 데이터 (save_to_powerbi_table)
+        CREATE TABLE IF NOT EXISTS powerbi_data (
+            id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_type VARCHAR(100),
+            data_snapshot JSONB,
+            visualization_config JSONB,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(file_id, analysis_type)
+        );
+
+        -- RAG 학습 데이터 (save_for_rag)
+        CREATE TABLE IF NOT EXISTS rag_data (
+            id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_type VARCHAR(50),
+            category VARCHAR(100),
+            analysis_text TEXT,
+            embedding DOUBLE PRECISION[],
+            context_data JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- AI 분석 이력 (save_analysis_for_rag)
+        CREATE TABLE IF NOT EXISTS analysis_history (
+            id SERIAL PRIMARY KEY,
+            analysis_type VARCHAR(100),
+            analysis_text TEXT,
+            data_snapshot JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    # 응답 + 문항 정보를 합친 조회용 뷰 (oci_results/cgs_results를 참조하는 쿼리용)
+    for instrument in ("oci", "cgs"):
+        cur.execute(f"""
+            CREATE OR REPLACE VIEW {instrument}_results AS
+            SELECT
+                r.response_id,
+                r.file_id,
+                r.respondent_id,
+                r.survey_id,
+                q.question_category,
+                q.question_text,
+                r.response,
+                r.response_meaning,
+                r.created_at
+            FROM {instrument}_responses r
+            JOIN {instrument}_questions q ON r.survey_id = q.survey_id
+        """)
+
+def _m003_analysis_result_columns(cur):
+    """분석 이력 화면에서 사용하는 analysis_results 컬럼"""
+    cur.execute("""
+        ALTER TABLE analysis_results
+            ADD COLUMN IF NOT EXISTS category VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS metrics JSONB;
+    """)
+
+def _m004_performance_indexes(cur):
+    """파일 단위 조회/조인/보관 기간 정리에 쓰이는 인덱스"""
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_respondents_file_department
+            ON respondents (file_id, department);
+        CREATE INDEX IF NOT EXISTS idx_oci_responses_file_respondent
+            ON oci_responses (file_id, respondent_id);
+        CREATE INDEX IF NOT EXISTS idx_oci_responses_file_survey
+            ON oci_responses (file_id, survey_id);
+        CREATE INDEX IF NOT EXISTS idx_cgs_responses_file_respondent
+            ON cgs_responses (file_id, respondent_id);
+        CREATE INDEX IF NOT EXISTS idx_cgs_responses_file_survey
+            ON cgs_responses (file_id, survey_id);
+        CREATE INDEX IF NOT EXISTS idx_oci_questions_category
+            ON oci_questions (question_category);
+        CREATE INDEX IF NOT EXISTS idx_cgs_questions_category
+            ON cgs_questions (question_category);
+        CREATE INDEX IF NOT EXISTS idx_uploaded_files_uploaded_at
+            ON uploaded_files (uploaded_at);
+        CREATE INDEX IF NOT EXISTS idx_analysis_results_created_at
+            ON analysis_results (created_at);
+    """)
+
+def _m005_respondent_dimensions(cur):
+    """응답자 속성 사전 테이블 + 정수 코드 컬럼 (services/dimensions 참고), 기존 행 인코딩"""
+    from frontend.services.dimensions import create_dimension_tables, encode_respondents
+    create_dimension_tables(cur)
+    encode_respondents(cur)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_respondents_file_department_code
+            ON respondents (file_id, department_code);
+    """)
+
+def _m006_file_category_scores(cur):
+    """파일별 부서 x 카테고리 집계 인덱스 (services/trends 참고), 기존 파일 채우기"""
+    from frontend.services.trends import create_score_index, refresh_file_scores
+    create_score_index(cur)
+    cur.execute("SELECT file_id FROM uploaded_files WHERE status = 'completed' ORDER BY file_id")
+    for (file_id,) in cur.fetchall():
+        refresh_file_scores(cur, file_id)
+
+def _m007_reliability(cur):
+    """카테고리/문항 신뢰도 테이블 (services/reliability 참고), 기존 파일 계산"""
+    from frontend.services.reliability import create_reliability_tables, refresh_file_reliability
+    create_reliability_tables(cur)
+    cur.execute("SELECT file_id FROM uploaded_files WHERE status = 'completed' ORDER BY file_id")
+    for (file_id,) in cur.fetchall():
+        refresh_file_reliability(cur, file_id)
+
+def _m008_respondent_segments(cur):
+    """응답자 문화 세그먼트 테이블 (services/segments 참고), 기존 파일 계산"""
+    from frontend.services.segments import create_segment_table, assign_segments
+    create_segment_table(cur)
+    cur.execute("SELECT file_id FROM uploaded_files WHERE status = 'completed' ORDER BY file_id")
+    for (file_id,) in cur.fetchall():
+        assign_segments(cur, file_id)
+
+def _m009_text_index(cur):
+    """자격증/기술 태그와 의견 단어 색인 (services/text_analytics 참고), 기존 파일 색인"""
+    from frontend.services.text_analytics import create_text_tables, index_file_text
+    create_text_tables(cur)
+    cur.execute("SELECT file_id FROM uploaded_files WHERE status = 'completed' ORDER BY file_id")
+    for (file_id,) in cur.fetchall():
+        index_file_text(cur, file_id)
+
+def _m010_powerbi_views(cur):
+    """앱에서 쓰던 powerbi_*_analysis 테이블을 응답 테이블 기반 materialized view로 교체"""
+    for name, _, _ in POWERBI_VIEWS:
+        cur.execute("SELECT relkind FROM pg_class WHERE relname = %s AND relnamespace = current_schema()::regnamespace",
+                    (name,))
+        row = cur.fetchone()
+        if row and row[0] == "r":
+            cur.execute(f"DROP TABLE {name} CASCADE")
+    create_powerbi_views(cur)
+
+def _m011_respondent_keyset_index(cur):
+    """원본 데이터 화면의 파일별 keyset 페이지 조회용 인덱스 (services/raw_data 참고)"""
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_respondents_file_respondent
+            ON respondents (file_id, respondent_id);
+    """)
+
+# (버전, 이름, 함수) - 적용된 마이그레이션은 수정하지 말고 새 번호로 추가할 것
+MIGRATIONS = [
+    (1, "base schema", _m001_base_schema),
+    (2, "missing tables and result views", _m002_missing_tables),
+    (3, "analysis_results category/metrics", _m003_analysis_result_columns),
+    (4, "performance indexes", _m004_performance_indexes),
+    (5, "respondent dimension codes", _m005_respondent_dimensions),
+    (6, "file category score index", _m006_file_category_scores),
+    (7, "category reliability", _m007_reliability),
+    (8, "respondent culture segments", _m008_respondent_segments),
+    (9, "respondent text index", _m009_text_index),
+    (10, "powerbi materialized views", _m010_powerbi_views),
+    (11, "respondent keyset index", _m011_respondent_keyset_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(cur):
+    """DB에 기록된 스키마 버전 (schema_migrations 테이블이 없으면 0)"""
+    cur.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    return cur.fetchone()[0]
+
+def run_migrations():
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용하고 적용된 버전 목록 반환
+
+    웜 스타트(이 프로세스에서 이미 최신 확인)에는 DB 접속 없이 바로 반환하고,
+    새 프로세스에서도 최신이면 버전 조회 한 번만 수행함.
+    """
+    global _checked_version
+    if _checked_version >= LATEST_VERSION:
+        return []
+
+    with _lock:
+        if _checked_version >= LATEST_VERSION:
+            return []
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+        applied = []
+        try:
+            version = current_version(cur)
+            if version < LATEST_VERSION:
+                conn.autocommit = False
+                cur.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+                try:
+                    cur.execute("""
+                        CREATE TABLE IF NOT EXISTS schema_migrations (
+                            version INTEGER PRIMARY KEY,
+                            name VARCHAR(200),
+                            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        )
+                    """)
+                    conn.commit()
+                    # 락을 기다리는 동안 다른 프로세스가 적용했을 수 있으므로 다시 확인
+                    version = current_version(cur)
+                    for number, name, migrate in MIGRATIONS:
+                        if number <= version:
+                            continue
+                        migrate(cur)
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                            (number, name)
+                        )
+                        conn.commit()
+                        applied.append(number)
+                        print(f"✅ Migration {number:03d} applied: {name}")
+                    version = LATEST_VERSION
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+                    conn.commit()
+            _checked_version = version
+            return applied
+        finally:
+            cur.close()
+            conn.close()
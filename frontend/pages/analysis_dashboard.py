@@ -1,10 +1,9 @@
 import streamlit as st
 from frontend.database import (
     get_db_connection,
-    save_analysis,
-    load_existing_analysis,  # 추가
     save_analysis_state
 )
+from frontend.services.analysis_store import get_analysis, set_analysis
 from frontend.pages.respondent_analysis import (
     show_basic_status,
     show_department_distribution,
@@ -15,12 +14,16 @@ from frontend.pages.respondent_analysis import (
 )
 from frontend.pages.oci_analysis import show_oci_analysis
 from frontend.pages.cgs_analysis import show_cgs_analysis
+from frontend.pages.correlation_analysis import show_correlation_analysis
+from frontend.pages.trend_analysis import show_trend_analysis
 import pandas as pd
 from frontend.services.ai_analysis import (
     generate_department_analysis,
     generate_comprehensive_report  # 추가
 )
+from frontend.services.profiler import profiled
 
+@profiled()
 def select_file():
     """파일 선택 함수"""
     conn = get_db_connection()
@@ -60,6 +63,7 @@ def select_file():
     
     return None
 
+@profiled(kind="page")
 def show_analysis_dashboard():
     st.title("분석 대시보드")
     
@@ -70,10 +74,12 @@ def show_analysis_dashboard():
         return
     
     # 탭 구성
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "응답자 분석", 
         "OCI 분석", 
         "CGS 분석",
+        "OCI-CGS 상관",
+        "추세 분석",
         "AI 종합분석 리포트"
     ])
     
@@ -84,8 +90,13 @@ def show_analysis_dashboard():
     with tab3:
         show_cgs_analysis(file_id)
     with tab4:
+        show_correlation_analysis(file_id)
+    with tab5:
+        show_trend_analysis(file_id)
+    with tab6:
         show_comprehensive_report(file_id)
 
+@profiled()
 def show_comprehensive_report(file_id):
     st.subheader("AI 종합분석 리포트")
     
@@ -109,7 +120,7 @@ def show_comprehensive_report(file_id):
     )
     
     # 기존 분석 불러오기
-    existing_analysis = load_existing_analysis(file_id, "comprehensive", "report")
+    existing_analysis = get_analysis(file_id, "comprehensive", "report")
     
     col1, col2 = st.columns([3, 1])
     
@@ -139,7 +150,7 @@ def show_comprehensive_report(file_id):
         st.write("")
         # 분석 저장 버튼
         if st.button("💾 분석 저장", use_container_width=True):
-            save_analysis(file_id, "comprehensive", "report", edited_text)
+            set_analysis(file_id, "comprehensive", "report", edited_text)
             st.success("분석 내용이 저장되었습니다!")
         
         st.write("")
@@ -184,18 +195,8 @@ def show_department_analysis(file_id):
         show_ai_analysis(file_id, "department", selected_item)
 
 def show_ai_analysis(file_id, analysis_type, item):
-    # 기존 분석 가져오기
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    cur.execute("""
-        SELECT analysis_text 
-        FROM analysis_results 
-        WHERE file_id = %s AND analysis_type = %s AND analysis_item = %s
-    """, (file_id, analysis_type, item))
-    
-    result = cur.fetchone()
-    existing_analysis = result[0] if result else ""
+    # 기존 분석 가져오기 (파일 단위 저장소)
+    existing_analysis = get_analysis(file_id, analysis_type, item)
     
     # 편집 가능한 분석 텍스트
     edited_analysis = st.text_area(
@@ -207,77 +208,5 @@ def show_ai_analysis(file_id, analysis_type, item):
     
     # 저장 버튼
     if st.button("분석 내용 저장", use_container_width=True):
-        save_analysis(file_id, analysis_type, item, edited_analysis)
+        set_analysis(file_id, analysis_type, item, edited_analysis)
         st.success("분석 내용이 저장되었습니다.")
-
-def save_to_powerbi_table(file_id, table_name, df):
-    """PowerBI용 테이블 저장"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    # 테이블 생성 (없는 경우)
-    create_powerbi_table(cur, table_name, df)
-    
-    # 데이터 저장
-    for _, row in df.iterrows():
-        columns = ", ".join(df.columns)
-        placeholders = ", ".join(["%s"] * len(df.columns))
-        
-        cur.execute(f"""
-            INSERT INTO powerbi_{table_name} (file_id, {columns})
-            VALUES (%s, {placeholders})
-            ON CONFLICT (file_id, department, gender) 
-            DO UPDATE SET 
-                count = EXCLUDED.count,
-                percentage = EXCLUDED.percentage
-        """, (file_id, *row))
-    
-    conn.commit()
-    cur.close()
-    conn.close()
-
-def create_powerbi_table(cur, table_name, df):
-    """PowerBI용 테이블 생성"""
-    columns = ", ".join([
-        f"{col} {get_sql_type(df[col])}"
-        for col in df.columns
-    ])
-    
-    cur.execute(f"""
-        CREATE TABLE IF NOT EXISTS powerbi_{table_name} (
-            id SERIAL PRIMARY KEY,
-            file_id INTEGER REFERENCES uploaded_files(file_id),
-            {columns},
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(file_id, department, gender)
-        )
-    """)
-
-def get_sql_type(series):
-    """pandas 데이터타입을 PostgreSQL 타입으로 변환"""
-    dtype = series.dtype
-    if dtype == 'int64':
-        return 'INTEGER'
-    elif dtype == 'float64':
-        return 'DECIMAL(10,2)'
-    else:
-        return 'VARCHAR(100)'
-
-def save_analysis(file_id, analysis_type, item, analysis_text):
-    """분석 결과 저장"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    cur.execute("""
-        INSERT INTO analysis_results 
-            (file_id, analysis_type, analysis_item, analysis_text, created_at)
-        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-        ON CONFLICT (file_id, analysis_type, analysis_item)
-        DO UPDATE SET 
-            analysis_text = EXCLUDED.analysis_text,
-            updated_at = CURRENT_TIMESTAMP
-    """, (file_id, analysis_type, item, analysis_text))
-    
-    conn.commit()
-    cur.close()
-    conn.close() 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from frontend.database import (
     get_db_connection,
     save_to_powerbi_table,
@@ -11,95 +10,57 @@ from frontend.database import (
 )
 from frontend.services.ai_analysis import generate_department_analysis
 from frontend.components.ai_analysis import show_ai_analysis
+from frontend.services.profiler import profiled, profile_section
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.dimensions import decode
+from frontend.services.statistics import with_error_bars
+from frontend.components.department_tests import show_department_tests
+from frontend.components.reliability import show_reliability
+from frontend.components.segment_view import show_segment_analysis
+from frontend.services.distribution import (
+    get_response_matrix,
+    category_slice,
+    to_percentages,
+    mean_scores
+)
+from frontend.components.distribution_chart import (
+    build_distribution_figure,
+    format_distribution_table
+)
 
 def show_cgs_analysis(file_id):
     st.title("CGS(기업지배구조) 분석")
     
-    # 전체 통계 탭과 부서별 상세 분석 탭으로 구분
-    tab1, tab2 = st.tabs(["전체 통계", "부서별 상세 분석"])
+    # 전체 통계 / 부서별 상세 분석 / 문화 세그먼트 분석 탭으로 구분
+    tab1, tab2, tab3 = st.tabs(["전체 통계", "부서별 상세 분석", "문화 세그먼트 분석"])
     
     with tab1:
         show_overall_statistics(file_id)
     
     with tab2:
         show_detailed_analysis(file_id)
+    
+    with tab3:
+        show_segment_analysis(file_id, "cgs")
 
+@profiled()
 def show_overall_statistics(file_id):
-    # 데이터 가져오기
-    conn = get_db_connection()
-    df = pd.read_sql("""
-        SELECT 
-            q.question_category,
-            q.survey_id,
-            r.response,
-            COUNT(*) as response_count,
-            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY q.survey_id), 1) as percentage
-        FROM cgs_responses r
-        JOIN cgs_questions q ON r.survey_id = q.survey_id
-        WHERE r.file_id = %s
-        GROUP BY q.question_category, q.survey_id, r.response
-        ORDER BY q.question_category, q.survey_id, r.response
-    """, conn, params=[file_id])
-    
-    # 응답 의미 매핑 (7점 척도)
-    response_meanings = {
-        1: '전혀 아니다',
-        2: '아니다',
-        3: '약간 아니다',
-        4: '보통이다',
-        5: '약간 그렇다',
-        6: '그렇다',
-        7: '매우 그렇다'
-    }
-    
-    # 색상 매핑 (7단계)
-    colors = {
-        1: '#FF0000',  # 빨강
-        2: '#FF6666',  # 연한 빨강
-        3: '#FFCC66',  # 주황
-        4: '#FFFF99',  # 노랑
-        5: '#99FF99',  # 연한 초록
-        6: '#66CC66',  # 초록
-        7: '#009900'   # 진한 초록
-    }
+    # 데이터 가져오기 (문항 x 점수 응답 수 행렬)
+    matrix = get_response_matrix(file_id, "cgs")
     
     # 각 카테고리별 분석
-    for category in df['question_category'].unique():
+    for category in matrix.index.get_level_values('question_category').unique():
         st.subheader(f"📊 {category}")
         
         # 해당 카테고리 데이터
-        cat_data = df[df['question_category'] == category]
+        counts = category_slice(matrix, category)
+        percentages = to_percentages(counts)
         
         # 1. 응답 분포 차트
-        fig = go.Figure()
-        
-        for response in sorted(cat_data['response'].unique()):
-            response_data = cat_data[cat_data['response'] == response]
-            
-            fig.add_trace(go.Bar(
-                name=f"{response}점 - {response_meanings[response]}",
-                x=response_data['survey_id'],
-                y=response_data['percentage'],
-                text=response_data['percentage'].apply(lambda x: f'{x:.1f}%'),
-                textposition='auto',
-                marker_color=colors[response]
-            ))
-        
-        fig.update_layout(
-            title=f'{category} - 문항별 응답 분포',
-            barmode='stack',
-            xaxis_title='문항',
-            yaxis_title='응답 비율(%)',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+        fig = get_cached_figure(
+            "response_distribution", percentages, build_distribution_figure,
+            instrument="cgs", title=f'{category} - 문항별 응답 분포'
         )
-        
         st.plotly_chart(fig, use_container_width=True)
         
         # 2. 상세 데이터
@@ -107,9 +68,7 @@ def show_overall_statistics(file_id):
         
         with col1:
             # 평균 점수 계산
-            avg_scores = cat_data.groupby('survey_id').apply(
-                lambda x: (x['response'] * x['response_count']).sum() / x['response_count'].sum()
-            ).round(2)
+            avg_scores = mean_scores(counts).round(2)
             
             st.metric(
                 "카테고리 평균 점수",
@@ -119,8 +78,8 @@ def show_overall_statistics(file_id):
         
         with col2:
             # 긍정 응답 비율 (5~7점)
-            positive_pct = cat_data[cat_data['response'] >= 5]['response_count'].sum() / \
-                         cat_data['response_count'].sum() * 100
+            total = counts.to_numpy().sum()
+            positive_pct = counts[[5, 6, 7]].to_numpy().sum() / total * 100 if total else 0.0
             
             st.metric(
                 "긍정 응답 비율",
@@ -130,18 +89,8 @@ def show_overall_statistics(file_id):
         
         # 3. 응답 분포 테이블
         st.write("### 상세 응답 분포 (%)")
-        pivot_df = pd.pivot_table(
-            cat_data,
-            values='percentage',
-            index='survey_id',
-            columns='response',
-            fill_value=0
-        ).round(1)
-        
-        pivot_df.columns = [f"{col}점 - {response_meanings[col]}" for col in pivot_df.columns]
-        
         st.dataframe(
-            pivot_df.style.format("{:.1f}%"),
+            format_distribution_table(percentages, "cgs").style.format("{:.1f}%"),
             use_container_width=True
         )
 
@@ -157,46 +106,66 @@ def show_detailed_analysis(file_id):
     st.info("부서별 상세 분석 - 개발 중")
     # TODO: 부서별 분석 기능 구현 예정
 
+@profiled()
 def show_category_analysis(file_id, category):
     """카테고리별 분석 표시"""
     conn = get_db_connection()
-    df = pd.read_sql("""
-        WITH avg_scores AS (
-            SELECT 
-                r.respondent_id,
-                d.department,
-                AVG(CAST(r.response AS FLOAT))::numeric as avg_score
-            FROM cgs_responses r
-            JOIN respondents d ON r.respondent_id = d.respondent_id 
-            JOIN cgs_questions q ON r.survey_id = q.survey_id
-            WHERE r.file_id = %s AND q.question_category = %s
-            GROUP BY r.respondent_id, d.department
-        )
-        SELECT 
-            department,
-            COUNT(*) as count,
-            AVG(avg_score)::numeric(10,2) as avg_score,
-            MIN(avg_score)::numeric(10,2) as min_score,
-            MAX(avg_score)::numeric(10,2) as max_score,
-            STDDEV(avg_score)::numeric(10,2) as std_score
-        FROM avg_scores
-        GROUP BY department
-        ORDER BY avg_score DESC
-    """, conn, params=[int(file_id), category])
+    with profile_section("sql", kind="sql"):
+        df = pd.read_sql("""
+            WITH avg_scores AS (
+                SELECT
+                    r.respondent_id,
+                    d.department_code,
+                    AVG(CAST(r.response AS FLOAT))::numeric as avg_score
+                FROM cgs_responses r
+                JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+                JOIN cgs_questions q ON r.survey_id = q.survey_id
+                WHERE r.file_id = %s AND q.question_category = %s
+                GROUP BY r.respondent_id, d.department_code
+            )
+            SELECT
+                department_code,
+                COUNT(*) as count,
+                AVG(avg_score)::numeric(10,2) as avg_score,
+                MIN(avg_score)::numeric(10,2) as min_score,
+                MAX(avg_score)::numeric(10,2) as max_score,
+                STDDEV(avg_score)::numeric(10,2) as std_score
+            FROM avg_scores
+            GROUP BY department_code
+            ORDER BY avg_score DESC
+        """, conn, params=[int(file_id), category])
+        df = decode(df, "department")
 
     st.subheader(f"📊 {category} 분석")
     
-    # 1. 막대 차트 (고유 key 추가)
-    fig1 = px.bar(df, x='department', y='avg_score',
-                  title=f'{category} - 부서별 평균 점수')
-    st.plotly_chart(fig1, use_container_width=True,
-                    key=f"cgs_bar_{category}_{file_id}")
+    with profile_section("charts", kind="plotly"):
+        # 1. 막대 차트 (고유 key 추가) + 95% bootstrap 신뢰구간 오차막대
+        bar_df = with_error_bars(df, file_id, "cgs", category)
+        fig1 = get_cached_figure(
+            "category_bar_ci", bar_df,
+            lambda d, title: px.bar(d, x='department', y='avg_score',
+                                    error_y='error_plus', error_y_minus='error_minus',
+                                    hover_data=['count', 'ci_low', 'ci_high'], title=title),
+            title=f'{category} - 부서별 평균 점수 (95% 신뢰구간)'
+        )
+        st.plotly_chart(fig1, use_container_width=True,
+                        key=f"cgs_bar_{category}_{file_id}")
+
+        # 2. 박스 플롯 (고유 key 추가)
+        fig2 = get_cached_figure(
+            "category_box", df,
+            lambda d, title: px.box(d, x='department', y='avg_score', title=title),
+            title=f'{category} - 부서별 분포'
+        )
+        st.plotly_chart(fig2, use_container_width=True,
+                        key=f"cgs_box_{category}_{file_id}")
+
+    # 부서 간 차이 유의성 (파일 단위로 모든 카테고리를 한 번에 계산해 캐시)
+    with profile_section("statistics", kind="pandas"):
+        show_department_tests(file_id, "cgs", category)
 
-    # 2. 박스 플롯 (고유 key 추가)
-    fig2 = px.box(df, x='department', y='avg_score',
-                  title=f'{category} - 부서별 분포')
-    st.plotly_chart(fig2, use_container_width=True,
-                    key=f"cgs_box_{category}_{file_id}")
+    # 문항 신뢰도 (업로드 시 계산된 값 조회)
+    show_reliability(file_id, "cgs", category)
 
     # AI 분석 섹션
     show_ai_analysis(file_id, df, ("cgs", category), f"cgs_{category}") 
\ No newline at end of file
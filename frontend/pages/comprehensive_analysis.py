@@ -1,20 +1,28 @@
 import streamlit as st
 import pandas as pd
-from frontend.database import get_db_connection, save_analysis_for_powerbi
+from frontend.database import get_db_connection
 from frontend.services.ai_analysis import generate_comprehensive_report
+from frontend.services.profiler import profiled
 
+@profiled(kind="page")
 def show_comprehensive_analysis(file_id=None):
     st.title("🤖 AI 종합분석 리포트")
     
     conn = get_db_connection()
     
-    # 파일 목록 가져오기
+    # 파일 목록 가져오기 (적재 중/삭제 중인 파일 제외)
     files = pd.read_sql("""
         SELECT file_id, file_name, uploaded_at 
         FROM uploaded_files 
+        WHERE status = 'completed'
         ORDER BY uploaded_at DESC
     """, conn)
     
+    if files.empty:
+        st.warning("처리된 파일이 없습니다. 먼저 파일을 업로드하고 처리해주세요.")
+        conn.close()
+        return
+    
     # 파일 선택
     selected = st.selectbox(
         "분석할 파일 선택",
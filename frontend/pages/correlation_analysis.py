@@ -0,0 +1,75 @@
+import streamlit as st
+import plotly.graph_objects as go
+from frontend.services.profiler import profiled
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.correlation import (
+    METHODS,
+    get_correlations,
+    cross_block,
+    strongest_pairs
+)
+
+# 차트 빌더: get_cached_figure 캐시 미스일 때만 호출됨
+def _correlation_heatmap(df, title):
+    fig = go.Figure(go.Heatmap(
+        z=df.values,
+        x=df.columns.tolist(),
+        y=df.index.tolist(),
+        text=df.round(2).values,
+        texttemplate="%{text}",
+        colorscale="RdBu",
+        zmin=-1,
+        zmax=1,
+        colorbar=dict(title="r")
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="CGS 카테고리",
+        yaxis_title="OCI 카테고리",
+        height=max(450, 35 * len(df.index))
+    )
+    return fig
+
+@profiled(kind="page")
+def show_correlation_analysis(file_id):
+    st.subheader("OCI - CGS 상관 분석")
+
+    method = st.radio(
+        "상관계수", METHODS,
+        format_func=lambda m: "Pearson" if m == "pearson" else "Spearman (순위)",
+        horizontal=True,
+        key="correlation_method"
+    )
+
+    result = get_correlations(file_id)
+    if result["respondents"] < 3:
+        st.warning("OCI와 CGS에 모두 응답한 응답자가 부족합니다.")
+        return
+    st.caption(f"두 진단에 모두 응답한 응답자 {result['respondents']:,}명 기준")
+
+    cross = cross_block(result[method])
+    fig = get_cached_figure(
+        "correlation_heatmap", cross, _correlation_heatmap,
+        title=f"OCI x CGS 카테고리 상관 ({method.title()})"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.write("**상관이 강한 카테고리 쌍**")
+    pairs = strongest_pairs(file_id, method)
+    st.dataframe(
+        pairs.rename(columns={
+            "oci_category": "OCI 카테고리",
+            "cgs_category": "CGS 카테고리",
+            "r": "상관계수",
+            "p_value": "p-value",
+            "significant": "유의"
+        }).round(3),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    with st.expander("전체 상관행렬"):
+        full = result[method].copy()
+        full.index = [f"{instrument} {category}" for instrument, category in full.index]
+        full.columns = full.index
+        st.dataframe(full.round(2), use_container_width=True)
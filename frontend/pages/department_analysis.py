@@ -4,11 +4,10 @@ import plotly.express as px
 from frontend.database import (
     get_db_connection, 
     save_to_powerbi_table,
-    save_analysis,
-    load_existing_analysis,
     save_analysis_state
 )
 from frontend.services.ai_analysis import generate_department_analysis
+from frontend.services.analysis_store import get_analysis, set_analysis
 
 def show_department_analysis_page(file_id, subcategory):
     if subcategory == "1. 기본 현황":
@@ -111,7 +110,7 @@ def show_department_distribution(file_id):
         if st.button("AI 분석 실행", use_container_width=True):
             with st.spinner("AI가 분석 중입니다..."):
                 analysis_text = generate_department_analysis(df)
-                save_analysis(file_id, "department", "distribution", analysis_text)
+                set_analysis(file_id, "department", "distribution", analysis_text)
                 st.success("AI 분석이 완료되었습니다!")
                 # AI 분석 결과를 텍스트 영역에 자동으로 표시하기 위해 페이지 새로고침
                 st.experimental_rerun()
@@ -123,7 +122,7 @@ def show_department_distribution(file_id):
     
     # 분석 내용 편집 영역
     st.subheader("분석 내용")
-    existing_analysis = load_existing_analysis(file_id, "department", "distribution")
+    existing_analysis = get_analysis(file_id, "department", "distribution")
     edited_analysis = st.text_area(
         "분석 내용을 입력하거나 수정하세요",
         value=existing_analysis,  # 저장된 분석 내용이나 AI 분석 결과가 여기에 표시됨
@@ -173,7 +172,7 @@ def show_gender_distribution(file_id):
         if st.button("AI 분석 실행", key="gender_ai", use_container_width=True):
             with st.spinner("AI가 분석 중입니다..."):
                 analysis_text = generate_department_analysis(df)
-                save_analysis(file_id, "gender", "distribution", analysis_text)
+                set_analysis(file_id, "gender", "distribution", analysis_text)
                 st.success("AI 분석이 완료되었습니다!")
     
     with col_button2:
@@ -183,7 +182,7 @@ def show_gender_distribution(file_id):
     
     # 분석 내용 편집 영역
     st.subheader("분석 내용")
-    existing_analysis = load_existing_analysis(file_id, "gender", "distribution")
+    existing_analysis = get_analysis(file_id, "gender", "distribution")
     edited_analysis = st.text_area(
         "분석 내용을 입력하거나 수정하세요",
         value=existing_analysis,
@@ -192,7 +191,7 @@ def show_gender_distribution(file_id):
     )
     
     if st.button("분석 내용 업데이트", key="gender_update", use_container_width=True):
-        save_analysis(file_id, "gender", "distribution", edited_analysis)
+        set_analysis(file_id, "gender", "distribution", edited_analysis)
         st.success("분석 내용이 업데이트되었습니다!")
 
 def show_age_distribution(file_id):
@@ -238,7 +237,7 @@ def show_age_distribution(file_id):
         if st.button("AI 분석 실행", key="age_ai", use_container_width=True):
             with st.spinner("AI가 분석 중입니다..."):
                 analysis_text = generate_department_analysis(df)
-                save_analysis(file_id, "age", "distribution", analysis_text)
+                set_analysis(file_id, "age", "distribution", analysis_text)
                 st.success("AI 분석이 완료되었습니다!")
     
     with col_button2:
@@ -248,7 +247,7 @@ def show_age_distribution(file_id):
     
     # 분석 내용 편집 영역
     st.subheader("분석 내용")
-    existing_analysis = load_existing_analysis(file_id, "age", "distribution")
+    existing_analysis = get_analysis(file_id, "age", "distribution")
     edited_analysis = st.text_area(
         "분석 내용을 입력하거나 수정하세요",
         value=existing_analysis,
@@ -257,7 +256,7 @@ def show_age_distribution(file_id):
     )
     
     if st.button("분석 내용 업데이트", key="age_update", use_container_width=True):
-        save_analysis(file_id, "age", "distribution", edited_analysis)
+        set_analysis(file_id, "age", "distribution", edited_analysis)
         st.success("분석 내용이 업데이트되었습니다!")
 
 def show_education_distribution(file_id):
@@ -303,7 +302,7 @@ def show_education_distribution(file_id):
         if st.button("AI 분석 실행", key="edu_ai", use_container_width=True):
             with st.spinner("AI가 분석 중입니다..."):
                 analysis_text = generate_department_analysis(df)
-                save_analysis(file_id, "education", "distribution", analysis_text)
+                set_analysis(file_id, "education", "distribution", analysis_text)
                 st.success("AI 분석이 완료되었습니다!")
     
     with col_button2:
@@ -313,7 +312,7 @@ def show_education_distribution(file_id):
     
     # 분석 내용 편집 영역
     st.subheader("분석 내용")
-    existing_analysis = load_existing_analysis(file_id, "education", "distribution")
+    existing_analysis = get_analysis(file_id, "education", "distribution")
     edited_analysis = st.text_area(
         "분석 내용을 입력하거나 수정하세요",
         value=existing_analysis,
@@ -322,7 +321,7 @@ def show_education_distribution(file_id):
     )
     
     if st.button("분석 내용 업데이트", key="edu_update", use_container_width=True):
-        save_analysis(file_id, "education", "distribution", edited_analysis)
+        set_analysis(file_id, "education", "distribution", edited_analysis)
         st.success("분석 내용이 업데이트되었습니다!")
 
 def show_major_distribution(file_id):
@@ -368,7 +367,7 @@ def show_major_distribution(file_id):
         if st.button("AI 분석 실행", key="major_ai", use_container_width=True):
             with st.spinner("AI가 분석 중입니다..."):
                 analysis_text = generate_department_analysis(df)
-                save_analysis(file_id, "major", "distribution", analysis_text)
+                set_analysis(file_id, "major", "distribution", analysis_text)
                 st.success("AI 분석이 완료되었습니다!")
     
     with col_button2:
@@ -378,7 +377,7 @@ def show_major_distribution(file_id):
     
     # 분석 내용 편집 영역
     st.subheader("분석 내용")
-    existing_analysis = load_existing_analysis(file_id, "major", "distribution")
+    existing_analysis = get_analysis(file_id, "major", "distribution")
     edited_analysis = st.text_area(
         "분석 내용을 입력하거나 수정하세요",
         value=existing_analysis,
@@ -387,5 +386,5 @@ def show_major_distribution(file_id):
     )
     
     if st.button("분석 내용 업데이트", key="major_update", use_container_width=True):
-        save_analysis(file_id, "major", "distribution", edited_analysis)
+        set_analysis(file_id, "major", "distribution", edited_analysis)
         st.success("분석 내용이 업데이트되었습니다!") 
\ No newline at end of file
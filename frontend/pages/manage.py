@@ -1,5 +1,19 @@
 import streamlit as st
 from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+from frontend.services.maintenance import (
+    delete_file_in_background,
+    get_deletion_progress,
+    clear_finished_deletions,
+    table_bloat_report,
+    run_maintenance_in_background,
+    is_maintenance_running,
+    get_last_maintenance_report,
+    RETENTION_DAYS
+)
+from frontend.services.parquet_export import export_file, export_dir
+from frontend.services.raw_data import RAW_TABLES, PAGE_SIZES, fetch_page, count_rows, download_builder
+from frontend.components.fragment import fragment
 
 def get_file_list():
     conn = get_db_connection()
@@ -7,6 +21,7 @@ def get_file_list():
     cur.execute("""
         SELECT file_id, file_name 
         FROM uploaded_files 
+        WHERE status IS DISTINCT FROM 'deleting'
         ORDER BY uploaded_at DESC
     """)
     files = cur.fetchall()
@@ -14,6 +29,7 @@ def get_file_list():
     conn.close()
     return files
 
+@profiled(kind="page")
 def show_manage_page():
     st.title("📁 파일 관리 페이지")
     
@@ -27,34 +43,112 @@ def show_manage_page():
     
     with col1:
         if st.button("상세 보기"):
-            show_file_details(selected_file, max_rows=5)
+            # 페이지 이동/다운로드 위젯이 rerun해도 열린 상태 유지
+            opened = st.session_state.get("manage_details_file")
+            st.session_state["manage_details_file"] = None if opened == selected_file[0] else selected_file[0]
+    
+    with col2:
+        if st.button("Parquet 내보내기"):
+            export_parquet(selected_file)
     
     with col3:
         if st.button("파일 삭제"):
             delete_file(selected_file)
+    
+    if get_deletion_progress():
+        show_deletion_progress()
+    
+    if selected_file and st.session_state.get("manage_details_file") == selected_file[0]:
+        show_file_details(selected_file)
+    
+    show_maintenance_panel()
+
+def show_maintenance_panel():
+    """DB 정리 실행 및 테이블별 bloat/회수 공간 리포트"""
+    with st.expander("🧹 데이터베이스 정리"):
+        st.caption(f"{RETENTION_DAYS}일이 지난 파일과 분석 결과를 배치 삭제한 뒤 일반 VACUUM으로 정리합니다. "
+                   "정리 중에도 조회는 계속 가능합니다.")
+        
+        if is_maintenance_running():
+            st.info("정리 작업이 진행 중입니다.")
+        elif st.button("정리 실행"):
+            run_maintenance_in_background()
+            st.info("백그라운드에서 정리 작업을 시작했습니다.")
+        
+        report = get_last_maintenance_report()
+        if report:
+            st.write(f"마지막 정리: {report['finished_at']} ({report['duration_s']}초)")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("삭제 파일", f"{len(report['purged_files'])}개")
+            col2.metric("삭제 행", f"{sum(report['deleted_rows'].values()):,}")
+            col3.metric("회수 공간", f"{report['reclaimed_bytes'] / 1024 / 1024:,.1f} MB")
+        
+        conn = get_db_connection()
+        cur = conn.cursor()
+        try:
+            st.dataframe(table_bloat_report(cur), use_container_width=True)
+        finally:
+            cur.close()
+            conn.close()
+
+def _move_page(pages_key, last_key=None):
+    # 다음: 현재 페이지 마지막 키를 쌓음, 이전: 꺼냄
+    if last_key is None:
+        st.session_state[pages_key].pop()
+    else:
+        st.session_state[pages_key].append(last_key)
 
-def show_file_details(selected_file, max_rows=5):
+@fragment
+def show_file_details(selected_file):
+    """원본 데이터 브라우저 (fragment: 페이지 이동 시 이 부분만 다시 실행)
+
+    keyset 페이지로 필요한 행만 조회하고, 전체 다운로드는 버튼을 누를 때 서버 측 커서로 스트리밍
+    """
     file_id = selected_file[0]
-    conn = get_db_connection()
-    cur = conn.cursor()
+    st.subheader("원본 데이터")
     
-    # 기초분석 데이터
-    st.subheader("기초분석 데이터")
-    cur.execute("SELECT * FROM respondents WHERE file_id = %s LIMIT %s", (file_id, max_rows))
-    st.dataframe(cur.fetchall())
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        table = st.selectbox("테이블", list(RAW_TABLES), format_func=lambda name: RAW_TABLES[name][0],
+                             key=f"raw_table_{file_id}")
+    with col2:
+        page_size = st.selectbox("페이지 크기", PAGE_SIZES, index=1, key=f"raw_page_size_{file_id}")
     
-    # OCI 데이터
-    st.subheader("OCI 데이터")
-    cur.execute("SELECT * FROM oci_responses WHERE file_id = %s LIMIT %s", (file_id, max_rows))
-    st.dataframe(cur.fetchall())
+    # 페이지마다 시작 키(이전 페이지 마지막 키)를 쌓아 두고 이전 페이지는 꺼내서 이동
+    pages_key = f"raw_pages_{file_id}_{table}_{page_size}"
+    if pages_key not in st.session_state:
+        st.session_state[pages_key] = [None]
+    pages = st.session_state[pages_key]
     
-    # CGS 데이터
-    st.subheader("CGS 데이터")
-    cur.execute("SELECT * FROM cgs_responses WHERE file_id = %s LIMIT %s", (file_id, max_rows))
-    st.dataframe(cur.fetchall())
+    try:
+        df, last_key, has_more = fetch_page(file_id, table, pages[-1], page_size)
+        total = count_rows(file_id, table)
+    except Exception as e:
+        st.error(f"데이터 조회 중 오류 발생: {str(e)}")
+        return
     
-    cur.close()
-    conn.close() 
+    first = (len(pages) - 1) * page_size
+    st.caption(f"{first + 1 if len(df) else 0:,}–{first + len(df):,} / {total:,}행")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.button("◀ 이전", key=f"raw_prev_{pages_key}", disabled=len(pages) == 1,
+                  on_click=_move_page, args=(pages_key,))
+    with col2:
+        st.button("다음 ▶", key=f"raw_next_{pages_key}", disabled=not has_more,
+                  on_click=_move_page, args=(pages_key, last_key))
+    with col3:
+        fmt = st.radio("다운로드 형식", ["CSV", "Parquet"], horizontal=True, key=f"raw_format_{file_id}")
+        extension, mime = ("parquet", "application/vnd.apache.parquet") if fmt == "Parquet" else ("csv", "text/csv")
+        st.download_button(
+            f"⬇️ 전체 {RAW_TABLES[table][0]} 다운로드",
+            data=download_builder(file_id, table, extension),
+            file_name=f"file_{file_id}_{table}.{extension}",
+            mime=mime,
+            on_click="ignore",
+            key=f"raw_download_{file_id}_{table}_{extension}"
+        )
 
 def show_analysis_results(selected_file):
     file_id = selected_file[0]
@@ -80,19 +174,49 @@ def show_analysis_results(selected_file):
     cur.close()
     conn.close() 
 
+def export_parquet(selected_file):
+    """BI 도구용 Parquet 스냅샷 (응답자/응답/집계 데이터셋) 내보내기"""
+    file_id = selected_file[0]
+    try:
+        with st.spinner("Parquet 파일을 만드는 중..."):
+            manifest = export_file(file_id)
+        rows = sum(dataset["rows"] for dataset in manifest["datasets"].values())
+        st.success(f"✅ {len(manifest['datasets'])}개 데이터셋({rows:,}행)을 "
+                   f"'{export_dir(file_id)}'에 저장했습니다.")
+    except Exception as e:
+        st.error(f"내보내기 중 오류 발생: {str(e)}")
+
 def delete_file(selected_file):
     file_id = selected_file[0]
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
     try:
-        # CASCADE 설정으로 인해 관련된 모든 데이터가 함께 삭제됨
-        cur.execute("DELETE FROM uploaded_files WHERE file_id = %s", (file_id,))
-        conn.commit()
-        st.success("파일이 삭제되었습니다.")
+        # 파일을 바로 숨기고 관련 테이블(powerbi_* 포함)은 백그라운드에서 배치로 삭제
+        if delete_file_in_background(file_id):
+            st.session_state.pop("manage_details_file", None)
+            st.rerun()
+        else:
+            st.info("이미 삭제 중인 파일입니다.")
     except Exception as e:
-        conn.rollback()
         st.error(f"삭제 중 오류 발생: {str(e)}")
-    finally:
-        cur.close()
-        conn.close() 
\ No newline at end of file
+
+@fragment(run_every=2)
+def show_deletion_progress():
+    """백그라운드 파일 삭제 진행 상황 (fragment: 2초마다 이 부분만 갱신)"""
+    progress = get_deletion_progress()
+    if not progress:
+        return
+    
+    st.subheader("파일 삭제 진행 상황")
+    for file_id, state in sorted(progress.items()):
+        if state["status"] == "running":
+            total = state["total_tables"] or 0
+            current = f" - {state['current_table']}" if state["current_table"] else ""
+            st.progress(state["done_tables"] / total if total else 0.0,
+                        text=f"file_id={file_id}: {state['deleted_rows']:,}행 삭제{current}")
+        elif state["status"] == "done":
+            st.success(f"file_id={file_id}: 삭제 완료 ({state['deleted_rows']:,}행, {state['duration_s']}초)")
+        else:
+            st.error(f"file_id={file_id}: 삭제 중 오류 발생: {state['error']} "
+                     "(다음 정리 작업에서 이어서 삭제합니다)")
+    
+    if all(state["status"] != "running" for state in progress.values()):
+        st.button("확인", key="clear_deletions", on_click=clear_finished_deletions) 
\ No newline at end of file
@@ -1,51 +1,69 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from frontend.database import (
     get_db_connection,
     save_to_powerbi_table,
-    save_analysis,
-    load_existing_analysis,
     save_analysis_state
 )
-from frontend.services.ai_analysis import generate_department_analysis
+from frontend.services.ai_analysis import generate_department_analysis, generate_oci_analysis
+from frontend.services.profiler import profiled, profile_section
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.dimensions import decode
+from frontend.services.statistics import category_statistics, with_error_bars
+from frontend.components.department_tests import show_department_tests
+from frontend.components.reliability import show_reliability
+from frontend.components.segment_view import show_segment_analysis
+from frontend.components.circumplex_chart import build_circumplex_figure
+from frontend.services.circumplex import (
+    CLUSTERS,
+    get_style_scores,
+    circumplex_profile,
+    style_for_survey_id
+)
+from frontend.components.fragment import fragment, rerun_fragment
+from frontend.services.analysis_store import (
+    get_analysis,
+    stage_analysis,
+    stage_widget_edit,
+    set_analysis,
+    flush_analyses
+)
+from frontend.services.distribution import (
+    get_response_matrix,
+    category_slice,
+    to_percentages,
+    mean_scores
+)
+from frontend.components.distribution_chart import (
+    build_distribution_figure,
+    format_distribution_table
+)
 
 def get_category_from_survey_id(survey_id):
-    # survey_id에서 카테고리 매핑
-    category_mapping = {
-        '인간적': '인간적-도움 (Humanistic-Helpful)',
-        '친화적': '친화적 (Affiliative)',
-        '승인': '승인 (Approval)',
-        '전통적': '전통적 (Conventional)',
-        '의존적': '의존적 (Dependent)',
-        '회피적': '회피적 (Avoidance)',
-        '반대적': '반대적 (Oppositional)',
-        '권력': '권력 (Power)',
-        '경쟁': '경쟁적 (Competitive)',
-        '능력': '유능/완벽주의적 (Competence/Perfectionistic)',
-        '성취': '성취 (Achievement)',
-        '자아': '자기 실현적 (Self-Actualizing)'
-    }
-    
-    for key in category_mapping:
-        if key in survey_id:
-            return category_mapping[key]
-    return survey_id
+    # survey_id에서 카테고리 매핑 (스타일 정의는 services/circumplex.STYLES)
+    return style_for_survey_id(survey_id)
 
 def show_oci_analysis(file_id):
     st.title("OCI(조직문화) 분석")
     
-    # 전체 통계 탭과 부서별 상세 분석 탭으로 구분
-    tab1, tab2 = st.tabs(["전체 통계", "부서별 상세 분석"])
+    # 전체 통계 / 부서별 상세 분석 / 문화 세그먼트 분석 탭으로 구분
+    tab1, tab2, tab3 = st.tabs(["전체 통계", "부서별 상세 분석", "문화 세그먼트 분석"])
     
     with tab1:
         show_overall_statistics(file_id)
     
     with tab2:
         show_detailed_analysis(file_id)
+    
+    with tab3:
+        show_segment_analysis(file_id, "oci")
 
+@profiled()
 def show_overall_statistics(file_id):
+    # 12개 스타일 circumplex (파일 단위 점수 캐시에서 그림)
+    show_circumplex(file_id)
+
     st.subheader("OCI 문항 카테고리별 전체 통계")
     
     # 카테고리 목록 가져오기
@@ -56,106 +74,79 @@ def show_overall_statistics(file_id):
         ORDER BY question_category
     """, conn)
     
+    # 전체 카테고리의 문항 x 점수 행렬을 한 번에 조회
+    matrix = get_response_matrix(file_id, "oci")
+    
     # 탭으로 10가지 카테고리 표시
     tabs = st.tabs(categories['question_category'].tolist())
     
     for idx, tab in enumerate(tabs):
         with tab:
-            show_category_response_distribution(file_id, categories['question_category'].iloc[idx])
+            category = categories['question_category'].iloc[idx]
+            show_category_response_distribution(file_id, category, category_slice(matrix, category))
 
-def show_category_response_distribution(file_id, category):
-    # 해당 카테고리의 응답 분포 데이터 가져오기
-    conn = get_db_connection()
-    df = pd.read_sql("""
-        SELECT 
-            q.question_category,
-            q.survey_id,
-            r.response,
-            COUNT(*) as response_count,
-            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY q.survey_id), 1) as percentage
-        FROM oci_responses r
-        JOIN oci_questions q ON r.survey_id = q.survey_id
-        WHERE r.file_id = %s AND q.question_category = %s
-        GROUP BY q.question_category, q.survey_id, r.response
-        ORDER BY q.survey_id, r.response
-    """, conn, params=[file_id, category])
-    
-    # 응답 의미 매핑
-    response_meanings = {
-        1: '전혀 그렇지 않다',
-        2: '그렇지 않다',
-        3: '보통이다',
-        4: '그렇다',
-        5: '매우 그렇다'
-    }
+@profiled()
+def show_circumplex(file_id):
+    st.subheader("OCI Circumplex")
+    respondents, departments, overall = get_style_scores(file_id)
+    if respondents.empty:
+        st.info("OCI 응답 데이터가 없습니다.")
+        return
+
+    options = ["전체"] + [d for d in departments.index if d is not None]
+    target = st.selectbox("대상", options, key=f"circumplex_target_{file_id}")
+    row = overall.iloc[0] if target == "전체" else departments.loc[target]
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fig = get_cached_figure(
+            "oci_circumplex", circumplex_profile(row), build_circumplex_figure,
+            title=f"{target} 스타일 프로파일 (백분위)"
+        )
+        st.plotly_chart(fig, use_container_width=True, key=f"circumplex_{file_id}")
+    with col2:
+        st.metric("응답자 수", f"{int(row['respondents']):,}명")
+        for cluster, meta in CLUSTERS.items():
+            st.metric(f"{meta['label']} 클러스터", f"{row[f'cluster_{cluster}']:.2f}")
+        st.caption("백분위는 같은 파일 응답자 분포 대비 위치입니다.")
+
+    with st.expander("부서별 스타일/클러스터 점수"):
+        table = departments.rename(columns=lambda c: c.replace("cluster_", "클러스터 "))
+        st.dataframe(table.drop(columns=[c for c in table.columns if c.startswith("pct_")]).round(2),
+                     use_container_width=True)
+
+@profiled()
+def show_category_response_distribution(file_id, category, counts=None):
+    # 해당 카테고리의 문항 x 점수 응답 수 행렬
+    if counts is None:
+        counts = category_slice(get_response_matrix(file_id, "oci", category), category)
+    
+    if counts.empty:
+        st.info("응답 데이터가 없습니다.")
+        return
+    
+    percentages = to_percentages(counts)
     
     # 1. 상단: 주요 통계
-    avg_score = df.groupby('survey_id').apply(
-        lambda x: (x['response'] * x['response_count']).sum() / x['response_count'].sum()
-    ).mean()
+    avg_score = mean_scores(counts).mean()
     
     st.metric("카테고리 평균 점수", f"{avg_score:.2f}")
     
     # 2. 응답 분포 차트
-    fig = go.Figure()
-    
-    # 각 응답 값별로 막대 추가 (색상 지정)
-    colors = {
-        1: '#FF9999',  # 빨간색 계열
-        2: '#FFB366',  # 주황색 계열
-        3: '#FFFF99',  # 노란색 계열
-        4: '#99FF99',  # 초록색 계열
-        5: '#99CCFF'   # 파란색 계열
-    }
-    
-    for response in sorted(df['response'].unique()):
-        response_data = df[df['response'] == response]
-        meaning = response_meanings[response]
-        
-        fig.add_trace(go.Bar(
-            name=f"{response}점 - {meaning}",
-            x=response_data['survey_id'],
-            y=response_data['percentage'],
-            text=response_data['percentage'].apply(lambda x: f'{x:.1f}%'),
-            textposition='auto',
-            marker_color=colors[response]
-        ))
-    
-    # 차트 레이아웃 설정
-    fig.update_layout(
-        title=f'{category} - 문항별 응답 분포',
-        barmode='stack',
-        xaxis_title='문항',
-        yaxis_title='응답 비율(%)',
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+    fig = get_cached_figure(
+        "response_distribution", percentages, build_distribution_figure,
+        instrument="oci", title=f'{category} - 문항별 응답 분포'
     )
-    
     st.plotly_chart(fig, use_container_width=True)
     
     # 3. 상세 데이터 테이블
-    pivot_df = df.pivot_table(
-        values='percentage',
-        index='survey_id',
-        columns='response',
-        fill_value=0
-    ).round(1)
-    
-    # 컬럼명에 응답 의미 추가
-    pivot_df.columns = [f"{col}점 - {response_meanings[col]}" for col in pivot_df.columns]
-    
     st.write("### 상세 응답 분포 (%)")
     st.dataframe(
-        pivot_df.style.format("{:.1f}%"),
+        format_distribution_table(percentages, "oci").style.format("{:.1f}%"),
         use_container_width=True
     )
 
+@profiled()
 def show_detailed_analysis(file_id):
     # 기존의 부서별 상세 분석 코드...
     st.title("OCI(조직문화) 분석")
@@ -198,82 +189,112 @@ def show_detailed_analysis(file_id):
         with tab:
             show_category_analysis(file_id, categories['question_category'].iloc[idx])
 
+@profiled()
 def show_category_analysis(file_id, category):
     """카테고리별 분석 표시"""
     conn = get_db_connection()
-    df = pd.read_sql("""
-        WITH avg_scores AS (
-            SELECT 
-                r.respondent_id,
-                d.department,
-                AVG(CAST(r.response AS FLOAT))::numeric as avg_score
-            FROM oci_responses r
-            JOIN respondents d ON r.respondent_id = d.respondent_id 
-            JOIN oci_questions q ON r.survey_id = q.survey_id
-            WHERE r.file_id = %s AND q.question_category = %s
-            GROUP BY r.respondent_id, d.department
-        )
-        SELECT 
-            department,
-            COUNT(*) as count,
-            AVG(avg_score)::numeric(10,2) as avg_score,
-            MIN(avg_score)::numeric(10,2) as min_score,
-            MAX(avg_score)::numeric(10,2) as max_score,
-            STDDEV(avg_score)::numeric(10,2) as std_score
-        FROM avg_scores
-        GROUP BY department
-        ORDER BY avg_score DESC
-    """, conn, params=[int(file_id), category])
+    with profile_section("sql", kind="sql"):
+        df = pd.read_sql("""
+            WITH avg_scores AS (
+                SELECT
+                    r.respondent_id,
+                    d.department_code,
+                    AVG(CAST(r.response AS FLOAT))::numeric as avg_score
+                FROM oci_responses r
+                JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+                JOIN oci_questions q ON r.survey_id = q.survey_id
+                WHERE r.file_id = %s AND q.question_category = %s
+                GROUP BY r.respondent_id, d.department_code
+            )
+            SELECT
+                department_code,
+                COUNT(*) as count,
+                AVG(avg_score)::numeric(10,2) as avg_score,
+                MIN(avg_score)::numeric(10,2) as min_score,
+                MAX(avg_score)::numeric(10,2) as max_score,
+                STDDEV(avg_score)::numeric(10,2) as std_score
+            FROM avg_scores
+            GROUP BY department_code
+            ORDER BY avg_score DESC
+        """, conn, params=[int(file_id), category])
+        df = decode(df, "department")
 
     # 각 차트에 고유한 key 부여
     st.subheader(f"📊 {category} 분석")
-    
-    # 1. 막대 차트
-    fig1 = px.bar(df, x='department', y='avg_score', 
-                  title=f'{category} - 부서별 평균 점수')
-    st.plotly_chart(fig1, use_container_width=True, 
-                    key=f"oci_bar_{category}_{file_id}")
 
-    # 2. 박스 플롯
-    fig2 = px.box(df, x='department', y='avg_score',
-                  title=f'{category} - 부서별 분포')
-    st.plotly_chart(fig2, use_container_width=True, 
-                    key=f"oci_box_{category}_{file_id}")
+    with profile_section("charts", kind="plotly"):
+        # 1. 막대 차트 + 95% bootstrap 신뢰구간 오차막대
+        bar_df = with_error_bars(df, file_id, "oci", category)
+        fig1 = get_cached_figure(
+            "category_bar_ci", bar_df,
+            lambda d, title: px.bar(d, x='department', y='avg_score',
+                                    error_y='error_plus', error_y_minus='error_minus',
+                                    hover_data=['count', 'ci_low', 'ci_high'], title=title),
+            title=f'{category} - 부서별 평균 점수 (95% 신뢰구간)'
+        )
+        st.plotly_chart(fig1, use_container_width=True,
+                        key=f"oci_bar_{category}_{file_id}")
+
+        # 2. 박스 플롯
+        fig2 = get_cached_figure(
+            "category_box", df,
+            lambda d, title: px.box(d, x='department', y='avg_score', title=title),
+            title=f'{category} - 부서별 분포'
+        )
+        st.plotly_chart(fig2, use_container_width=True,
+                        key=f"oci_box_{category}_{file_id}")
+
+    # 부서 간 차이 유의성 (파일 단위로 모든 카테고리를 한 번에 계산해 캐시)
+    with profile_section("statistics", kind="pandas"):
+        show_department_tests(file_id, "oci", category)
+
+    # 문항 신뢰도 (업로드 시 계산된 값 조회)
+    show_reliability(file_id, "oci", category)
 
     # AI 분석 섹션
     show_ai_analysis(file_id, df, ("oci", category), f"oci_{category}")
 
+@fragment
 def show_ai_analysis(file_id, df, analysis_type, key_prefix):
-    """AI 분석 공통 컴포넌트"""
+    """AI 분석 공통 컴포넌트 (fragment: 입력/버튼 클릭 시 이 컴포넌트만 다시 실행)"""
+    # 파일마다 다른 위젯 키 (파일을 바꿔도 이전 파일의 분석 내용이 남지 않도록)
+    text_key = f"analysis_{key_prefix}_{file_id}"
     with st.expander("📊 AI 분석"):
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            analysis_text = load_existing_analysis(file_id, analysis_type[0], analysis_type[1])
+            if text_key not in st.session_state:
+                st.session_state[text_key] = get_analysis(file_id, analysis_type[0], analysis_type[1])
             edited_text = st.text_area(
                 "분석 내용",
-                value=analysis_text if analysis_text else "",
                 height=300,
-                key=f"{key_prefix}_analysis"
+                key=text_key,
+                on_change=stage_widget_edit,
+                args=(file_id, analysis_type[0], analysis_type[1], text_key)
             )
         
         with col2:
             st.write("")
             st.write("")
-            if st.button("🤖 AI 분석 요청", key=f"request_{key_prefix}", use_container_width=True):
+            if st.button("🤖 AI 분석 요청", key=f"request_{key_prefix}_{file_id}", use_container_width=True):
                 try:
-                    new_analysis = generate_oci_analysis(df, analysis_type[1])
-                    st.session_state[f"{key_prefix}_analysis"] = new_analysis
-                    save_analysis(file_id, analysis_type[0], analysis_type[1], new_analysis)
-                    st.success("AI 분석이 완료되었습니다!")
+                    new_analysis = generate_oci_analysis(
+                        df, analysis_type[1], *category_statistics(file_id, "oci", analysis_type[1])
+                    )
+                    set_analysis(file_id, analysis_type[0], analysis_type[1], new_analysis)
                 except Exception as e:
                     st.error(f"AI 분석 중 오류 발생: {str(e)}")
+                else:
+                    # 이미 생성된 위젯 값은 바꿀 수 없으므로 상태를 비우고 fragment만 다시 실행
+                    del st.session_state[text_key]
+                    rerun_fragment()
             
             st.write("")
-            if st.button("💾 분석 저장", key=f"save_{key_prefix}", use_container_width=True):
+            if st.button("💾 분석 저장", key=f"save_{key_prefix}_{file_id}", use_container_width=True):
                 try:
-                    save_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
-                    st.success("분석 내용이 저장되었습니다!")
+                    stage_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
+                    saved = flush_analyses(file_id)
+                    st.success(f"분석 내용이 저장되었습니다! ({saved}건)")
                 except Exception as e:
                     st.error(f"저장 중 오류 발생: {str(e)}")
 
@@ -399,7 +420,7 @@ def show_oci_overall(file_id):
         st.markdown("📊 AI 분석")
         
         # 기존 분석 불러오기
-        analysis_text = load_existing_analysis(file_id, "oci", f"category_{category}")
+        analysis_text = get_analysis(file_id, "oci", f"category_{category}")
         
         # 편집 가능한 텍스트 영역
         edited_text = st.text_area(
@@ -413,13 +434,15 @@ def show_oci_overall(file_id):
         col1, col2 = st.columns([1, 1])
         with col1:
             if st.button("AI 분석 요청", key=f"request_oci_{category}_analysis"):
-                analysis_text = generate_oci_analysis(cat_data, f"OCI {category} 분석")
+                analysis_text = generate_oci_analysis(
+                    cat_data, f"OCI {category} 분석", *category_statistics(file_id, "oci", category)
+                )
                 st.session_state[f"oci_{category}_analysis"] = analysis_text
                 st.experimental_rerun()
         
         with col2:
             if st.button("분석 저장", key=f"save_oci_{category}_analysis"):
-                save_analysis(file_id, "oci", f"category_{category}", edited_text)
+                set_analysis(file_id, "oci", f"category_{category}", edited_text)
                 save_analysis_state(file_id, f"oci_{category}_analysis",
                                   data=cat_data,
                                   visualization=[fig1, fig2, fig3],
@@ -500,7 +523,7 @@ def show_oci_by_department(file_id):
     st.markdown("📊 AI 분석")
     
     # 기존 분석 불러오기
-    analysis_text = load_existing_analysis(file_id, "oci", "department_analysis")
+    analysis_text = get_analysis(file_id, "oci", "department_analysis")
     
     # 편집 가능한 텍스트 영역
     edited_text = st.text_area(
@@ -520,7 +543,7 @@ def show_oci_by_department(file_id):
     
     with col2:
         if st.button("분석 저장", key="save_oci_dept_analysis"):
-            save_analysis(file_id, "oci", "department_analysis", edited_text)
+            set_analysis(file_id, "oci", "department_analysis", edited_text)
             save_analysis_state(file_id, "oci_department_analysis",
                               data=df,
                               visualization=[fig1, fig2],
@@ -530,26 +553,3 @@ def show_oci_by_department(file_id):
 def show_oci_by_question(file_id):
     st.info("OCI 문항별 분석 -")
     # TODO: 구현 예정 
-
-def generate_oci_analysis(df, category):
-    """OCI 분석 결과 생성"""
-    try:
-        avg_score = df['avg_score'].mean()
-        max_dept = df.iloc[0]['department']
-        min_dept = df.iloc[-1]['department']
-        
-        analysis = f"""
-        {category} 분석 결과:
-        
-        1. 전체 평균: {avg_score:.2f}점
-        2. 최고 점수 부서: {max_dept} ({df.iloc[0]['avg_score']:.2f}점)
-        3. 최저 점수 부서: {min_dept} ({df.iloc[-1]['avg_score']:.2f}점)
-        4. 부서간 편차: {df['std_score'].mean():.2f}점
-        
-        주요 특징:
-        - 부서별 점수 차이가 {df['avg_score'].max() - df['avg_score'].min():.2f}점으로 나타남
-        - 전체 응답자의 {(df['avg_score'] > 3).mean() * 100:.1f}%가 평균 이상의 점수를 보임
-        """
-        return analysis
-    except Exception as e:
-        return f"분석 중 오류 발생: {str(e)}" 
\ No newline at end of file
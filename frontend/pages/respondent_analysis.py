@@ -4,11 +4,141 @@ import plotly.express as px
 import plotly.graph_objects as go
 from frontend.database import (
     get_db_connection,
-    save_to_powerbi_table,
-    save_analysis,
-    load_existing_analysis
+    save_to_powerbi_table
+)
+from frontend.services.analysis_store import (
+    get_analysis,
+    stage_analysis,
+    stage_widget_edit,
+    set_analysis,
+    flush_analyses
 )
 from frontend.services.ai_analysis import generate_department_analysis
+from frontend.services.profiler import profiled
+from frontend.services.figure_cache import get_cached_figure
+from frontend.components.fragment import fragment, rerun_fragment
+from frontend.services.dimensions import decode
+from frontend.services.text_analytics import get_tag_counts
+from frontend.components.text_view import show_text_analysis
+
+# 차트 빌더: get_cached_figure 캐시 미스일 때만 호출됨
+def _donut_chart(df, names, title, hole=0.4):
+    fig = px.pie(df, values='count', names=names, hole=hole, title=title)
+    fig.update_traces(textinfo='percent+label')
+    return fig
+
+def _count_bar_chart(df, x, title):
+    fig = px.bar(df, x=x, y='count', text='count', title=title)
+    fig.update_traces(texttemplate='%{text:,}명')
+    return fig
+
+def _cumulative_line_chart(df, x, title):
+    fig = px.line(df, x=x, y='cumulative_pct', markers=True, title=title)
+    fig.update_traces(texttemplate='%{y:.1f}%')
+    return fig
+
+def _gender_chart(df):
+    fig = px.pie(df, values='count', names='gender', title='성별 분포', hole=0.5)
+    fig.update_traces(
+        textposition='outside',
+        textinfo='percent+label'
+    )
+    return fig
+
+def _share_line(summary_df, x, pct):
+    return go.Scatter(
+        name='비율',
+        x=summary_df[x],
+        y=summary_df[pct],
+        yaxis='y2',
+        line=dict(color='black', width=2, dash='dot'),
+        mode='lines+markers+text',
+        text=summary_df[pct].apply(lambda x: f'{x:.1f}%'),
+        textposition='top center'
+    )
+
+def _stacked_share_layout(fig, title, max_pct):
+    fig.update_layout(
+        title=title,
+        barmode='stack',
+        yaxis=dict(title='인원수'),
+        yaxis2=dict(
+            title='비율(%)',
+            overlaying='y',
+            side='right',
+            range=[0, max_pct * 1.2]
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+def _age_gender_chart(frames):
+    """연령대별 성별 스택 막대 + 비율 선 복합 차트"""
+    df, summary_df = frames
+    fig = go.Figure()
+    
+    # 성별 막대 추가
+    for gender, color in (('남성', 'rgb(0, 87, 138)'), ('여성', 'rgb(255, 127, 80)')):
+        gender_data = df[df['gender'] == gender]
+        fig.add_trace(go.Bar(
+            name=gender,
+            x=gender_data['age_group'],
+            y=gender_data['count'],
+            text=gender_data['count'],
+            marker_color=color
+        ))
+    
+    fig.add_trace(_share_line(summary_df, 'age_group', 'total_percentage'))
+    return _stacked_share_layout(fig, '연령대별 성별 분포 및 비율', max(summary_df['total_percentage']))
+
+def _major_education_chart(frames):
+    """전공별 학력 스택 막대 + 비율 선 복합 차트"""
+    df, summary_df = frames
+    fig = go.Figure()
+    
+    # 학력별로 스택 막대 추가
+    for level in df['education_level'].unique():
+        level_data = df[df['education_level'] == level]
+        fig.add_trace(go.Bar(
+            name=level,
+            x=level_data['major'],
+            y=level_data['count'],
+            text=level_data['count']
+        ))
+    
+    fig.add_trace(_share_line(summary_df, 'major', 'percentage'))
+    return _stacked_share_layout(fig, '전공별 학력 분포 및 비율', max(summary_df['percentage']))
+
+def _major_hierarchy_chart(df, chart):
+    if chart == 'sunburst':
+        return px.sunburst(
+            df,
+            path=['major', 'education_level'],
+            values='count',
+            title='전공-학력 계층 구조'
+        )
+    return px.treemap(
+        df,
+        path=[px.Constant("전체"), 'major', 'education_level'],
+        values='count',
+        title='전공-학력 트리맵'
+    )
+
+def _major_area_chart(df):
+    return px.area(
+        df,
+        x='major',
+        y='count',
+        color='education_level',
+        title='전공별 학력 분포 (누적 영역)'
+    )
 
 def show_basic_status(file_id):
     st.markdown("""
@@ -29,12 +159,13 @@ def show_basic_status(file_id):
         </style>
     """, unsafe_allow_html=True)
     
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "부서별 분포",
         "성별 분포",
         "연령대 분포",
         "학력/전공 분포",
-        "자격증 현황"
+        "자격증 현황",
+        "의견/기술 분석"
     ])
     
     with tab1:
@@ -47,7 +178,10 @@ def show_basic_status(file_id):
         show_education_distribution(file_id)
     with tab5:
         show_certification_distribution(file_id)
+    with tab6:
+        show_text_analysis(file_id)
 
+@profiled()
 def show_department_distribution(file_id):
     st.subheader("부서별 분포")
     
@@ -55,14 +189,15 @@ def show_department_distribution(file_id):
     conn = get_db_connection()
     df = pd.read_sql("""
         SELECT 
-            department,
+            department_code,
             COUNT(*) as count,
             ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as percentage
         FROM respondents 
         WHERE file_id = %s
-        GROUP BY department 
+        GROUP BY department_code 
         ORDER BY count DESC
     """, conn, params=[int(file_id)])  # int로 명시적 변환
+    df = decode(df, "department")
     
     # 1. 상단: 주요 지표
     total = df['count'].sum()
@@ -91,38 +226,33 @@ def show_department_distribution(file_id):
     # 오른쪽 상단: 도넛 차트
     with col2:
         st.write("📊 부서별 분포")
-        fig1 = px.pie(df, 
-                     values='count',
-                     names='department',
-                     hole=0.4,
-                     title='부서별 인원 분포')
-        fig1.update_traces(textinfo='percent+label')
+        fig1 = get_cached_figure(
+            "donut", df, _donut_chart,
+            names='department', title='부서별 인원 분포'
+        )
         st.plotly_chart(fig1, use_container_width=True)
     
     # 왼쪽 하단: 막대 그래프
     with col1:
-        fig2 = px.bar(df,
-                     x='department',
-                     y='count',
-                     text='count',
-                     title='부서별 인원수')
-        fig2.update_traces(texttemplate='%{text:,}명')
+        fig2 = get_cached_figure(
+            "count_bar", df, _count_bar_chart,
+            x='department', title='부서별 인원수'
+        )
         st.plotly_chart(fig2, use_container_width=True)
     
     # 오른쪽 하단: 누적 비율 라인 차트
     with col2:
         df['cumulative_pct'] = df['percentage'].cumsum()
-        fig3 = px.line(df,
-                      x='department',
-                      y='cumulative_pct',
-                      markers=True,
-                      title='부서별 누적 비율')
-        fig3.update_traces(texttemplate='%{y:.1f}%')
+        fig3 = get_cached_figure(
+            "cumulative_line", df, _cumulative_line_chart,
+            x='department', title='부서별 누적 비율'
+        )
         st.plotly_chart(fig3, use_container_width=True)
 
     # AI 분석
     show_ai_analysis(file_id, df, ("respondent", "department"), "dept")
 
+@profiled()
 def show_gender_distribution(file_id):
     # 1. 데이터 테이블과 차트
     col1, col2 = st.columns([1, 1])
@@ -131,13 +261,14 @@ def show_gender_distribution(file_id):
         st.subheader("데이터 테이블")
         conn = get_db_connection()
         df = pd.read_sql("""
-            SELECT gender, COUNT(*) as count,
+            SELECT gender_code, COUNT(*) as count,
                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as percentage
             FROM respondents 
             WHERE file_id = %s
-            GROUP BY gender
+            GROUP BY gender_code
             ORDER BY count DESC
         """, conn, params=[file_id])
+        df = decode(df, "gender")
         
         st.dataframe(
             df.style.format({
@@ -151,21 +282,13 @@ def show_gender_distribution(file_id):
     
     with col2:
         st.subheader("시각화")
-        fig = px.pie(df, 
-                    values='count', 
-                    names='gender',
-                    title='성별 분포',
-                    hole=0.5)
-        
-        fig.update_traces(
-            textposition='outside',
-            textinfo='percent+label'
-        )
+        fig = get_cached_figure("gender_pie", df, _gender_chart)
         st.plotly_chart(fig, use_container_width=True)
 
     # AI 분석
     show_ai_analysis(file_id, df, ("respondent", "gender"), "gender")
 
+@profiled()
 def show_age_distribution(file_id):
     st.subheader("연령대 분포")
     
@@ -173,22 +296,23 @@ def show_age_distribution(file_id):
     conn = get_db_connection()
     df = pd.read_sql("""
         SELECT 
-            age_group,
-            gender,
+            age_group_code,
+            gender_code,
             COUNT(*) as count,
-            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY age_group), 1) as gender_percentage,
+            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY age_group_code), 1) as gender_percentage,
             ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as total_percentage
         FROM respondents 
         WHERE file_id = %s
-        GROUP BY age_group, gender
-        ORDER BY age_group, gender
+        GROUP BY age_group_code, gender_code
     """, conn, params=[file_id])
     
-    # 전체 요약 데이터
-    summary_df = df.groupby('age_group').agg({
+    # 전체 요약 데이터 (정수 코드로 집계한 뒤 표시 직전에 라벨로 변환)
+    summary_df = df.groupby('age_group_code').agg({
         'count': 'sum',
         'total_percentage': 'sum'
     }).reset_index()
+    df = decode(df, "age_group", "gender").sort_values(['age_group', 'gender']).reset_index(drop=True)
+    summary_df = decode(summary_df, "age_group").sort_values('age_group').reset_index(drop=True)
     
     # 1. 상단: 주요 지표
     total = df['count'].sum()
@@ -218,82 +342,25 @@ def show_age_distribution(file_id):
     with col2:
         st.write("📊 연령대별 분포")
         
-        # 복합 차트 생성
-        fig = go.Figure()
-        
-        # 남성 막대 추가
-        male_data = df[df['gender'] == '남성']
-        fig.add_trace(go.Bar(
-            name='남성',
-            x=male_data['age_group'],
-            y=male_data['count'],
-            text=male_data['count'],
-            marker_color='rgb(0, 87, 138)'
-        ))
-        
-        # 여성 막대 추가
-        female_data = df[df['gender'] == '여성']
-        fig.add_trace(go.Bar(
-            name='여성',
-            x=female_data['age_group'],
-            y=female_data['count'],
-            text=female_data['count'],
-            marker_color='rgb(255, 127, 80)'
-        ))
-        
-        # 비율 선 추가
-        fig.add_trace(go.Scatter(
-            name='비율',
-            x=summary_df['age_group'],
-            y=summary_df['total_percentage'],
-            yaxis='y2',
-            line=dict(color='black', width=2, dash='dot'),
-            mode='lines+markers+text',
-            text=summary_df['total_percentage'].apply(lambda x: f'{x:.1f}%'),
-            textposition='top center'
-        ))
-        
-        # 레이아웃 설정
-        fig.update_layout(
-            title='연령대별 성별 분포 및 비율',
-            barmode='stack',
-            yaxis=dict(title='인원수'),
-            yaxis2=dict(
-                title='비율(%)',
-                overlaying='y',
-                side='right',
-                range=[0, max(summary_df['total_percentage']) * 1.2]
-            ),
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
+        fig = get_cached_figure("age_gender", [df, summary_df], _age_gender_chart)
         
         st.plotly_chart(fig, use_container_width=True)
     
     # 왼쪽 하단: 파이 차트
     with col1:
-        fig2 = px.pie(df,
-                     values='count',
-                     names='age_group',
-                     title='연령대별 비율')
-        fig2.update_traces(textinfo='percent+label')
+        fig2 = get_cached_figure(
+            "donut", df, _donut_chart,
+            names='age_group', title='연령대별 비율', hole=0
+        )
         st.plotly_chart(fig2, use_container_width=True)
     
     # 오른쪽 하단: 누적 비율
     with col2:
         df['cumulative_pct'] = df['total_percentage'].cumsum()
-        fig3 = px.line(df,
-                      x='age_group',
-                      y='cumulative_pct',
-                      markers=True,
-                      title='연령대별 누적 비율')
-        fig3.update_traces(texttemplate='%{y:.1f}%')
+        fig3 = get_cached_figure(
+            "cumulative_line", df, _cumulative_line_chart,
+            x='age_group', title='연령대별 누적 비율'
+        )
         st.plotly_chart(fig3, use_container_width=True)
     
     # AI 분석
@@ -309,20 +376,15 @@ def show_education_distribution(file_id):
     with tab2:
         show_major_distribution(file_id)
 
+@profiled()
 def show_certification_distribution(file_id):
     st.subheader("자격증 현황")
     
-    conn = get_db_connection()
-    df = pd.read_sql("""
-        SELECT 
-            certifications,
-            COUNT(*) as count,
-            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as percentage
-        FROM respondents 
-        WHERE file_id = %s AND certifications IS NOT NULL
-        GROUP BY certifications
-        ORDER BY count DESC
-    """, conn, params=[file_id])
+    # 여러 자격증을 적은 응답은 업로드 시 개별 태그로 나눠 저장됨 (respondent_tags)
+    df = get_tag_counts(file_id, "certifications").rename(columns={'tag': 'certifications'})
+    if df.empty:
+        st.info("자격증 응답이 없습니다.")
+        return
     
     # 1. 상단: 주요 지표
     total = df['count'].sum()
@@ -351,38 +413,33 @@ def show_certification_distribution(file_id):
     # 오른쪽 상단: 도넛 차트
     with col2:
         st.write("📊 자격증 분포")
-        fig1 = px.pie(df, 
-                     values='count',
-                     names='certifications',
-                     hole=0.4,
-                     title='자격증별 분포')
-        fig1.update_traces(textinfo='percent+label')
+        fig1 = get_cached_figure(
+            "donut", df, _donut_chart,
+            names='certifications', title='자격증별 분포'
+        )
         st.plotly_chart(fig1, use_container_width=True)
     
     # 왼쪽 하단: 막대 그래프
     with col1:
-        fig2 = px.bar(df,
-                     x='certifications',
-                     y='count',
-                     text='count',
-                     title='자격증별 인원수')
-        fig2.update_traces(texttemplate='%{text:,}명')
+        fig2 = get_cached_figure(
+            "count_bar", df, _count_bar_chart,
+            x='certifications', title='자격증별 인원수'
+        )
         st.plotly_chart(fig2, use_container_width=True)
     
     # 오른쪽 하단: 누적 비율
     with col2:
         df['cumulative_pct'] = df['percentage'].cumsum()
-        fig3 = px.line(df,
-                      x='certifications',
-                      y='cumulative_pct',
-                      markers=True,
-                      title='자격증 누적 비율')
-        fig3.update_traces(texttemplate='%{y:.1f}%')
+        fig3 = get_cached_figure(
+            "cumulative_line", df, _cumulative_line_chart,
+            x='certifications', title='자격증 누적 비율'
+        )
         st.plotly_chart(fig3, use_container_width=True)
     
     # AI 분석
     show_ai_analysis(file_id, df, ("respondent", "certification"), "cert")
 
+@profiled()
 def show_education_level_distribution(file_id):
     st.subheader("학력 분포")
     
@@ -390,22 +447,22 @@ def show_education_level_distribution(file_id):
     conn = get_db_connection()
     df = pd.read_sql("""
         SELECT 
-            education_level,
+            education_level_code,
             COUNT(*) as count,
             ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as percentage
         FROM respondents 
         WHERE file_id = %s
-        GROUP BY education_level
-        ORDER BY 
-            CASE education_level
-                WHEN '고졸' THEN 1
-                WHEN '전문대졸' THEN 2
-                WHEN '대졸' THEN 3
-                WHEN '석사' THEN 4
-                WHEN '박사' THEN 5
-                ELSE 6
-            END
+        GROUP BY education_level_code
     """, conn, params=[file_id])
+    df = decode(df, "education_level")
+    
+    # 학력 순서대로 정렬 (목록에 없는 학력은 마지막)
+    education_order = {'고졸': 1, '전문대졸': 2, '대졸': 3, '석사': 4, '박사': 5}
+    df = df.sort_values(
+        'education_level',
+        key=lambda levels: levels.map(education_order).fillna(6),
+        kind='stable'
+    ).reset_index(drop=True)
     
     # 1. 상단: 주요 지표
     total = df['count'].sum()
@@ -434,38 +491,33 @@ def show_education_level_distribution(file_id):
     # 오른쪽 상단: 도넛 차트
     with col2:
         st.write("📊 학력 분포")
-        fig1 = px.pie(df, 
-                     values='count',
-                     names='education_level',
-                     hole=0.4,
-                     title='학력별 인원 분포')
-        fig1.update_traces(textinfo='percent+label')
+        fig1 = get_cached_figure(
+            "donut", df, _donut_chart,
+            names='education_level', title='학력별 인원 분포'
+        )
         st.plotly_chart(fig1, use_container_width=True)
     
     # 왼쪽 하단: 막대 그래프
     with col1:
-        fig2 = px.bar(df,
-                     x='education_level',
-                     y='count',
-                     text='count',
-                     title='학력별 인원수')
-        fig2.update_traces(texttemplate='%{text:,}명')
+        fig2 = get_cached_figure(
+            "count_bar", df, _count_bar_chart,
+            x='education_level', title='학력별 인원수'
+        )
         st.plotly_chart(fig2, use_container_width=True)
     
     # 오른쪽 하단: 누적 비율 라인 차트
     with col2:
         df['cumulative_pct'] = df['percentage'].cumsum()
-        fig3 = px.line(df,
-                      x='education_level',
-                      y='cumulative_pct',
-                      markers=True,
-                      title='학력별 누적 비율')
-        fig3.update_traces(texttemplate='%{y:.1f}%')
+        fig3 = get_cached_figure(
+            "cumulative_line", df, _cumulative_line_chart,
+            x='education_level', title='학력별 누적 비율'
+        )
         st.plotly_chart(fig3, use_container_width=True)
 
     # AI 분석
     show_ai_analysis(file_id, df, ("education", "level"), "edu")
 
+@profiled()
 def show_major_distribution(file_id):
     st.subheader("전공 분포")
     
@@ -473,15 +525,16 @@ def show_major_distribution(file_id):
     conn = get_db_connection()
     df = pd.read_sql("""
         SELECT 
-            major,
+            major_code,
             COUNT(*) as count,
             ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) as percentage,
-            education_level
+            education_level_code
         FROM respondents 
         WHERE file_id = %s
-        GROUP BY major, education_level
+        GROUP BY major_code, education_level_code
         ORDER BY count DESC
     """, conn, params=[file_id])
+    df = decode(df, "major", "education_level")
     
     # 1. 상단: 주요 지표
     total = df.groupby('major')['count'].sum().reset_index()
@@ -517,72 +570,18 @@ def show_major_distribution(file_id):
     with col2:
         st.write("📊 전공별 분포")
         
-        # 복합 차트 생성
-        fig1 = go.Figure()
-        
-        # 학력별로 스택 막대 추가
-        for level in df['education_level'].unique():
-            level_data = df[df['education_level'] == level]
-            fig1.add_trace(go.Bar(
-                name=level,
-                x=level_data['major'],
-                y=level_data['count'],
-                text=level_data['count']
-            ))
-        
-        # 비율 선 추가
-        fig1.add_trace(go.Scatter(
-            name='비율',
-            x=summary_df['major'],
-            y=summary_df['percentage'],
-            yaxis='y2',
-            line=dict(color='black', width=2, dash='dot'),
-            mode='lines+markers+text',
-            text=summary_df['percentage'].apply(lambda x: f'{x:.1f}%'),
-            textposition='top center'
-        ))
-        
-        # 레이아웃 설정
-        fig1.update_layout(
-            title='전공별 학력 분포 및 비율',
-            barmode='stack',
-            yaxis=dict(title='인원수'),
-            yaxis2=dict(
-                title='비율(%)',
-                overlaying='y',
-                side='right',
-                range=[0, max(summary_df['percentage']) * 1.2]
-            ),
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
+        fig1 = get_cached_figure("major_education", [df, summary_df], _major_education_chart)
         
         st.plotly_chart(fig1, use_container_width=True)
     
     # 왼쪽 하단: 선버스트 차트
     with col1:
-        fig2 = px.sunburst(
-            df,
-            path=['major', 'education_level'],
-            values='count',
-            title='전공-학력 계층 구조'
-        )
+        fig2 = get_cached_figure("major_hierarchy", df, _major_hierarchy_chart, chart='sunburst')
         st.plotly_chart(fig2, use_container_width=True)
     
     # 오른쪽 하단: 트리맵
     with col2:
-        fig3 = px.treemap(
-            df,
-            path=[px.Constant("전체"), 'major', 'education_level'],
-            values='count',
-            title='전공-학력 트리맵'
-        )
+        fig3 = get_cached_figure("major_hierarchy", df, _major_hierarchy_chart, chart='treemap')
         st.plotly_chart(fig3, use_container_width=True)
     
     # 3. 추가 차트들
@@ -591,48 +590,41 @@ def show_major_distribution(file_id):
     
     # 왼쪽: 도넛 차트
     with col1:
-        fig4 = px.pie(
-            summary_df,
-            values='count',
-            names='major',
-            hole=0.4,
-            title='전공별 비율 (도넛 차트)'
+        fig4 = get_cached_figure(
+            "donut", summary_df, _donut_chart,
+            names='major', title='전공별 비율 (도넛 차트)'
         )
-        fig4.update_traces(textinfo='percent+label')
         st.plotly_chart(fig4, use_container_width=True)
     
     # 오른쪽: 누적 영역 차트
     with col2:
-        fig5 = px.area(
-            df,
-            x='major',
-            y='count',
-            color='education_level',
-            title='전공별 학력 분포 (누적 영역)'
-        )
+        fig5 = get_cached_figure("major_area", df, _major_area_chart)
         st.plotly_chart(fig5, use_container_width=True)
 
     # AI 분석
     show_ai_analysis(file_id, df, ("education", "major"), "major")
 
+@fragment
 def show_ai_analysis(file_id, df, analysis_type, key_prefix):
-    """AI 분석 공통 컴포넌트"""
+    """AI 분석 공통 컴포넌트 (fragment: 입력/버튼 클릭 시 이 컴포넌트만 다시 실행)"""
     with st.expander("📊 AI 분석"):
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            # 기존 분석 불러오기
-            existing = load_existing_analysis(file_id, analysis_type[0], analysis_type[1])
-            
             # 고유한 키 생성 - file_id를 포함하여 완전히 고유하게 만듦
             text_key = f"analysis_{key_prefix}_{file_id}"
             
-            # 텍스트 영역
+            # 기존 분석은 파일 단위 저장소에서 처음 한 번만 가져오기
+            if text_key not in st.session_state:
+                st.session_state[text_key] = get_analysis(file_id, analysis_type[0], analysis_type[1])
+            
+            # 텍스트 영역 (편집 내용은 저장 대기 목록에 모았다가 저장 시 한 번에 기록)
             edited_text = st.text_area(
                 "분석 내용",
-                value=existing if existing else "",
                 height=300,
-                key=text_key  # 고유한 키 사용
+                key=text_key,  # 고유한 키 사용
+                on_change=stage_widget_edit,
+                args=(file_id, analysis_type[0], analysis_type[1], text_key)
             )
         
         with col2:
@@ -657,13 +649,14 @@ def show_ai_analysis(file_id, df, analysis_type, key_prefix):
                     
                     analysis = generate_department_analysis(dept_data, analysis_type[1])
                     if analysis:
-                        save_analysis(file_id, analysis_type[0], analysis_type[1], analysis)
-                        st.success("분석 완료!")
-                        st.rerun()  # 페이지 새로고침
+                        set_analysis(file_id, analysis_type[0], analysis_type[1], analysis)
+                        del st.session_state[text_key]
+                        rerun_fragment()  # AI 분석 컴포넌트만 새로고침
             
             # 저장 버튼
             if st.button("💾 저장",
                         key=f"btn_save_{key_prefix}_{file_id}",  # 저장 버튼도 고유 키
                         use_container_width=True):
-                save_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
-                st.success("저장 완료!") 
\ No newline at end of file
+                stage_analysis(file_id, analysis_type[0], analysis_type[1], edited_text)
+                saved = flush_analyses(file_id)
+                st.success(f"저장 완료! ({saved}건)") 
\ No newline at end of file
@@ -0,0 +1,173 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from frontend.services.profiler import profiled
+from frontend.services.figure_cache import get_cached_figure
+from frontend.services.trends import (
+    TOTAL_LABEL,
+    list_trend_files,
+    load_trend_scores,
+    compare_files,
+    category_trend
+)
+
+# 차트 빌더: get_cached_figure 캐시 미스일 때만 호출됨
+def _trend_line_chart(df, title):
+    fig = px.line(df, x='file_label', y='mean', color='question_category', markers=True, title=title)
+    fig.update_layout(xaxis_title="조사 파일", yaxis_title="평균 점수", legend_title="카테고리")
+    return fig
+
+def _delta_heatmap(df, title):
+    delta = df.pivot(index='department', columns='question_category', values='delta')
+    marks = df.pivot(index='department', columns='question_category', values='label')
+    limit = max(float(delta.abs().max().max()), 0.01)
+    fig = go.Figure(go.Heatmap(
+        z=delta.values,
+        x=delta.columns.tolist(),
+        y=delta.index.tolist(),
+        text=marks.values,
+        texttemplate="%{text}",
+        colorscale="RdBu",
+        zmin=-limit,
+        zmax=limit,
+        colorbar=dict(title="변화")
+    ))
+    fig.update_layout(title=title, height=max(400, 30 * len(delta.index)))
+    return fig
+
+def _overall_delta_chart(df, title):
+    colors = ['#d62728' if d < 0 else '#1f77b4' for d in df['delta']]
+    fig = go.Figure(go.Bar(
+        x=df['question_category'],
+        y=df['delta'],
+        text=df['label'],
+        textposition='outside',
+        marker_color=colors
+    ))
+    fig.update_layout(title=title, xaxis_title="카테고리", yaxis_title="평균 변화")
+    return fig
+
+def _file_label(row):
+    return f"{row['file_name']} ({row['uploaded_at'].strftime('%Y-%m-%d')})"
+
+def _delta_label(row):
+    """변화량 표시 문자열 (유의하면 * 표시)"""
+    if pd.isna(row['delta']):
+        return ""
+    return f"{row['delta']:+.2f}{'*' if row['significant'] else ''}"
+
+@profiled(kind="page")
+def show_trend_analysis(file_id):
+    st.subheader("추세 분석 (파일 간 비교)")
+
+    files_df = list_trend_files()
+    if len(files_df) < 2:
+        st.info("비교할 파일이 2개 이상 필요합니다.")
+        return
+
+    labels = dict(zip(files_df['file_id'].astype(int), files_df.apply(_file_label, axis=1)))
+    file_ids = list(labels)
+
+    # 기본값: 현재 파일과 바로 이전 파일
+    position = file_ids.index(file_id) if file_id in file_ids else len(file_ids) - 1
+    default = file_ids[max(position - 1, 0):position + 1]
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.multiselect(
+            "비교할 파일",
+            options=file_ids,
+            default=default,
+            format_func=labels.get,
+            key="trend_files"
+        )
+    with col2:
+        instrument = st.radio(
+            "진단 도구", ["oci", "cgs"],
+            format_func=str.upper,
+            horizontal=True,
+            key="trend_instrument"
+        )
+
+    if len(selected) < 2:
+        st.warning("비교할 파일을 2개 이상 선택해주세요.")
+        return
+
+    # 업로드 순서로 정렬 (추세선/기준 파일 선택용)
+    selected = [f for f in file_ids if f in selected]
+
+    # 원본 응답이 아닌 파일별 집계 인덱스만 조회
+    scores = load_trend_scores(selected, instrument)
+    if scores.empty:
+        st.warning("선택한 파일의 집계 데이터가 없습니다.")
+        return
+
+    trend = category_trend(scores)
+    trend['file_label'] = trend['file_id'].map(labels)
+    trend['order'] = trend['file_id'].map(selected.index)
+    trend = trend.sort_values(['order', 'question_category'])
+    fig = get_cached_figure(
+        "trend_line", trend[['file_label', 'question_category', 'mean']], _trend_line_chart,
+        title=f"{instrument.upper()} 카테고리별 평균 추이"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        base_file_id = st.selectbox(
+            "기준 파일", selected[:-1],
+            index=len(selected) - 2,
+            format_func=labels.get,
+            key="trend_base"
+        )
+    with col2:
+        target_file_id = st.selectbox(
+            "비교 파일", selected[selected.index(base_file_id) + 1:],
+            index=len(selected) - selected.index(base_file_id) - 2,
+            format_func=labels.get,
+            key="trend_target"
+        )
+
+    comparison = compare_files(scores, base_file_id, target_file_id)
+    if comparison.empty:
+        st.warning("두 파일에 공통된 카테고리가 없습니다.")
+        return
+    comparison['label'] = comparison.apply(_delta_label, axis=1)
+
+    overall = comparison[comparison['department'] == TOTAL_LABEL]
+    fig = get_cached_figure(
+        "trend_overall_delta", overall[['question_category', 'delta', 'label']], _overall_delta_chart,
+        title="조직 전체 카테고리별 변화"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    fig = get_cached_figure(
+        "trend_delta_heatmap", comparison[['department', 'question_category', 'delta', 'label']],
+        _delta_heatmap,
+        title="부서 x 카테고리 평균 변화 (* p < 0.05)"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    significant = comparison[comparison['significant']].sort_values('delta')
+    st.write(f"**유의한 변화 ({len(significant)}건)**")
+    if significant.empty:
+        st.info("통계적으로 유의한 변화가 없습니다.")
+    else:
+        st.dataframe(
+            significant[[
+                'department', 'question_category',
+                'mean_base', 'mean_target', 'delta', 'n_base', 'n_target', 'p_value'
+            ]].rename(columns={
+                'department': '부서',
+                'question_category': '카테고리',
+                'mean_base': '기준 평균',
+                'mean_target': '비교 평균',
+                'delta': '변화',
+                'n_base': '기준 응답자 수',
+                'n_target': '비교 응답자 수',
+                'p_value': 'p-value'
+            }).round(3),
+            use_container_width=True,
+            hide_index=True
+        )
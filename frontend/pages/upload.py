@@ -1,7 +1,17 @@
 import streamlit as st
 import pandas as pd
 from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+from frontend.services.maintenance import run_maintenance_in_background
+from frontend.services.partitions import ensure_response_partitions
+from frontend.services.dimensions import encode_respondents
+from frontend.services.trends import refresh_file_scores
+from frontend.services.reliability import refresh_file_reliability
+from frontend.services.segments import assign_segments
+from frontend.services.text_analytics import index_file_text
+from frontend.services.powerbi_views import refresh_powerbi_views_in_background
 
+@profiled(kind="page")
 def show_upload_page():
     st.title("📂 파일 업로드 페이지")
 
@@ -13,116 +23,13 @@ def show_upload_page():
         cur = conn.cursor()
 
         try:
-            # uploaded_files 테이블에 등록
-            cur.execute("""
-                INSERT INTO uploaded_files (file_name, status)
-                VALUES (%s, %s)
-                RETURNING file_id;
-            """, (file_name_input, "pending"))
-            file_id = cur.fetchone()[0]
-            
-            # 엑셀 파일 처리
-            xls = pd.ExcelFile(uploaded_file)
-            
             with st.spinner("파일 처리 중..."):
-                # 1. OCI_Q 시트 처리 (문항 정보)
-                if "OCI_Q" in xls.sheet_names:
-                    df_oci_q = xls.parse("OCI_Q")
-                    for _, row in df_oci_q.iterrows():
-                        cur.execute("""
-                            INSERT INTO oci_questions (
-                                survey_id, question_category, question_text
-                            ) VALUES (%s, %s, %s)
-                            ON CONFLICT (survey_id) DO UPDATE 
-                            SET question_category = EXCLUDED.question_category,
-                                question_text = EXCLUDED.question_text
-                        """, (
-                            row["survey_id"], 
-                            row["question_category"],
-                            row["question_text"]
-                        ))
-                    st.success("✅ OCI 문항 데이터 저장 완료")
-
-                # 2. CGS_Q 시트 처리 (문항 정보)
-                if "CGS_Q" in xls.sheet_names:
-                    df_cgs_q = xls.parse("CGS_Q")
-                    for _, row in df_cgs_q.iterrows():
-                        cur.execute("""
-                            INSERT INTO cgs_questions (
-                                survey_id, question_category, question_text
-                            ) VALUES (%s, %s, %s)
-                            ON CONFLICT (survey_id) DO UPDATE 
-                            SET question_category = EXCLUDED.question_category,
-                                question_text = EXCLUDED.question_text
-                        """, (
-                            row["survey_id"], 
-                            row["question_category"],
-                            row["question_text"]
-                        ))
-                    st.success("✅ CGS 문항 데이터 저장 완료")
-
-                # 3. Respondent 시트 처리 (응답자 정보)
-                if "Respondent" in xls.sheet_names:
-                    df = xls.parse("Respondent")
-                    for _, row in df.iterrows():
-                        cur.execute("""
-                            INSERT INTO respondents (
-                                respondent_id, file_id, department, gender, 
-                                age_group, education_level, major, 
-                                experience_innovation, experience_total,
-                                certifications, programming_skills, comments
-                            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                        """, (
-                            row["respondent_id"], file_id,
-                            row["department"], row["gender"], row["age_group"],
-                            row["education_level"], row["major"],
-                            row["experience_innovation"], row["experience_total"],
-                            row["certifications"], row["programming_skills"],
-                            row["comments"]
-                        ))
-                    st.success("✅ 응답자 데이터 저장 완료")
-
-                # 4. OCI_R 시트 처리 (응답 데이터)
-                if "OCI_R" in xls.sheet_names:
-                    df_oci_r = xls.parse("OCI_R")
-                    for _, row in df_oci_r.iterrows():
-                        cur.execute("""
-                            INSERT INTO oci_responses (
-                                file_id, respondent_id, survey_id,
-                                response, response_meaning
-                            ) VALUES (%s, %s, %s, %s, %s)
-                        """, (
-                            file_id, row["respondent_id"], 
-                            row["survey_id"], row["response"],
-                            row["response_meaning"]
-                        ))
-                    st.success("✅ OCI 응답 데이터 저장 완료")
-
-                # 5. CGS_R 시트 처리 (응답 데이터)
-                if "CGS_R" in xls.sheet_names:
-                    df_cgs_r = xls.parse("CGS_R")
-                    for _, row in df_cgs_r.iterrows():
-                        cur.execute("""
-                            INSERT INTO cgs_responses (
-                                file_id, respondent_id, survey_id,
-                                response, response_meaning
-                            ) VALUES (%s, %s, %s, %s, %s)
-                        """, (
-                            file_id, row["respondent_id"], 
-                            row["survey_id"], row["response"],
-                            row["response_meaning"]
-                        ))
-                    st.success("✅ CGS 응답 데이터 저장 완료")
-
-            # 상태 업데이트
-            cur.execute("""
-                UPDATE uploaded_files 
-                SET status = 'completed' 
-                WHERE file_id = %s
-            """, (file_id,))
-            
+                ingest_workbook(cur, file_name_input, uploaded_file)
+
             conn.commit()
             st.success(f"✅ 파일 '{file_name_input}' 업로드 완료!")
+            # PowerBI 뷰는 커밋된 파일 기준으로 백그라운드에서 갱신
+            refresh_powerbi_views_in_background()
 
         except Exception as e:
             conn.rollback()
@@ -135,6 +42,135 @@ def show_upload_page():
     # 파일 목록 표시
     show_file_list()
 
+@profiled()
+def ingest_workbook(cur, file_name, workbook, notify=st.success):
+    """엑셀 워크북(OCI_Q, CGS_Q, Respondent, OCI_R, CGS_R 시트)을 DB에 적재하고 file_id 반환"""
+    # uploaded_files 테이블에 등록
+    cur.execute("""
+        INSERT INTO uploaded_files (file_name, status)
+        VALUES (%s, %s)
+        RETURNING file_id;
+    """, (file_name, "pending"))
+    file_id = cur.fetchone()[0]
+    
+    # 이 파일의 응답 파티션 생성 (삭제 시 파티션 DROP으로 정리)
+    ensure_response_partitions(cur, file_id)
+    
+    # 엑셀 파일 처리
+    xls = workbook if isinstance(workbook, pd.ExcelFile) else pd.ExcelFile(workbook)
+    
+    # 1. OCI_Q 시트 처리 (문항 정보)
+    if "OCI_Q" in xls.sheet_names:
+        df_oci_q = xls.parse("OCI_Q")
+        for _, row in df_oci_q.iterrows():
+            cur.execute("""
+                INSERT INTO oci_questions (
+                    survey_id, question_category, question_text
+                ) VALUES (%s, %s, %s)
+                ON CONFLICT (survey_id) DO UPDATE 
+                SET question_category = EXCLUDED.question_category,
+                    question_text = EXCLUDED.question_text
+            """, (
+                row["survey_id"], 
+                row["question_category"],
+                row["question_text"]
+            ))
+        notify("✅ OCI 문항 데이터 저장 완료")
+
+    # 2. CGS_Q 시트 처리 (문항 정보)
+    if "CGS_Q" in xls.sheet_names:
+        df_cgs_q = xls.parse("CGS_Q")
+        for _, row in df_cgs_q.iterrows():
+            cur.execute("""
+                INSERT INTO cgs_questions (
+                    survey_id, question_category, question_text
+                ) VALUES (%s, %s, %s)
+                ON CONFLICT (survey_id) DO UPDATE 
+                SET question_category = EXCLUDED.question_category,
+                    question_text = EXCLUDED.question_text
+            """, (
+                row["survey_id"], 
+                row["question_category"],
+                row["question_text"]
+            ))
+        notify("✅ CGS 문항 데이터 저장 완료")
+
+    # 3. Respondent 시트 처리 (응답자 정보)
+    if "Respondent" in xls.sheet_names:
+        df = xls.parse("Respondent")
+        for _, row in df.iterrows():
+            cur.execute("""
+                INSERT INTO respondents (
+                    respondent_id, file_id, department, gender, 
+                    age_group, education_level, major, 
+                    experience_innovation, experience_total,
+                    certifications, programming_skills, comments
+                ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            """, (
+                row["respondent_id"], file_id,
+                row["department"], row["gender"], row["age_group"],
+                row["education_level"], row["major"],
+                row["experience_innovation"], row["experience_total"],
+                row["certifications"], row["programming_skills"],
+                row["comments"]
+            ))
+        # 부서/성별/연령대 등 속성을 사전 코드로 인코딩
+        encode_respondents(cur, file_id)
+        notify("✅ 응답자 데이터 저장 완료")
+
+    # 4. OCI_R 시트 처리 (응답 데이터)
+    if "OCI_R" in xls.sheet_names:
+        df_oci_r = xls.parse("OCI_R")
+        for _, row in df_oci_r.iterrows():
+            cur.execute("""
+                INSERT INTO oci_responses (
+                    file_id, respondent_id, survey_id,
+                    response, response_meaning
+                ) VALUES (%s, %s, %s, %s, %s)
+            """, (
+                file_id, row["respondent_id"], 
+                row["survey_id"], row["response"],
+                row["response_meaning"]
+            ))
+        notify("✅ OCI 응답 데이터 저장 완료")
+
+    # 5. CGS_R 시트 처리 (응답 데이터)
+    if "CGS_R" in xls.sheet_names:
+        df_cgs_r = xls.parse("CGS_R")
+        for _, row in df_cgs_r.iterrows():
+            cur.execute("""
+                INSERT INTO cgs_responses (
+                    file_id, respondent_id, survey_id,
+                    response, response_meaning
+                ) VALUES (%s, %s, %s, %s, %s)
+            """, (
+                file_id, row["respondent_id"], 
+                row["survey_id"], row["response"],
+                row["response_meaning"]
+            ))
+        notify("✅ CGS 응답 데이터 저장 완료")
+
+    # 6. 추세 분석용 부서 x 카테고리 집계 인덱스 (원본 응답은 여기서 한 번만 스캔)
+    refresh_file_scores(cur, file_id)
+
+    # 7. 카테고리 문항 신뢰도 (Cronbach's alpha, 문항-총점 상관)
+    refresh_file_reliability(cur, file_id)
+
+    # 8. OCI 점수 기준 응답자 문화 세그먼트
+    assign_segments(cur, file_id)
+
+    # 9. 자격증/기술 태그 정규화, 의견 단어 색인과 부서별 TF-IDF
+    index_file_text(cur, file_id)
+
+    # 상태 업데이트
+    cur.execute("""
+        UPDATE uploaded_files 
+        SET status = 'completed' 
+        WHERE file_id = %s
+    """, (file_id,))
+
+    return file_id
+
 def show_file_list():
     conn = get_db_connection()
     cur = conn.cursor()
@@ -166,20 +202,6 @@ def show_file_list():
         conn.close()
 
 def cleanup_old_data():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    try:
-        # 30일 이상 된 데이터 삭제
-        cur.execute("""
-            DELETE FROM uploaded_files 
-            WHERE uploaded_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
-            
-            VACUUM FULL;
-        """)
-        conn.commit()
-    except Exception as e:
-        st.error(f"데이터 정리 중 오류: {str(e)}")
-    finally:
-        cur.close()
-        conn.close() 
\ No newline at end of file
+    # 30일 이상 된 데이터를 백그라운드에서 배치 삭제 (VACUUM FULL 잠금 없이)
+    if not run_maintenance_in_background():
+        st.info("데이터 정리가 이미 진행 중입니다.") 
\ No newline at end of file
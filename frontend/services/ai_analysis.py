@@ -1,15 +1,31 @@
-from openai import OpenAI
 import os
+import threading
 from dotenv import load_dotenv
 import streamlit as st
 from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+from frontend.services.dimensions import decode
+from frontend.services.trends import build_trend_summary
+from frontend.services.statistics import format_statistics
+from frontend.services.correlation import build_correlation_summary
+from frontend.services.text_analytics import build_text_summary
 import pandas as pd
 
 load_dotenv()
 
-# OpenAI client 초기화
-client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+# OpenAI client는 처음 AI 분석을 요청할 때 생성 (페이지 import 시 openai 로드/secrets 조회를 하지 않음)
+_client = None
+_client_lock = threading.Lock()
 
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY") or st.secrets["OPENAI_API_KEY"])
+    return _client
+
+@profiled(kind="ai")
 def run_ai_analysis(file_id, additional_prompt=""):
     try:
         conn = get_db_connection()
@@ -88,7 +104,17 @@ def run_ai_analysis(file_id, additional_prompt=""):
         """, (file_id,))
         cgs_data = cur.fetchall()
 
-        # 4. 분석 프롬프트 생성
+        # 4. 이전 조사 대비 변화 (파일별 집계 인덱스 기준)
+        oci_trend = build_trend_summary(file_id, "oci") or "이전 조사 없음"
+        cgs_trend = build_trend_summary(file_id, "cgs") or "이전 조사 없음"
+
+        # 5. OCI-CGS 카테고리 상관 (응답자 기준)
+        correlations = build_correlation_summary(file_id) or "계산 불가"
+
+        # 6. 응답자 의견 주요 단어와 자격증/기술 (업로드 시 만든 텍스트 색인)
+        text_summary = build_text_summary(file_id) or "응답 없음"
+
+        # 7. 분석 프롬프트 생성
         prompt = f"""
         당신은 조직 문화와 거버넌스 분석 전문가입니다. 다음 설문 데이터를 종합적으로 분석해주세요:
 
@@ -103,12 +129,25 @@ def run_ai_analysis(file_id, additional_prompt=""):
         - 부서별 특징적 응답
         {cgs_data}
 
+        4. 이전 조사 대비 카테고리 점수 변화 (전체 + 유의한 부서 변화):
+        - OCI
+        {oci_trend}
+        - CGS
+        {cgs_trend}
+
+        5. 조직문화(OCI)와 거버넌스(CGS) 카테고리 간 상관이 강한 쌍:
+        {correlations}
+
+        6. 응답자 자유 의견 주요 단어와 보유 자격증/기술:
+        {text_summary}
+
         추가 고려사항: {additional_prompt[:100] if additional_prompt else "없음"}
 
         다음 형식으로 분석해주세요:
         1. 응답자 구성 특성
            - 부서별 인원 분포
            - 주요 인구통계학적 특징
+           - 자유 의견에 드러난 관심사와 보유 역량
 
         2. 조직문화(OCI) 분석
            - 전반적인 조직문화 특성
@@ -120,13 +159,21 @@ def run_ai_analysis(file_id, additional_prompt=""):
            - 부서별 특징적 차이
            - 개선 제안사항
 
-        4. 종합 제언
+        4. 이전 조사 대비 변화
+           - 개선/악화된 영역
+           - 변화가 큰 부서
+
+        5. 조직문화와 거버넌스의 연관성
+           - 함께 움직이는 영역
+           - 조직문화 개선이 거버넌스에 미칠 영향
+
+        6. 종합 제언
            - 핵심 발견사항
            - 우선순위별 개선과제
            - 실행 방안
         """
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "조직 진단 전문가입니다. 데이터에 기반한 실용적이고 구체적인 인사이트를 제공합니다."},
@@ -178,6 +225,7 @@ def analyze_part(part_name, data, client):
     
     return response.choices[0].message.content
 
+@profiled(kind="ai")
 def generate_department_analysis(df, analysis_type=""):
     try:
         # 기존 분석 데이터 가져오기 (RAG 활용)
@@ -201,7 +249,7 @@ def generate_department_analysis(df, analysis_type=""):
         4. 이전 분석과 비교하여 달라진 점
         """
         
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "데이터 분석 전문가입니다."},
@@ -260,8 +308,8 @@ def save_analysis_for_rag(analysis_type, analysis_text, data):
         cur.close()
         conn.close()
 
-def generate_oci_analysis(df, category):
-    """OCI 분석 결과 생성"""
+def generate_oci_analysis(df, category, tests=None, pairs=None):
+    """OCI 분석 결과 생성 (tests/pairs: services.statistics.category_statistics 결과)"""
     try:
         avg_score = df['avg_score'].mean()
         max_dept = df.iloc[0]['department']
@@ -279,10 +327,13 @@ def generate_oci_analysis(df, category):
         - 부서별 점수 차이가 {df['avg_score'].max() - df['avg_score'].min():.2f}점으로 나타남
         - 전체 응답자의 {(df['avg_score'] > 3).mean() * 100:.1f}%가 평균 이상의 점수를 보임
         """
+        if tests is not None:
+            analysis += "\n" + format_statistics(tests, pairs) + "\n"
         return analysis
     except Exception as e:
         return f"분석 중 오류 발생: {str(e)}"
 
+@profiled(kind="ai")
 def generate_comprehensive_report(file_id, requirements=None):
     """종합 분석 리포트 생성"""
     try:
@@ -290,40 +341,44 @@ def generate_comprehensive_report(file_id, requirements=None):
         conn = get_db_connection()
         
         # 1. 응답자 분석
-        respondent_summary = pd.read_sql("""
+        respondent_summary = decode(pd.read_sql("""
             SELECT 
-                department,
+                department_code,
                 COUNT(*) as count,
                 array_agg(DISTINCT gender) as genders,
                 array_agg(DISTINCT age_group) as age_groups
             FROM respondents 
             WHERE file_id = %s
-            GROUP BY department
-        """, conn, params=[file_id])
+            GROUP BY department_code
+        """, conn, params=[file_id]), "department")
         
         # 2. OCI 분석
-        oci_summary = pd.read_sql("""
+        oci_summary = decode(pd.read_sql("""
             SELECT 
-                department,
-                question_category,
-                AVG(CAST(response AS FLOAT))::numeric(10,2) as avg_score,
+                d.department_code,
+                q.question_category,
+                AVG(CAST(r.response AS FLOAT))::numeric(10,2) as avg_score,
                 COUNT(*) as response_count
-            FROM oci_responses 
-            WHERE file_id = %s
-            GROUP BY department, question_category
-        """, conn, params=[file_id])
+            FROM oci_responses r
+            JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+            JOIN oci_questions q ON r.survey_id = q.survey_id
+            WHERE r.file_id = %s
+            GROUP BY d.department_code, q.question_category
+        """, conn, params=[file_id]), "department")
         
         # 3. CGS 분석
-        cgs_summary = pd.read_sql("""
+        cgs_summary = decode(pd.read_sql("""
             SELECT 
-                department,
-                question_category,
-                AVG(CAST(response AS FLOAT))::numeric(10,2) as avg_score,
+                d.department_code,
+                q.question_category,
+                AVG(CAST(r.response AS FLOAT))::numeric(10,2) as avg_score,
                 COUNT(*) as response_count
-            FROM cgs_responses 
-            WHERE file_id = %s
-            GROUP BY department, question_category
-        """, conn, params=[file_id])
+            FROM cgs_responses r
+            JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+            JOIN cgs_questions q ON r.survey_id = q.survey_id
+            WHERE r.file_id = %s
+            GROUP BY d.department_code, q.question_category
+        """, conn, params=[file_id]), "department")
 
         # 분석 텍스트 생성
         analysis_text = f"""
@@ -349,8 +404,29 @@ def generate_comprehensive_report(file_id, requirements=None):
             for _, row in dept_data.iterrows():
                 analysis_text += f"- {row['question_category']}: {row['avg_score']}점\n"
 
+        # 4. OCI-CGS 상관관계
+        correlations = build_correlation_summary(file_id)
+        if correlations:
+            analysis_text += f"\n### 4. OCI-CGS 상관관계\n{correlations}\n"
+
+        # 5. 이전 조사 대비 변화
+        trend_sections = [
+            (name, build_trend_summary(file_id, instrument))
+            for name, instrument in (("OCI", "oci"), ("CGS", "cgs"))
+        ]
+        if any(summary for _, summary in trend_sections):
+            analysis_text += "\n### 5. 이전 조사 대비 변화\n"
+            for name, summary in trend_sections:
+                if summary:
+                    analysis_text += f"\n#### {name}\n{summary}\n"
+
+        # 6. 응답자 의견/역량
+        text_summary = build_text_summary(file_id)
+        if text_summary:
+            analysis_text += f"\n### 6. 응답자 의견 및 보유 역량\n{text_summary}\n"
+
         if requirements:
-            analysis_text += f"\n### 4. 요구사항 기반 분석\n{requirements}\n"
+            analysis_text += f"\n### 7. 요구사항 기반 분석\n{requirements}\n"
 
         conn.close()
         return analysis_text
@@ -0,0 +1,54 @@
+import streamlit as st
+from frontend.database import load_analysis_map, save_analyses
+
+# 세션 상태 키: {file_id: {"texts": {(analysis_type, item): text}, "dirty": set()}}
+_STORE_KEY = "_analysis_store"
+
+def _file_store(file_id):
+    """파일의 분석 저장소 (세션에서 처음 접근할 때 한 번의 쿼리로 전체 로드)"""
+    stores = st.session_state.setdefault(_STORE_KEY, {})
+    store = stores.get(file_id)
+    if store is None:
+        store = {"texts": load_analysis_map(file_id), "dirty": set()}
+        stores[file_id] = store
+    return store
+
+def get_analysis(file_id, analysis_type, item):
+    """저장된(또는 편집 중인) 분석 내용"""
+    return _file_store(file_id)["texts"].get((analysis_type, item), "")
+
+def stage_analysis(file_id, analysis_type, item, text):
+    """편집 내용을 저장소에 반영하고 저장 대기 상태로 표시"""
+    store = _file_store(file_id)
+    store["texts"][(analysis_type, item)] = text
+    store["dirty"].add((analysis_type, item))
+
+def stage_widget_edit(file_id, analysis_type, item, widget_key):
+    """text_area on_change 콜백: 위젯 값을 저장 대기 목록에 추가"""
+    stage_analysis(file_id, analysis_type, item, st.session_state.get(widget_key, ""))
+
+def set_analysis(file_id, analysis_type, item, text):
+    """분석 내용을 바로 저장 (AI 분석 결과 등)"""
+    stage_analysis(file_id, analysis_type, item, text)
+    flush_analyses(file_id)
+
+def flush_analyses(file_id):
+    """저장 대기 중인 편집 내용을 한 번의 upsert로 저장하고 저장한 개수 반환"""
+    store = _file_store(file_id)
+    if not store["dirty"]:
+        return 0
+    pending = {key: store["texts"][key] for key in store["dirty"]}
+    save_analyses(file_id, pending)
+    store["dirty"].clear()
+    return len(pending)
+
+def has_pending_edits(file_id):
+    return bool(_file_store(file_id)["dirty"])
+
+def invalidate_analyses(file_id=None):
+    """저장소 비우기 (다음 접근 시 DB에서 다시 로드)"""
+    stores = st.session_state.get(_STORE_KEY, {})
+    if file_id is None:
+        stores.clear()
+    else:
+        stores.pop(file_id, None)
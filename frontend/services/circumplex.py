@@ -0,0 +1,119 @@
+import threading
+import warnings
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from frontend.services.dimensions import get_labels
+from frontend.services.profiler import profile_section
+from frontend.services.statistics import get_respondent_scores
+
+# OCI 12개 스타일 (circumplex 시계 방향 순서: 11시 성취 -> 10시 유능/완벽주의)
+# (survey_id 키워드, 카테고리명, 클러스터, 시계 위치)
+STYLES = [
+    ('성취', '성취 (Achievement)', 'constructive', 11),
+    ('자아', '자기 실현적 (Self-Actualizing)', 'constructive', 12),
+    ('인간적', '인간적-도움 (Humanistic-Helpful)', 'constructive', 1),
+    ('친화적', '친화적 (Affiliative)', 'constructive', 2),
+    ('승인', '승인 (Approval)', 'passive', 3),
+    ('전통적', '전통적 (Conventional)', 'passive', 4),
+    ('의존적', '의존적 (Dependent)', 'passive', 5),
+    ('회피적', '회피적 (Avoidance)', 'passive', 6),
+    ('반대적', '반대적 (Oppositional)', 'aggressive', 7),
+    ('권력', '권력 (Power)', 'aggressive', 8),
+    ('경쟁', '경쟁적 (Competitive)', 'aggressive', 9),
+    ('능력', '유능/완벽주의적 (Competence/Perfectionistic)', 'aggressive', 10)
+]
+STYLE_NAMES = [name for _, name, _, _ in STYLES]
+
+CLUSTERS = {
+    'constructive': {'label': '건설적', 'color': '#1E88E5'},
+    'passive': {'label': '수동/방어적', 'color': '#43A047'},
+    'aggressive': {'label': '공격/방어적', 'color': '#E53935'}
+}
+CLUSTER_COLUMNS = [f"cluster_{cluster}" for cluster in CLUSTERS]
+PERCENTILE_COLUMNS = [f"pct_{name}" for name in STYLE_NAMES]
+
+# 파일별 점수 캐시
+_MAX_ENTRIES = 32
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def style_for_survey_id(survey_id):
+    """survey_id 키워드로 스타일(카테고리명) 찾기 (없으면 survey_id 그대로)"""
+    for keyword, name, _, _ in STYLES:
+        if keyword in survey_id:
+            return name
+    return survey_id
+
+def score_styles(scores):
+    """응답자/부서별 스타일 점수, 클러스터 점수, 백분위를 한 번에 계산
+
+    scores: 응답자 x 카테고리 평균 점수 (respondent_id, question_category, department_code, score)
+    스타일 열을 circumplex 순서(클러스터별 4개씩 연속)로 맞춘 응답자 x 12 행렬에서
+    클러스터 점수는 (n, 3, 4) reshape 평균, 백분위는 파일 내 응답자 분포 기준 순위로 구함
+    (규준 집단 자료가 없으므로 백분위는 같은 파일 응답자 대비 상대 위치)
+    """
+    wide = scores.pivot_table(index="respondent_id", columns="question_category",
+                              values="score", aggfunc="mean").reindex(columns=STYLE_NAMES)
+    departments = scores.drop_duplicates("respondent_id").set_index("respondent_id")["department_code"]
+    values = wide.to_numpy(dtype=float)
+
+    with profile_section("circumplex", kind="pandas"):
+        # 클러스터 4개 스타일이 모두 결측인 응답자는 NaN (빈 슬라이스 경고 무시)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            clusters = np.nanmean(values.reshape(len(values), len(CLUSTERS), -1), axis=2)
+        percentiles = wide.rank(axis=0, pct=True).to_numpy() * 100
+
+        respondents = pd.DataFrame(
+            np.hstack([values, clusters, percentiles]),
+            index=wide.index,
+            columns=STYLE_NAMES + CLUSTER_COLUMNS + PERCENTILE_COLUMNS
+        )
+        respondents.insert(0, "department_code", departments.reindex(wide.index).to_numpy())
+
+        # 부서 평균과 부서 평균의 백분위 (응답자 분포에서 평균 이하인 비율, 결측 제외)
+        grouped = respondents.groupby("department_code")
+        dept = grouped[STYLE_NAMES + CLUSTER_COLUMNS].mean()
+        dept.insert(0, "respondents", grouped.size())
+        overall = respondents[STYLE_NAMES + CLUSTER_COLUMNS].mean().to_frame("전체").T
+        overall.insert(0, "respondents", len(respondents))
+
+        means = np.vstack([overall[STYLE_NAMES].to_numpy(), dept[STYLE_NAMES].to_numpy()])
+        valid = ~np.isnan(values)
+        below = (values[None, :, :] <= means[:, None, :]) & valid[None, :, :]
+        mean_pct = below.sum(axis=1) / np.maximum(valid.sum(axis=0), 1) * 100
+        overall[PERCENTILE_COLUMNS] = mean_pct[:1]
+        dept[PERCENTILE_COLUMNS] = mean_pct[1:]
+
+    return respondents, dept, overall
+
+def get_style_scores(file_id):
+    """파일의 (응답자별, 부서별, 전체) 스타일 점수 (프로세스 캐시, 부서 라벨 포함)"""
+    key = int(file_id)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    respondents, dept, overall = score_styles(get_respondent_scores(file_id, "oci"))
+    labels = get_labels("department", dept.index.dropna().astype(int).tolist())
+    dept.index = dept.index.map(lambda code: labels.get(int(code)) if pd.notna(code) else None)
+    dept.index.name = "department"
+    result = (respondents, dept, overall)
+
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+def circumplex_profile(row):
+    """점수 행(부서 또는 전체)을 circumplex 차트 입력 DataFrame으로 변환"""
+    return pd.DataFrame({
+        "style": STYLE_NAMES,
+        "cluster": [cluster for _, _, cluster, _ in STYLES],
+        "clock": [clock for _, _, _, clock in STYLES],
+        "score": [row[name] for name in STYLE_NAMES],
+        "percentile": [row[f"pct_{name}"] for name in STYLE_NAMES]
+    })
@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from frontend.services.profiler import profile_section
+from frontend.services.statistics import (
+    SIGNIFICANCE_LEVEL,
+    get_respondent_scores,
+    t_sf_two_sided
+)
+
+METHODS = ("pearson", "spearman")
+
+# 파일별 상관행렬 캐시 {file_id: {"pearson": ..., "spearman": ..., "respondents": n}}
+_MAX_ENTRIES = 32
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def score_matrix(file_id):
+    """응답자 x (OCI 카테고리, CGS 카테고리) 점수 행렬 (두 진단에 모두 응답하고 결측이 없는 응답자만)"""
+    frames = []
+    for instrument in ("oci", "cgs"):
+        scores = get_respondent_scores(file_id, instrument)
+        wide = scores.pivot_table(index="respondent_id", columns="question_category",
+                                  values="score", aggfunc="mean")
+        wide.columns = pd.MultiIndex.from_product([[instrument.upper()], wide.columns])
+        frames.append(wide)
+    return pd.concat(frames, axis=1, join="inner").dropna()
+
+def correlation_matrix(matrix):
+    """표준화한 행렬 Z로 R = Z^T Z / (n - 1) 한 번에 계산"""
+    values = matrix.to_numpy(dtype=float)
+    n = len(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - values.mean(axis=0)) / values.std(axis=0, ddof=1)
+        corr = z.T @ z / (n - 1)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=matrix.columns, columns=matrix.columns)
+
+def rank_matrix(matrix):
+    """열별 평균 순위 (Spearman = 순위의 Pearson 상관)"""
+    return matrix.rank(axis=0, method="average")
+
+def compute_correlations(matrix):
+    """Pearson/Spearman 전체 상관행렬"""
+    return {
+        "pearson": correlation_matrix(matrix),
+        "spearman": correlation_matrix(rank_matrix(matrix)),
+        "respondents": len(matrix)
+    }
+
+def get_correlations(file_id):
+    """파일의 OCI/CGS 카테고리 상관행렬 (프로세스 캐시)"""
+    key = int(file_id)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    matrix = score_matrix(file_id)
+    with profile_section("correlations", kind="pandas"):
+        result = compute_correlations(matrix)
+
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+def cross_block(corr):
+    """전체 상관행렬에서 OCI(행) x CGS(열) 부분만"""
+    return corr.loc["OCI", "CGS"]
+
+def strongest_pairs(file_id, method="pearson", limit=10):
+    """|r|이 큰 순의 OCI-CGS 카테고리 쌍과 유의확률 (t-검정, df = n - 2)"""
+    result = get_correlations(file_id)
+    n = result["respondents"]
+    block = cross_block(result[method]).rename_axis(index="oci_category", columns="cgs_category")
+    pairs = block.stack().rename("r").reset_index()
+    pairs = pairs.dropna(subset=["r"])
+
+    df = n - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = pairs["r"] * np.sqrt(df / (1 - pairs["r"] ** 2))
+    pairs["p_value"] = [t_sf_two_sided(value, df) for value in t]
+    pairs["significant"] = pairs["p_value"] < SIGNIFICANCE_LEVEL
+    pairs = pairs.reindex(pairs["r"].abs().sort_values(ascending=False).index)
+    return pairs.head(limit).reset_index(drop=True)
+
+def format_pairs_for_prompt(pairs):
+    """리포트/프롬프트용 상관 요약"""
+    lines = []
+    for _, row in pairs.iterrows():
+        flag = " (유의)" if row["significant"] else ""
+        lines.append(f"- OCI {row['oci_category']} ↔ CGS {row['cgs_category']}: r={row['r']:+.2f}{flag}")
+    return "\n".join(lines)
+
+def build_correlation_summary(file_id, method="pearson", limit=5):
+    """상관이 강한 OCI-CGS 카테고리 쌍 요약 텍스트 (계산할 응답자가 없으면 빈 문자열)"""
+    if get_correlations(file_id)["respondents"] < 3:
+        return ""
+    return format_pairs_for_prompt(strongest_pairs(file_id, method, limit))
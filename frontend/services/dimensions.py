@@ -0,0 +1,114 @@
+import threading
+from psycopg2 import sql
+from frontend.database import get_db_connection
+
+# 사전 인코딩하는 응답자 속성 (respondents.<속성>_code -> dim_<속성>.code)
+# 원래 VARCHAR 컬럼은 그대로 둠: 코드는 라벨에서 만들어지고(encode_respondents),
+# 원본 데이터 조회/다운로드, Parquet 내보내기, PowerBI 뷰, 통계/추세/텍스트 분석이 아직 라벨을 읽음.
+# 그래서 respondents 행은 코드 컬럼(SMALLINT 7개, 14바이트)만큼 넓어지고, 줄어드는 것은 집계/조인 비용.
+# 라벨 컬럼은 위 조회가 모두 코드 + dim_* 조인으로 바뀐 뒤에 삭제할 것
+DIMENSIONS = (
+    "department",
+    "gender",
+    "age_group",
+    "education_level",
+    "major",
+    "experience_innovation",
+    "experience_total"
+)
+
+# 프로세스 전역 코드 -> 라벨 캐시 (코드는 추가만 되고 바뀌지 않으므로 모르는 코드가 나올 때만 다시 읽음)
+_labels = {}
+_lock = threading.Lock()
+
+def dimension_table(dimension):
+    return f"dim_{dimension}"
+
+def code_column(dimension):
+    return f"{dimension}_code"
+
+def create_dimension_tables(cur):
+    """속성별 사전 테이블과 respondents 코드 컬럼 생성 (마이그레이션 5번)"""
+    for dimension in DIMENSIONS:
+        cur.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {table} (
+                code SMALLSERIAL PRIMARY KEY,
+                value VARCHAR(200) UNIQUE NOT NULL
+            );
+            ALTER TABLE respondents
+                ADD COLUMN IF NOT EXISTS {column} SMALLINT REFERENCES {table}(code);
+        """).format(
+            table=sql.Identifier(dimension_table(dimension)),
+            column=sql.Identifier(code_column(dimension))
+        ))
+
+def encode_respondents(cur, file_id=None):
+    """새 속성값을 사전에 추가하고 응답자 행의 코드 컬럼 채우기 (file_id가 없으면 전체)"""
+    file_filter = sql.SQL("AND r.file_id = %s" if file_id is not None else "")
+    params = (int(file_id),) if file_id is not None else ()
+
+    for dimension in DIMENSIONS:
+        # 이미 있는 값은 넣지 않아 SMALLSERIAL 시퀀스를 낭비하지 않음
+        cur.execute(sql.SQL("""
+            INSERT INTO {table} (value)
+            SELECT DISTINCT r.{attr}
+            FROM respondents r
+            WHERE r.{attr} IS NOT NULL {file_filter}
+              AND NOT EXISTS (SELECT 1 FROM {table} d WHERE d.value = r.{attr})
+            ON CONFLICT (value) DO NOTHING
+        """).format(
+            table=sql.Identifier(dimension_table(dimension)),
+            attr=sql.Identifier(dimension),
+            file_filter=file_filter
+        ), params)
+
+    # 행마다 한 번만 갱신되도록 모든 코드 컬럼을 UPDATE 한 번으로 채움
+    assignments = sql.SQL(",\n").join(
+        sql.SQL("{column} = (SELECT code FROM {table} WHERE value = r.{attr})").format(
+            column=sql.Identifier(code_column(dimension)),
+            table=sql.Identifier(dimension_table(dimension)),
+            attr=sql.Identifier(dimension)
+        )
+        for dimension in DIMENSIONS
+    )
+    cur.execute(sql.SQL("""
+        UPDATE respondents r SET
+            {assignments}
+        WHERE TRUE {file_filter}
+    """).format(assignments=assignments, file_filter=file_filter), params)
+    return cur.rowcount
+
+def _load_labels(dimension):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(sql.SQL("SELECT code, value FROM {}").format(
+            sql.Identifier(dimension_table(dimension))))
+        return dict(cur.fetchall())
+    finally:
+        cur.close()
+        conn.close()
+
+def get_labels(dimension, codes=()):
+    """코드 -> 라벨 사전 (캐시에 없는 코드가 있으면 다시 읽음)"""
+    with _lock:
+        labels = _labels.get(dimension)
+        if labels is None or any(code not in labels for code in codes):
+            labels = _labels[dimension] = _load_labels(dimension)
+        return labels
+
+def decode(df, *dimensions):
+    """<속성>_code 컬럼을 같은 위치의 <속성> 라벨 컬럼으로 바꾼 DataFrame 반환
+
+    집계/정렬은 정수 코드로 끝낸 뒤 화면에 표시하기 직전에 한 번만 라벨로 바꿈
+    """
+    df = df.copy()
+    for dimension in dimensions:
+        column = code_column(dimension)
+        codes = df[column]
+        present = codes.dropna().astype(int).unique().tolist()
+        labels = get_labels(dimension, present)
+        position = df.columns.get_loc(column)
+        df.insert(position, dimension, codes.map(labels))
+        df = df.drop(columns=column)
+    return df
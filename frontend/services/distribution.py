@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+
+# 척도별 응답 의미와 색상
+RESPONSE_SCALES = {
+    "oci": {
+        "meanings": {
+            1: '전혀 그렇지 않다',
+            2: '그렇지 않다',
+            3: '보통이다',
+            4: '그렇다',
+            5: '매우 그렇다'
+        },
+        "colors": {
+            1: '#FF9999',  # 빨간색 계열
+            2: '#FFB366',  # 주황색 계열
+            3: '#FFFF99',  # 노란색 계열
+            4: '#99FF99',  # 초록색 계열
+            5: '#99CCFF'   # 파란색 계열
+        }
+    },
+    "cgs": {
+        "meanings": {
+            1: '전혀 아니다',
+            2: '아니다',
+            3: '약간 아니다',
+            4: '보통이다',
+            5: '약간 그렇다',
+            6: '그렇다',
+            7: '매우 그렇다'
+        },
+        "colors": {
+            1: '#FF0000',  # 빨강
+            2: '#FF6666',  # 연한 빨강
+            3: '#FFCC66',  # 주황
+            4: '#FFFF99',  # 노랑
+            5: '#99FF99',  # 연한 초록
+            6: '#66CC66',  # 초록
+            7: '#009900'   # 진한 초록
+        }
+    }
+}
+
+def get_scores(instrument):
+    """척도 점수 목록 (OCI 1~5, CGS 1~7)"""
+    return sorted(RESPONSE_SCALES[instrument]["meanings"])
+
+@profiled(kind="sql")
+def get_response_matrix(file_id, instrument, category=None):
+    """문항 x 점수 응답 수 행렬 (index: question_category, survey_id / columns: 점수)
+
+    FILTER 집계로 한 번의 스캔에서 점수별 응답 수를 가로로 펼쳐 가져오므로
+    long-format 결과를 pivot 하거나 점수별로 DataFrame을 다시 거를 필요가 없음
+    """
+    scores = get_scores(instrument)
+    score_columns = ",\n".join(
+        f'COUNT(*) FILTER (WHERE r.response = {score}) AS "{score}"' for score in scores
+    )
+    category_filter = "AND q.question_category = %s" if category is not None else ""
+    params = [int(file_id)] + ([category] if category is not None else [])
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+            SELECT
+                q.question_category,
+                q.survey_id,
+                {score_columns}
+            FROM {instrument}_responses r
+            JOIN {instrument}_questions q ON r.survey_id = q.survey_id
+            WHERE r.file_id = %s {category_filter}
+            GROUP BY q.question_category, q.survey_id
+            ORDER BY q.question_category, q.survey_id
+        """, params)
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+
+    index = pd.MultiIndex.from_tuples(
+        [row[:2] for row in rows], names=["question_category", "survey_id"]
+    )
+    counts = np.array([row[2:] for row in rows], dtype=np.int64).reshape(len(rows), len(scores))
+    return pd.DataFrame(counts, index=index, columns=scores)
+
+def to_percentages(counts):
+    """행(문항)별 응답 비율(%) 행렬"""
+    totals = counts.sum(axis=1).replace(0, np.nan)
+    return counts.div(totals, axis=0).mul(100).fillna(0).round(1)
+
+def mean_scores(counts):
+    """문항별 평균 점수 (점수 가중 평균)"""
+    values = counts.to_numpy()
+    totals = values.sum(axis=1)
+    weighted = values @ np.asarray(counts.columns, dtype=float)
+    return pd.Series(
+        np.divide(weighted, totals, out=np.full(len(totals), np.nan), where=totals > 0),
+        index=counts.index
+    )
+
+def category_slice(matrix, category):
+    """카테고리 하나의 행만 survey_id 인덱스로 반환"""
+    if category not in matrix.index.get_level_values("question_category"):
+        return matrix.iloc[0:0].droplevel("question_category")
+    return matrix.xs(category, level="question_category")
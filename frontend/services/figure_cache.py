@@ -0,0 +1,76 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.io as pio
+from frontend.services.profiler import profile_section
+
+# 프로세스 전역 캐시 (모든 세션/rerun 공유), 직렬화 크기 기준 LRU
+_MAX_BYTES = int(float(os.getenv("OCI_FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+def data_fingerprint(data):
+    """DataFrame(또는 DataFrame 목록)의 내용 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    frames = data if isinstance(data, (list, tuple)) else [data]
+    for df in frames:
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        digest.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _options_key(options):
+    return json.dumps(options, sort_keys=True, ensure_ascii=False, default=str)
+
+def get_cached_figure(kind, data, build, **options):
+    """(차트 종류, 데이터 지문, 레이아웃 옵션) 키로 캐시된 figure dict 반환
+
+    build(data, **options)는 캐시 미스일 때만 호출되며, 결과 figure의 모든 설정
+    (update_traces/update_layout 포함)을 끝낸 상태로 반환해야 함.
+    반환값은 st.plotly_chart에 그대로 넘길 수 있는 dict이므로 수정하지 말 것.
+    """
+    key = (kind, data_fingerprint(data), _options_key(options))
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return entry["figure"]
+
+    with profile_section(f"figure:{kind}", kind="plotly"):
+        fig = build(data, **options)
+        serialized = pio.to_json(fig, validate=False)
+        figure = json.loads(serialized)
+
+    size = len(serialized.encode("utf-8"))
+    with _lock:
+        _stats["misses"] += 1
+        # 같은 키를 동시에 만든 다른 스레드가 먼저 넣었으면 그 항목을 그대로 사용 (크기 중복 집계 방지)
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry["figure"]
+        if size <= _MAX_BYTES:
+            _cache[key] = {"figure": figure, "size": size}
+            _stats["bytes"] += size
+            while _stats["bytes"] > _MAX_BYTES:
+                _, evicted = _cache.popitem(last=False)
+                _stats["bytes"] -= evicted["size"]
+                _stats["evictions"] += 1
+    return figure
+
+def get_figure_cache_stats():
+    """캐시 적중/미스/제거 횟수와 현재 크기"""
+    with _lock:
+        return {**_stats, "entries": len(_cache), "max_bytes": _MAX_BYTES}
+
+def clear_figure_cache():
+    with _lock:
+        _cache.clear()
+        _stats.update({"hits": 0, "misses": 0, "evictions": 0, "bytes": 0})
@@ -0,0 +1,315 @@
+import os
+import time
+import threading
+from datetime import datetime
+from psycopg2 import sql
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+from frontend.services.partitions import drop_response_partitions, is_partitioned
+from frontend.services.powerbi_views import refresh_powerbi_views, refresh_powerbi_views_in_background
+
+# 보관 기간/배치 크기/백그라운드 실행 주기 (환경변수로 조정)
+RETENTION_DAYS = int(os.getenv("OCI_RETENTION_DAYS", "30"))
+BATCH_SIZE = int(os.getenv("OCI_PURGE_BATCH_SIZE", "5000"))
+INTERVAL_HOURS = float(os.getenv("OCI_MAINTENANCE_INTERVAL_HOURS", "0"))
+
+_run_lock = threading.Lock()
+_scheduler = None
+_last_report = None
+
+# 백그라운드 파일 삭제 진행 상황 {file_id: {...}}
+_deletions = {}
+_deletions_lock = threading.Lock()
+
+def file_tables(cur):
+    """file_id 컬럼을 가진 사용자 테이블 목록 (uploaded_files/개별 파티션 제외, powerbi_* 포함)"""
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid
+        WHERE n.nspname = current_schema()
+          AND c.relkind IN ('r', 'p')
+          AND NOT c.relispartition
+          AND a.attname = 'file_id'
+          AND NOT a.attisdropped
+          AND c.relname <> 'uploaded_files'
+        ORDER BY c.relname
+    """)
+    return [row[0] for row in cur.fetchall()]
+
+def delete_in_batches(cur, table, condition, params, batch_size=BATCH_SIZE, on_batch=None):
+    """조건에 맞는 행을 batch_size개씩 나눠 삭제 (배치마다 커밋되어 잠금이 짧음)
+
+    on_batch(삭제한 행 수)는 배치마다 호출됨 (진행 상황 표시용).
+    파티션 테이블은 파티션마다 ctid가 겹치므로 바깥 DELETE에도 조건을 다시 걺
+    """
+    query = sql.SQL("""
+        DELETE FROM {table}
+        WHERE ctid = ANY(ARRAY(
+            SELECT ctid FROM {table} WHERE {condition} LIMIT %s
+        ))
+          AND {condition}
+    """).format(table=sql.Identifier(table), condition=sql.SQL(condition))
+
+    deleted = 0
+    while True:
+        cur.execute(query, (*params, batch_size, *params))
+        deleted += cur.rowcount
+        if on_batch is not None:
+            on_batch(cur.rowcount)
+        if cur.rowcount < batch_size:
+            return deleted
+
+@profiled(kind="db")
+def purge_file(cur, file_id, batch_size=BATCH_SIZE, tables=None, progress=None):
+    """파일 하나의 데이터를 테이블별로 배치 삭제한 뒤 uploaded_files 행 삭제
+
+    CASCADE 한 번으로 수십만 행을 지우는 긴 트랜잭션 대신 짧은 배치로 나눠
+    다른 세션의 조회를 막지 않음. 응답 테이블은 파일 파티션을 DROP 하므로 행 단위 삭제가 없음.
+    progress(테이블, 삭제 행 수, 끝난 테이블 수, 전체 테이블 수)는 배치마다 호출됨.
+    반환값: {테이블: 삭제 행 수}
+    """
+    tables = tables if tables is not None else file_tables(cur)
+    report = (lambda *args: None) if progress is None else progress
+    deleted = drop_response_partitions(cur, file_id)
+    for table, rows in deleted.items():
+        report(table, rows, 0, len(tables))
+    for index, table in enumerate(tables):
+        rows = delete_in_batches(cur, table, "file_id = %s", (file_id,), batch_size,
+                                 on_batch=lambda rows, table=table, index=index: report(table, rows, index, len(tables)))
+        report(table, 0, index + 1, len(tables))
+        if rows:
+            deleted[table] = deleted.get(table, 0) + rows
+    cur.execute("DELETE FROM uploaded_files WHERE file_id = %s", (file_id,))
+    if cur.rowcount:
+        deleted["uploaded_files"] = cur.rowcount
+    return deleted
+
+def expired_file_ids(cur, days=RETENTION_DAYS):
+    """보관 기간이 지난 파일 + 삭제 중 중단된 파일 (지금 백그라운드에서 삭제 중인 파일 제외)"""
+    cur.execute("""
+        SELECT file_id FROM uploaded_files
+        WHERE uploaded_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+           OR status = 'deleting'
+        ORDER BY file_id
+    """, (days,))
+    with _deletions_lock:
+        running = {file_id for file_id, state in _deletions.items() if state["status"] == "running"}
+    return [row[0] for row in cur.fetchall() if row[0] not in running]
+
+def vacuum_tables(cur, tables):
+    """테이블별 일반 VACUUM (ANALYZE): 읽기/쓰기를 막지 않고 dead tuple 공간을 재사용 가능하게 함"""
+    for table in tables:
+        cur.execute(sql.SQL("VACUUM (ANALYZE) {}").format(sql.Identifier(table)))
+
+def table_bloat_report(cur, tables=None):
+    """테이블별 live/dead tuple 수와 전체 크기 (pg_stat_user_tables 기준)"""
+    cur.execute("""
+        SELECT
+            relname,
+            n_live_tup,
+            n_dead_tup,
+            ROUND(n_dead_tup * 100.0 / NULLIF(n_live_tup + n_dead_tup, 0), 1) AS dead_pct,
+            pg_total_relation_size(relid) AS total_bytes,
+            GREATEST(last_vacuum, last_autovacuum) AS last_vacuum
+        FROM pg_stat_user_tables
+        WHERE schemaname = current_schema()
+        ORDER BY n_dead_tup DESC, relname
+    """)
+    columns = [desc[0] for desc in cur.description]
+    rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+    if tables is not None:
+        rows = [row for row in rows if row["relname"] in tables]
+    return rows
+
+def _totals(rows):
+    return (sum(row["total_bytes"] for row in rows), sum(row["n_dead_tup"] for row in rows))
+
+@profiled(kind="db")
+def run_maintenance(days=RETENTION_DAYS, batch_size=BATCH_SIZE):
+    """만료 파일/분석 결과 배치 삭제 -> 영향받은 테이블만 VACUUM (ANALYZE) -> 결과 리포트
+
+    VACUUM FULL과 달리 ACCESS EXCLUSIVE 잠금이나 테이블 재작성이 없으므로
+    앱 사용 중에도 실행 가능. 동시에 하나만 실행되며, 이미 실행 중이면 None 반환
+    """
+    global _last_report
+    if not _run_lock.acquire(blocking=False):
+        return None
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    started = time.perf_counter()
+    try:
+        tables = file_tables(cur)
+        # 파티션 DROP으로 사라진 테이블 크기도 회수 공간에 포함되도록 전체 테이블 기준으로 비교
+        before = table_bloat_report(cur)
+
+        deleted = {}
+        file_ids = expired_file_ids(cur, days)
+        for file_id in file_ids:
+            for table, rows in purge_file(cur, file_id, batch_size, tables).items():
+                deleted[table] = deleted.get(table, 0) + rows
+
+        if "analysis_results" in tables:
+            rows = delete_in_batches(
+                cur, "analysis_results",
+                "created_at < CURRENT_TIMESTAMP - make_interval(days => %s)", (days,),
+                batch_size
+            )
+            if rows:
+                deleted["analysis_results"] = deleted.get("analysis_results", 0) + rows
+
+        # 파티션 테이블은 DROP으로 이미 정리됐으므로 행 단위로 삭제한 테이블만 VACUUM
+        vacuumed = [table for table in deleted if not is_partitioned(cur, table)]
+        vacuum_tables(cur, vacuumed)
+        if file_ids:
+            # 삭제된 파일 행을 PowerBI 뷰에서도 제거
+            refresh_powerbi_views(cur)
+        after = table_bloat_report(cur)
+
+        (bytes_before, dead_before), (bytes_after, dead_after) = _totals(before), _totals(after)
+        report = {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": round(time.perf_counter() - started, 2),
+            "retention_days": days,
+            "purged_files": file_ids,
+            "deleted_rows": deleted,
+            "vacuumed_tables": sorted(vacuumed),
+            "reclaimed_bytes": bytes_before - bytes_after,
+            "dead_tuples_cleared": dead_before - dead_after,
+            "tables": after
+        }
+        _last_report = report
+        print(f"✅ Database maintenance completed: {len(file_ids)} files, {sum(deleted.values())} rows")
+        return report
+    except Exception as e:
+        print(f"❌ Database maintenance error: {str(e)}")
+        raise
+    finally:
+        cur.close()
+        conn.close()
+        _run_lock.release()
+
+def get_last_maintenance_report():
+    return _last_report
+
+def mark_file_deleting(cur, file_id):
+    """파일을 'deleting' 상태로 바꿔 파일 선택/분석 화면에서 바로 숨김 (이미 삭제 중이면 False)"""
+    cur.execute("""
+        UPDATE uploaded_files SET status = 'deleting'
+        WHERE file_id = %s AND status IS DISTINCT FROM 'deleting'
+    """, (file_id,))
+    return cur.rowcount > 0
+
+def _update_deletion(file_id, **fields):
+    with _deletions_lock:
+        _deletions[file_id].update(fields)
+
+def _delete_file_worker(file_id, batch_size):
+    started = time.perf_counter()
+
+    def progress(table, rows, done_tables, total_tables):
+        with _deletions_lock:
+            state = _deletions[file_id]
+            state["current_table"] = table
+            state["done_tables"] = done_tables
+            state["total_tables"] = total_tables
+            state["deleted_rows"] += rows
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        deleted = purge_file(cur, file_id, batch_size, progress=progress)
+        _update_deletion(file_id, status="done", current_table=None, deleted=deleted,
+                         deleted_rows=sum(deleted.values()),
+                         duration_s=round(time.perf_counter() - started, 2))
+        print(f"✅ File {file_id} deleted: {sum(deleted.values())} rows")
+    except Exception as e:
+        # 'deleting' 상태로 남은 파일은 다음 정리 작업(run_maintenance)에서 이어서 삭제
+        _update_deletion(file_id, status="error", error=str(e))
+        print(f"❌ File {file_id} delete error: {str(e)}")
+    finally:
+        cur.close()
+        conn.close()
+    refresh_powerbi_views_in_background()
+
+def delete_file_in_background(file_id, batch_size=BATCH_SIZE):
+    """파일을 'deleting'으로 표시한 뒤 데몬 스레드에서 배치 삭제 (이미 삭제 중이면 False)
+
+    화면은 표시 UPDATE 한 번만 기다리고, 진행 상황은 get_deletion_progress로 확인
+    """
+    file_id = int(file_id)
+    with _deletions_lock:
+        if _deletions.get(file_id, {}).get("status") == "running":
+            return False
+        _deletions[file_id] = {
+            "status": "running",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "current_table": None,
+            "done_tables": 0,
+            "total_tables": None,
+            "deleted_rows": 0
+        }
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        mark_file_deleting(cur, file_id)
+    except Exception:
+        with _deletions_lock:
+            del _deletions[file_id]
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+    # PowerBI 뷰는 삭제가 끝난 뒤 한 번만 갱신 (갱신 중에는 응답 파티션 DROP이 대기하므로)
+    threading.Thread(
+        target=_delete_file_worker, args=(file_id, batch_size),
+        name=f"oci-delete-file-{file_id}", daemon=True
+    ).start()
+    return True
+
+def get_deletion_progress():
+    """백그라운드 파일 삭제 진행 상황 {file_id: 상태} 복사본"""
+    with _deletions_lock:
+        return {file_id: dict(state) for file_id, state in _deletions.items()}
+
+def clear_finished_deletions():
+    with _deletions_lock:
+        for file_id in [file_id for file_id, state in _deletions.items() if state["status"] != "running"]:
+            del _deletions[file_id]
+
+def is_maintenance_running():
+    return _run_lock.locked()
+
+def run_maintenance_in_background(**kwargs):
+    """run_maintenance를 데몬 스레드에서 한 번 실행 (이미 실행 중이면 False)"""
+    if is_maintenance_running():
+        return False
+    threading.Thread(
+        target=_safe_run, kwargs=kwargs, name="oci-maintenance", daemon=True
+    ).start()
+    return True
+
+def _safe_run(**kwargs):
+    try:
+        run_maintenance(**kwargs)
+    except Exception:
+        pass  # run_maintenance에서 이미 출력함
+
+def start_maintenance_scheduler(interval_hours=INTERVAL_HOURS):
+    """interval_hours마다 백그라운드 정리 실행 (프로세스당 한 번만 시작, 0이면 비활성)"""
+    global _scheduler
+    if interval_hours <= 0 or (_scheduler is not None and _scheduler.is_alive()):
+        return _scheduler
+
+    def loop():
+        while True:
+            _safe_run()
+            time.sleep(interval_hours * 3600)
+
+    _scheduler = threading.Thread(target=loop, name="oci-maintenance-scheduler", daemon=True)
+    _scheduler.start()
+    return _scheduler
@@ -0,0 +1,181 @@
+import os
+import json
+import shutil
+import tempfile
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+
+# 내보내기 폴더 / 서버 커서에서 한 번에 가져오는 행 수 / 압축 방식 (환경변수로 조정)
+EXPORT_DIR = os.getenv("OCI_EXPORT_DIR", "exports")
+BATCH_ROWS = int(os.getenv("OCI_EXPORT_BATCH_ROWS", "50000"))
+COMPRESSION = os.getenv("OCI_EXPORT_COMPRESSION", "zstd")
+
+# (데이터셋 이름, SQL, 스키마) - SQL은 file_id 하나를 파라미터로 받음
+# 반복이 많은 문자열(부서/카테고리/문항 ID)은 Parquet 사전 인코딩으로 저장됨
+DATASETS = [
+    ("respondents", """
+        SELECT r.respondent_id, r.department, r.gender, r.age_group, r.education_level, r.major,
+               r.experience_innovation, r.experience_total, r.department_code, s.segment
+        FROM respondents r
+        LEFT JOIN respondent_segments s
+            ON s.file_id = r.file_id AND s.respondent_id = r.respondent_id
+        WHERE r.file_id = %s
+        ORDER BY r.respondent_id
+    """, pa.schema([
+        ("respondent_id", pa.string()),
+        ("department", pa.string()),
+        ("gender", pa.string()),
+        ("age_group", pa.string()),
+        ("education_level", pa.string()),
+        ("major", pa.string()),
+        ("experience_innovation", pa.string()),
+        ("experience_total", pa.string()),
+        ("department_code", pa.int16()),
+        ("segment", pa.int16())
+    ])),
+    ("oci_responses", """
+        SELECT r.respondent_id, r.survey_id, q.question_category, r.response
+        FROM oci_responses r
+        JOIN oci_questions q ON q.survey_id = r.survey_id
+        WHERE r.file_id = %s
+    """, pa.schema([
+        ("respondent_id", pa.string()),
+        ("survey_id", pa.string()),
+        ("question_category", pa.string()),
+        ("response", pa.int8())
+    ])),
+    ("cgs_responses", """
+        SELECT r.respondent_id, r.survey_id, q.question_category, r.response
+        FROM cgs_responses r
+        JOIN cgs_questions q ON q.survey_id = r.survey_id
+        WHERE r.file_id = %s
+    """, pa.schema([
+        ("respondent_id", pa.string()),
+        ("survey_id", pa.string()),
+        ("question_category", pa.string()),
+        ("response", pa.int8())
+    ])),
+    # 추세 분석 집계 인덱스(file_category_scores)에서 부서 x 카테고리 평균/표준편차
+    ("category_scores", """
+        SELECT s.instrument, s.question_category, NULLIF(s.department_code, 0), d.value, s.n,
+               s.sum_score / NULLIF(s.n, 0),
+               SQRT(GREATEST(s.sum_sq - s.sum_score * s.sum_score / NULLIF(s.n, 0), 0)
+                    / NULLIF(s.n - 1, 0))
+        FROM file_category_scores s
+        LEFT JOIN dim_department d ON d.code = s.department_code
+        WHERE s.file_id = %s
+        ORDER BY s.instrument, s.question_category, s.department_code
+    """, pa.schema([
+        ("instrument", pa.string()),
+        ("question_category", pa.string()),
+        ("department_code", pa.int16()),
+        ("department", pa.string()),
+        ("respondents", pa.int32()),
+        ("avg_score", pa.float64()),
+        ("std_score", pa.float64())
+    ])),
+    ("category_reliability", """
+        SELECT instrument, question_category, items, respondents, cronbach_alpha
+        FROM category_reliability
+        WHERE file_id = %s
+        ORDER BY instrument, question_category
+    """, pa.schema([
+        ("instrument", pa.string()),
+        ("question_category", pa.string()),
+        ("items", pa.int32()),
+        ("respondents", pa.int32()),
+        ("cronbach_alpha", pa.float64())
+    ])),
+    ("respondent_tags", """
+        SELECT respondent_id, field, tag
+        FROM respondent_tags
+        WHERE file_id = %s
+        ORDER BY field, tag, respondent_id
+    """, pa.schema([
+        ("respondent_id", pa.string()),
+        ("field", pa.string()),
+        ("tag", pa.string())
+    ]))
+]
+
+def export_dir(file_id, root=None):
+    return os.path.join(root or EXPORT_DIR, f"file_{int(file_id)}")
+
+def write_dataset(conn, name, query, schema, params, path):
+    """서버 측 커서로 BATCH_ROWS개씩 읽어 Parquet 행 그룹으로 바로 쓰기 (전체를 메모리에 올리지 않음)
+
+    conn은 트랜잭션 모드(autocommit 아님)여야 함. path는 파일 경로 또는 쓰기 가능한 파일 객체
+    """
+    rows = 0
+    cur = conn.cursor(name=f"export_{name}")
+    cur.itersize = BATCH_ROWS
+    try:
+        cur.execute(query, params)
+        with pq.ParquetWriter(path, schema, compression=COMPRESSION, use_dictionary=True) as writer:
+            while True:
+                batch = cur.fetchmany(BATCH_ROWS)
+                if not batch:
+                    break
+                columns = list(zip(*batch))
+                writer.write_batch(pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                rows += len(batch)
+    finally:
+        cur.close()
+    return rows
+
+@profiled(kind="db")
+def export_file(file_id, root=None):
+    """파일 하나의 응답자/응답/집계 데이터셋을 Parquet 스냅샷으로 내보내기
+
+    모든 데이터셋을 읽기 전용 REPEATABLE READ 트랜잭션 하나에서 읽어 같은 시점의 스냅샷이 되고,
+    임시 폴더에 다 쓴 뒤 교체하므로 BI 도구가 쓰다 만 파일을 읽지 않음.
+    반환값: manifest (데이터셋별 행 수/크기)
+    """
+    target = export_dir(file_id, root)
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".file_{int(file_id)}_", dir=os.path.dirname(os.path.abspath(target)))
+
+    conn = get_db_connection()
+    conn.set_session(readonly=True, isolation_level="REPEATABLE READ", autocommit=False)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT file_name, uploaded_at FROM uploaded_files WHERE file_id = %s", (int(file_id),))
+        file_row = cur.fetchone()
+        cur.close()
+        if file_row is None:
+            raise ValueError(f"file_id {file_id} 파일이 없습니다")
+
+        manifest = {
+            "file_id": int(file_id),
+            "file_name": file_row[0],
+            "uploaded_at": file_row[1].isoformat() if file_row[1] else None,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "compression": COMPRESSION,
+            "datasets": {}
+        }
+        for name, query, schema in DATASETS:
+            path = os.path.join(staging, f"{name}.parquet")
+            rows = write_dataset(conn, name, query, schema, (int(file_id),), path)
+            manifest["datasets"][name] = {"rows": rows, "bytes": os.path.getsize(path)}
+        conn.rollback()
+
+        with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # 이전 스냅샷을 새 스냅샷으로 교체 (mkdtemp 폴더는 소유자 전용이므로 읽기 권한 부여)
+        os.chmod(staging, 0o755)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+        return manifest
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        conn.close()
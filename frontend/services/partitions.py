@@ -0,0 +1,130 @@
+from psycopg2 import sql
+
+# file_id 기준 LIST 파티션으로 관리하는 응답 테이블
+RESPONSE_INSTRUMENTS = ("oci", "cgs")
+
+def response_table(instrument):
+    return f"{instrument}_responses"
+
+def partition_name(instrument, file_id):
+    return f"{instrument}_responses_f{int(file_id)}"
+
+def _relkind(cur, table):
+    cur.execute("""
+        SELECT c.relkind
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relname = %s
+    """, (table,))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+def is_partitioned(cur, table):
+    return _relkind(cur, table) == "p"
+
+def _create_partitioned_table(cur, instrument, table):
+    """file_id LIST 파티션 응답 테이블 + 기본(default) 파티션 생성"""
+    cur.execute(sql.SQL("""
+        CREATE TABLE {table} (
+            response_id SERIAL,
+            file_id INTEGER NOT NULL REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            respondent_id VARCHAR(50),
+            survey_id VARCHAR(50) REFERENCES {questions}(survey_id),
+            response INTEGER,
+            response_meaning VARCHAR(200),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (file_id, response_id)
+        ) PARTITION BY LIST (file_id);
+
+        CREATE TABLE {default} PARTITION OF {table} DEFAULT;
+    """).format(
+        table=sql.Identifier(table),
+        questions=sql.Identifier(f"{instrument}_questions"),
+        default=sql.Identifier(f"{table}_default")
+    ))
+
+def _migrate_legacy_table(cur, instrument, table):
+    """기존 단일 힙 테이블을 파티션 테이블로 옮김 (같은 트랜잭션 안에서 호출)"""
+    legacy = f"{table}_legacy"
+    cur.execute(sql.SQL("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE").format(sql.Identifier(table)))
+    if is_partitioned(cur, table):
+        return 0  # 다른 프로세스가 먼저 변환함
+
+    cur.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+        sql.Identifier(table), sql.Identifier(legacy)))
+    # 기존 PK/시퀀스 이름을 새 테이블에서 쓸 수 있도록 비켜둠
+    cur.execute(sql.SQL("ALTER INDEX IF EXISTS {} RENAME TO {}").format(
+        sql.Identifier(f"{table}_pkey"), sql.Identifier(f"{legacy}_pkey")))
+    cur.execute(sql.SQL("ALTER SEQUENCE IF EXISTS {} RENAME TO {}").format(
+        sql.Identifier(f"{table}_response_id_seq"), sql.Identifier(f"{legacy}_response_id_seq")))
+
+    _create_partitioned_table(cur, instrument, table)
+
+    cur.execute(sql.SQL("SELECT DISTINCT file_id FROM {} WHERE file_id IS NOT NULL").format(
+        sql.Identifier(legacy)))
+    for (file_id,) in cur.fetchall():
+        create_partition(cur, instrument, file_id)
+
+    # file_id가 없는 행은 어느 파일에도 속하지 않으므로 옮기지 않음
+    cur.execute(sql.SQL("""
+        INSERT INTO {table} (
+            response_id, file_id, respondent_id, survey_id,
+            response, response_meaning, created_at
+        )
+        SELECT response_id, file_id, respondent_id, survey_id,
+               response, response_meaning, created_at
+        FROM {legacy}
+        WHERE file_id IS NOT NULL
+    """).format(table=sql.Identifier(table), legacy=sql.Identifier(legacy)))
+    moved = cur.rowcount
+
+    cur.execute(sql.SQL("""
+        SELECT setval(pg_get_serial_sequence(%s, 'response_id'),
+                      GREATEST(COALESCE(MAX(response_id), 0), 1))
+        FROM {}
+    """).format(sql.Identifier(table)), (table,))
+    cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(legacy)))
+    return moved
+
+def convert_response_tables(cur):
+    """응답 테이블을 file_id 파티션 구조로 생성하거나, 기존 테이블이면 데이터를 옮겨 변환
+
+    호출한 쪽의 트랜잭션 안에서 실행됨 (마이그레이션 1번 base schema)
+    """
+    for instrument in RESPONSE_INSTRUMENTS:
+        table = response_table(instrument)
+        kind = _relkind(cur, table)
+        if kind == "p":
+            continue
+        if kind is None:
+            _create_partitioned_table(cur, instrument, table)
+            print(f"✅ {table} 파티션 테이블 생성")
+        else:
+            moved = _migrate_legacy_table(cur, instrument, table)
+            print(f"✅ {table} 파티션 변환 완료 ({moved:,}행 이동)")
+
+def create_partition(cur, instrument, file_id):
+    cur.execute(sql.SQL(
+        "CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES IN (%s)"
+    ).format(
+        sql.Identifier(partition_name(instrument, file_id)),
+        sql.Identifier(response_table(instrument))
+    ), (int(file_id),))
+
+def ensure_response_partitions(cur, file_id):
+    """업로드된 파일의 응답 파티션 생성 (파티션 테이블이 아니면 아무것도 하지 않음)"""
+    for instrument in RESPONSE_INSTRUMENTS:
+        if is_partitioned(cur, response_table(instrument)):
+            create_partition(cur, instrument, file_id)
+
+def drop_response_partitions(cur, file_id):
+    """파일의 응답 파티션을 통째로 삭제하고 삭제된 행 수 반환 ({테이블: 행 수})"""
+    dropped = {}
+    for instrument in RESPONSE_INSTRUMENTS:
+        partition = partition_name(instrument, file_id)
+        if _relkind(cur, partition) is None:
+            continue
+        cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(partition)))
+        dropped[response_table(instrument)] = cur.fetchone()[0]
+        cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(partition)))
+    return dropped
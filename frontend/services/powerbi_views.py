@@ -0,0 +1,230 @@
+import time
+import threading
+from psycopg2 import sql
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+
+UNKNOWN_DEPARTMENT = "미지정"
+
+# 응답자 부서 x 속성 분포 (gender_ratio는 부서 내 %, 나머지는 인원수)
+_RESPONDENT_VIEW = f"""
+    WITH base AS (
+        SELECT r.file_id, COALESCE(r.department, '{UNKNOWN_DEPARTMENT}') AS department,
+               r.gender, r.age_group, r.education_level, r.major
+        FROM respondents r
+        JOIN uploaded_files u ON u.file_id = r.file_id AND u.status = 'completed'
+    ),
+    totals AS (
+        SELECT file_id, department, COUNT(*) AS total_count
+        FROM base
+        GROUP BY file_id, department
+    ),
+    attributes AS (
+        SELECT file_id, department, 'gender' AS attribute, gender AS value FROM base
+        UNION ALL SELECT file_id, department, 'age_group', age_group FROM base
+        UNION ALL SELECT file_id, department, 'education_level', education_level FROM base
+        UNION ALL SELECT file_id, department, 'major', major FROM base
+    ),
+    counts AS (
+        SELECT file_id, department, attribute, value, COUNT(*) AS n,
+               ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY file_id, department, attribute), 1) AS pct
+        FROM attributes
+        WHERE value IS NOT NULL
+        GROUP BY file_id, department, attribute, value
+    ),
+    distributions AS (
+        SELECT file_id, department, attribute,
+               jsonb_object_agg(value, CASE WHEN attribute = 'gender' THEN pct ELSE n END) AS counts
+        FROM counts
+        GROUP BY file_id, department, attribute
+    )
+    SELECT
+        t.file_id,
+        t.department,
+        t.total_count,
+        (jsonb_agg(d.counts) FILTER (WHERE d.attribute = 'gender'))->0 AS gender_ratio,
+        (jsonb_agg(d.counts) FILTER (WHERE d.attribute = 'age_group'))->0 AS age_distribution,
+        (jsonb_agg(d.counts) FILTER (WHERE d.attribute = 'education_level'))->0 AS education_stats,
+        (jsonb_agg(d.counts) FILTER (WHERE d.attribute = 'major'))->0 AS major_distribution
+    FROM totals t
+    LEFT JOIN distributions d ON d.file_id = t.file_id AND d.department = t.department
+    GROUP BY t.file_id, t.department, t.total_count
+"""
+
+def _analysis_view(instrument, stats_column, extra_stats=""):
+    """부서 x 카테고리 평균(응답자별 평균의 평균), 응답 분포, 파일 평균 대비 차이
+
+    응답 테이블은 (응답자, 응답값) 단위 집계로 한 번만 읽고 평균과 분포를 모두 계산
+    """
+    return f"""
+        WITH cells AS (
+            SELECT r.file_id, COALESCE(p.department, '{UNKNOWN_DEPARTMENT}') AS department,
+                   q.question_category, r.respondent_id, r.response, COUNT(*) AS n
+            FROM {instrument}_responses r
+            JOIN uploaded_files u ON u.file_id = r.file_id AND u.status = 'completed'
+            JOIN {instrument}_questions q ON q.survey_id = r.survey_id
+            LEFT JOIN respondents p ON p.file_id = r.file_id AND p.respondent_id = r.respondent_id
+            WHERE r.response IS NOT NULL
+            GROUP BY 1, 2, 3, 4, 5
+        ),
+        per_respondent AS (
+            SELECT file_id, department, question_category, respondent_id,
+                   SUM(response * n)::float / SUM(n) AS score, SUM(n) AS responses
+            FROM cells
+            GROUP BY 1, 2, 3, 4
+        ),
+        distribution AS (
+            SELECT file_id, department, question_category,
+                   jsonb_object_agg(response, n ORDER BY response) AS score_distribution
+            FROM (
+                SELECT file_id, department, question_category, response, SUM(n) AS n
+                FROM cells
+                GROUP BY 1, 2, 3, 4
+            ) c
+            GROUP BY 1, 2, 3
+        ),
+        departments AS (
+            SELECT file_id, department, question_category,
+                   AVG(score) AS avg_score, STDDEV_SAMP(score) AS std_score,
+                   COUNT(*) AS respondents, SUM(responses) AS response_count
+            FROM per_respondent
+            GROUP BY 1, 2, 3
+        ),
+        overall AS (
+            SELECT file_id, question_category, AVG(score) AS file_avg
+            FROM per_respondent
+            GROUP BY 1, 2
+        )
+        SELECT
+            d.file_id,
+            d.department,
+            d.question_category,
+            ROUND(d.avg_score::numeric, 2) AS avg_score,
+            d.response_count::integer AS response_count,
+            x.score_distribution,
+            jsonb_build_object(
+                'respondents', d.respondents,
+                'std_score', ROUND(d.std_score::numeric, 2),
+                'file_avg', ROUND(o.file_avg::numeric, 2),
+                'diff_from_file_avg', ROUND((d.avg_score - o.file_avg)::numeric, 2){extra_stats}
+            ) AS {stats_column}
+        FROM departments d
+        JOIN overall o ON o.file_id = d.file_id AND o.question_category = d.question_category
+        JOIN distribution x ON x.file_id = d.file_id AND x.department = d.department
+            AND x.question_category = d.question_category
+    """
+
+# 파일 x 진단 x 카테고리 요약 (부서별 뷰에서 계산하므로 반드시 그 뒤에 갱신)
+_COMPREHENSIVE_VIEW = """
+    WITH departments AS (
+        SELECT file_id, 'oci' AS analysis_type, question_category, department, avg_score,
+               (comparison_stats->>'respondents')::integer AS respondents,
+               (comparison_stats->>'file_avg')::numeric AS file_avg,
+               (comparison_stats->>'diff_from_file_avg')::numeric AS diff
+        FROM powerbi_oci_analysis
+        UNION ALL
+        SELECT file_id, 'cgs', question_category, department, avg_score,
+               (improvement_areas->>'respondents')::integer,
+               (improvement_areas->>'file_avg')::numeric,
+               (improvement_areas->>'diff_from_file_avg')::numeric
+        FROM powerbi_cgs_analysis
+    )
+    SELECT
+        file_id,
+        analysis_type,
+        question_category AS category,
+        jsonb_build_object(
+            'file_avg', MAX(file_avg),
+            'respondents', SUM(respondents),
+            'departments', COUNT(*),
+            'min_department_avg', MIN(avg_score),
+            'max_department_avg', MAX(avg_score),
+            'spread', MAX(avg_score) - MIN(avg_score)
+        ) AS metrics,
+        jsonb_build_object(
+            'highest_department', (array_agg(department ORDER BY avg_score DESC, department))[1],
+            'lowest_department', (array_agg(department ORDER BY avg_score, department))[1]
+        ) AS insights,
+        jsonb_build_object(
+            'below_average_departments',
+            COALESCE((array_agg(department ORDER BY diff, department) FILTER (WHERE diff < 0))[1:3], '{}')
+        ) AS recommendations
+    FROM departments
+    GROUP BY file_id, analysis_type, question_category
+"""
+
+# (뷰 이름, 정의, CONCURRENTLY 갱신용 유니크 인덱스 컬럼) - 갱신 순서대로
+POWERBI_VIEWS = [
+    ("powerbi_respondent_analysis", _RESPONDENT_VIEW, ("file_id", "department")),
+    ("powerbi_oci_analysis", _analysis_view("oci", "comparison_stats"),
+     ("file_id", "department", "question_category")),
+    ("powerbi_cgs_analysis", _analysis_view(
+        "cgs", "improvement_areas", ",\n                'below_file_avg', d.avg_score < o.file_avg"),
+     ("file_id", "department", "question_category")),
+    ("powerbi_comprehensive_analysis", _COMPREHENSIVE_VIEW, ("file_id", "analysis_type", "category"))
+]
+
+_refresh_lock = threading.Lock()
+_pending = threading.Event()
+_last_refresh = None
+
+def create_powerbi_views(cur):
+    """PowerBI용 materialized view와 유니크 인덱스 생성 (마이그레이션 10번)"""
+    for name, query, key_columns in POWERBI_VIEWS:
+        cur.execute(sql.SQL("CREATE MATERIALIZED VIEW IF NOT EXISTS {view} AS {query} WITH DATA").format(
+            view=sql.Identifier(name), query=sql.SQL(query)))
+        cur.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {view} ({columns})").format(
+            index=sql.Identifier(f"uq_{name}"),
+            view=sql.Identifier(name),
+            columns=sql.SQL(", ").join(map(sql.Identifier, key_columns))
+        ))
+
+@profiled(kind="db")
+def refresh_powerbi_views(cur=None):
+    """모든 PowerBI 뷰를 REFRESH ... CONCURRENTLY로 갱신 (갱신 중에도 BI 조회를 막지 않음)
+
+    반환값: {뷰: 소요 초}
+    """
+    conn = None
+    if cur is None:
+        conn = get_db_connection()
+        cur = conn.cursor()
+    try:
+        timings = {}
+        for name, _, _ in POWERBI_VIEWS:
+            started = time.perf_counter()
+            cur.execute(sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(sql.Identifier(name)))
+            timings[name] = round(time.perf_counter() - started, 3)
+        return timings
+    finally:
+        if conn is not None:
+            cur.close()
+            conn.close()
+
+def _refresh_loop():
+    global _last_refresh
+    try:
+        # 갱신 중에 들어온 요청은 한 번의 추가 갱신으로 합침
+        while _pending.is_set():
+            _pending.clear()
+            try:
+                _last_refresh = refresh_powerbi_views()
+                print(f"✅ PowerBI views refreshed: {_last_refresh}")
+            except Exception as e:
+                print(f"❌ PowerBI view refresh error: {str(e)}")
+    finally:
+        _refresh_lock.release()
+    # 해제 직전에 들어온 요청이 있으면 다시 시작
+    if _pending.is_set():
+        refresh_powerbi_views_in_background()
+
+def refresh_powerbi_views_in_background():
+    """업로드/삭제 후 데몬 스레드에서 뷰 갱신 (이미 갱신 중이면 끝난 뒤 한 번 더)"""
+    _pending.set()
+    if not _refresh_lock.acquire(blocking=False):
+        return False
+    threading.Thread(target=_refresh_loop, name="oci-powerbi-refresh", daemon=True).start()
+    return True
+
+def get_last_refresh():
+    return _last_refresh
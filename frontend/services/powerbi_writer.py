@@ -0,0 +1,159 @@
+import io
+import json
+import time
+import threading
+import pandas as pd
+from psycopg2 import sql
+from frontend.services.profiler import profile_section
+
+# 화면에서 저장하는 분석별 PowerBI 테이블 (powerbi_<이름>)
+# 응답/분석 요약 테이블은 materialized view (services/powerbi_views)이므로 여기서 쓰지 않음
+# 이 프로세스에서 이미 스키마를 맞춘 (테이블, 컬럼) - DDL은 테이블마다 한 번만 실행
+_ensured = set()
+_lock = threading.Lock()
+
+def table_name(name):
+    return f"powerbi_{name}"
+
+def sql_type(series):
+    """pandas 데이터타입을 PostgreSQL 타입으로 변환"""
+    if pd.api.types.is_bool_dtype(series):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "DECIMAL(10,2)"
+    # 문항 내용 등 긴 문자열이 있으므로 길이 제한 없이 저장
+    return "TEXT"
+
+def infer_columns(df, key_columns=None):
+    """DataFrame으로 컬럼 정의와 키 컬럼 추정 (키를 주지 않으면 숫자가 아닌 컬럼 = 분류 컬럼)"""
+    columns = {column: sql_type(df[column]) for column in df.columns}
+    if key_columns is None:
+        key_columns = tuple(column for column in df.columns
+                            if not pd.api.types.is_numeric_dtype(df[column]))
+    return columns, tuple(key_columns)
+
+def ensure_powerbi_table(cur, name, columns, key_columns):
+    """powerbi_<name> 테이블, 없는 컬럼, (file_id, 키) 유니크 인덱스를 프로세스당 한 번만 생성"""
+    signature = (name, tuple(columns), tuple(key_columns))
+    with _lock:
+        if signature in _ensured:
+            return
+    table = sql.Identifier(table_name(name))
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id SERIAL PRIMARY KEY,
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """).format(table=table))
+    for column, column_type in columns.items():
+        cur.execute(sql.SQL("ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {type}").format(
+            table=table, column=sql.Identifier(column), type=sql.SQL(column_type)))
+    # 이전 버전에서 만든 테이블에 없는 기록 컬럼
+    for column in ("analysis_date", "updated_at"):
+        cur.execute(sql.SQL("ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+                    .format(table=table, column=sql.Identifier(column)))
+
+    index = f"uq_{table_name(name)}_{'_'.join(key_columns)}"[:63]
+    keys = sql.SQL(", ").join(map(sql.Identifier, ("file_id", *key_columns)))
+    cur.execute("SELECT to_regclass(%s)", (index,))
+    if cur.fetchone()[0] is None:
+        # 예전 행 단위 저장으로 쌓인 중복 행은 키마다 마지막(id가 가장 큰) 행만 남긴 뒤 인덱스 생성
+        cur.execute(sql.SQL("""
+            DELETE FROM {table}
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY {keys} ORDER BY id DESC) AS rn
+                    FROM {table}
+                ) ranked
+                WHERE rn > 1
+            )
+        """).format(table=table, keys=keys))
+        cur.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({keys})").format(
+            index=sql.Identifier(index), table=table, keys=keys))
+    with _lock:
+        _ensured.add(signature)
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def bulk_upsert(cur, name, file_id, df, key_columns, columns=None):
+    """DataFrame을 COPY로 임시 테이블에 올린 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 병합
+
+    columns: {컬럼: SQL 타입} (없으면 DataFrame dtype으로 추정)
+    같은 키가 여러 번 나오면 마지막 행을 사용. 반환값: 행 수/소요 시간/초당 병합 행 수
+    유니크 인덱스는 NULL끼리 충돌로 보지 않으므로 키에 NULL이 있는 행은 기존 행을 먼저 지우고 넣음
+    """
+    if columns is None:
+        columns, key_columns = infer_columns(df, key_columns)
+    if not key_columns:
+        raise ValueError(f"{table_name(name)}: 행을 구분할 키 컬럼이 없습니다")
+    ensure_powerbi_table(cur, name, columns, key_columns)
+
+    names = list(columns)
+    rows = df.reindex(columns=names).drop_duplicates(subset=list(key_columns), keep="last")
+    stage = sql.Identifier(f"stage_{table_name(name)}")
+    target = sql.Identifier(table_name(name))
+    column_list = sql.SQL(", ").join(map(sql.Identifier, names))
+    updates = [column for column in names if column not in key_columns]
+
+    started = time.perf_counter()
+    with profile_section(f"powerbi.{name}", kind="db"):
+        cur.execute(sql.SQL("""
+            DROP TABLE IF EXISTS pg_temp.{stage};
+            CREATE TEMP TABLE {stage} AS SELECT {columns} FROM {target} WITH NO DATA;
+        """).format(stage=stage, columns=column_list, target=target))
+
+        buffer = io.StringIO()
+        rows.apply(lambda column: column.map(_csv_value)).to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cur.copy_expert(sql.SQL("COPY {stage} ({columns}) FROM STDIN WITH (FORMAT csv)").format(
+            stage=stage, columns=column_list).as_string(cur), buffer)
+
+        if rows[list(key_columns)].isna().to_numpy().any():
+            cur.execute(sql.SQL("""
+                DELETE FROM {target} t
+                USING {stage} s
+                WHERE t.file_id = %s AND ({any_null}) AND {same_keys}
+            """).format(
+                target=target,
+                stage=stage,
+                any_null=sql.SQL(" OR ").join(
+                    sql.SQL("s.{} IS NULL").format(sql.Identifier(column)) for column in key_columns),
+                same_keys=sql.SQL(" AND ").join(
+                    sql.SQL("t.{column} IS NOT DISTINCT FROM s.{column}").format(column=sql.Identifier(column))
+                    for column in key_columns)
+            ), (int(file_id),))
+
+        cur.execute(sql.SQL("""
+            INSERT INTO {target} (file_id, {columns})
+            SELECT %s, {columns} FROM {stage}
+            ON CONFLICT (file_id, {keys}) DO UPDATE SET
+                {updates}
+        """).format(
+            target=target,
+            columns=column_list,
+            stage=stage,
+            keys=sql.SQL(", ").join(map(sql.Identifier, key_columns)),
+            updates=sql.SQL(",\n").join(
+                [sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column))
+                 for column in updates]
+                + [sql.SQL("analysis_date = CURRENT_TIMESTAMP"), sql.SQL("updated_at = CURRENT_TIMESTAMP")]
+            )
+        ), (int(file_id),))
+        merged = cur.rowcount
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS pg_temp.{stage}").format(stage=stage))
+
+    seconds = time.perf_counter() - started
+    return {
+        "table": table_name(name),
+        "rows": merged,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(merged / seconds, 1) if seconds > 0 else None
+    }
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+import streamlit as st
+
+# 세션 상태 키
+_RUN_KEY = "_profiler_run"
+_HISTORY_KEY = "_profiler_history"
+_HISTORY_SIZE = 20
+
+# 구간 종류별 색상 (플레임 차트)
+KIND_COLORS = {
+    "page": "#1E88E5",
+    "section": "#42A5F5",
+    "sql": "#FFB300",
+    "db": "#FB8C00",
+    "pandas": "#8E24AA",
+    "plotly": "#43A047",
+    "ai": "#E53935"
+}
+
+def is_profiling_enabled():
+    """프로파일링 모드 여부 (?profile=1 쿼리 파라미터 또는 OCI_PROFILE 환경변수)"""
+    if os.getenv("OCI_PROFILE", "").lower() in ("1", "true", "yes", "on"):
+        return True
+    try:
+        return st.query_params.get("profile", "").lower() in ("1", "true", "yes", "on")
+    except Exception:
+        return False
+
+def _current_run():
+    try:
+        return st.session_state.get(_RUN_KEY)
+    except Exception:
+        # Streamlit 런타임 밖(CLI, 벤치마크)에서는 기록하지 않음
+        return None
+
+def start_rerun(label="rerun"):
+    """새 rerun의 측정 시작 (main() 맨 앞에서 호출)"""
+    if not is_profiling_enabled():
+        st.session_state.pop(_RUN_KEY, None)
+        return
+    st.session_state[_RUN_KEY] = {
+        "label": label,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "origin": time.perf_counter(),
+        "stack": [],
+        "spans": []
+    }
+
+@contextmanager
+def profile_section(name, kind="section"):
+    """구간 타이밍 기록 (중첩 가능)"""
+    run = _current_run()
+    if run is None:
+        yield
+        return
+
+    span_id = len(run["spans"])
+    span = {
+        "id": span_id,
+        "parent": run["stack"][-1] if run["stack"] else None,
+        "name": name,
+        "kind": kind,
+        "depth": len(run["stack"]),
+        "start_ms": 0.0,
+        "duration_ms": 0.0
+    }
+    run["spans"].append(span)
+    run["stack"].append(span_id)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        run["stack"].pop()
+        span["start_ms"] = round((start - run["origin"]) * 1000, 2)
+        span["duration_ms"] = round((end - start) * 1000, 2)
+
+def profiled(name=None, kind="section"):
+    """함수 전체를 하나의 구간으로 측정하는 데코레이터"""
+    def decorator(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_run() is None:
+                return func(*args, **kwargs)
+            with profile_section(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def summarize_run(run):
+    """rerun 단위 집계 (구간 이름별 호출 수/총 시간/자기 시간)"""
+    spans = run["spans"]
+    total_ms = max((s["start_ms"] + s["duration_ms"] for s in spans), default=0.0)
+
+    # 자기 시간 = 전체 시간 - 직계 자식 구간 시간
+    child_ms = {}
+    for s in spans:
+        if s["parent"] is not None:
+            child_ms[s["parent"]] = child_ms.get(s["parent"], 0.0) + s["duration_ms"]
+
+    summary = {}
+    for s in spans:
+        entry = summary.setdefault(s["name"], {
+            "kind": s["kind"], "calls": 0, "total_ms": 0.0, "self_ms": 0.0
+        })
+        entry["calls"] += 1
+        entry["total_ms"] += s["duration_ms"]
+        entry["self_ms"] += s["duration_ms"] - child_ms.get(s["id"], 0.0)
+
+    by_kind = {}
+    for s in spans:
+        self_ms = s["duration_ms"] - child_ms.get(s["id"], 0.0)
+        by_kind[s["kind"]] = by_kind.get(s["kind"], 0.0) + self_ms
+
+    return {
+        "label": run["label"],
+        "started_at": run["started_at"],
+        "total_ms": round(total_ms, 2),
+        "by_kind": {k: round(v, 2) for k, v in by_kind.items()},
+        "sections": {
+            k: {**v, "total_ms": round(v["total_ms"], 2), "self_ms": round(v["self_ms"], 2)}
+            for k, v in sorted(summary.items(), key=lambda x: -x[1]["total_ms"])
+        },
+        "spans": sorted(spans, key=lambda s: s["start_ms"])
+    }
+
+def build_flame_figure(report):
+    """플레임 스타일 차트 (x: 시간, y: 중첩 깊이)"""
+    # 프로파일링 모드에서만 쓰므로 plotly는 여기서 import (홈 화면 시작 시간에서 제외)
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    for kind, color in KIND_COLORS.items():
+        spans = [s for s in report["spans"] if s["kind"] == kind]
+        if not spans:
+            continue
+        fig.add_trace(go.Bar(
+            name=kind,
+            orientation="h",
+            y=[s["depth"] for s in spans],
+            x=[s["duration_ms"] for s in spans],
+            base=[s["start_ms"] for s in spans],
+            text=[s["name"] for s in spans],
+            textposition="inside",
+            insidetextanchor="start",
+            hovertemplate="%{text}<br>%{x:.1f} ms<extra></extra>",
+            marker_color=color
+        ))
+
+    fig.update_layout(
+        barmode="overlay",
+        height=120 + 30 * (max((s["depth"] for s in report["spans"]), default=0) + 1),
+        margin=dict(l=0, r=0, t=30, b=0),
+        xaxis_title="ms",
+        yaxis=dict(autorange="reversed", dtick=1, title="depth"),
+        legend=dict(orientation="h", y=1.1),
+        bargap=0.05
+    )
+    return fig
+
+def show_profiler_sidebar():
+    """현재 rerun의 측정 결과를 사이드바에 표시 (main() 맨 끝에서 호출)"""
+    run = _current_run()
+    if run is None:
+        return
+
+    import pandas as pd
+    from frontend.services.figure_cache import get_figure_cache_stats, clear_figure_cache
+    report = summarize_run(run)
+    history = st.session_state.setdefault(_HISTORY_KEY, [])
+    history.append({"started_at": report["started_at"], "total_ms": report["total_ms"],
+                    "by_kind": report["by_kind"]})
+    del history[:-_HISTORY_SIZE]
+
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### ⏱️ 렌더링 프로파일")
+        st.metric("이번 rerun", f"{report['total_ms']:,.0f} ms")
+
+        if report["spans"]:
+            st.plotly_chart(build_flame_figure(report), use_container_width=True)
+
+            sections_df = pd.DataFrame.from_dict(report["sections"], orient="index")
+            st.dataframe(sections_df[["kind", "calls", "total_ms", "self_ms"]],
+                         use_container_width=True)
+
+        if len(history) > 1:
+            st.caption("최근 rerun 총 시간 (ms)")
+            st.line_chart(pd.DataFrame(history)["total_ms"])
+
+        # 차트 figure 캐시 (프로세스 전역)
+        cache = get_figure_cache_stats()
+        st.caption(f"차트 캐시: {cache['entries']}개, {cache['bytes'] / 1024 / 1024:,.1f}"
+                   f" / {cache['max_bytes'] / 1024 / 1024:,.0f} MB, "
+                   f"적중 {cache['hits']:,} · 미스 {cache['misses']:,} · 제거 {cache['evictions']:,}")
+        st.button("차트 캐시 비우기", key="_profiler_clear_figure_cache",
+                  on_click=clear_figure_cache, use_container_width=True)
+
+        st.download_button(
+            label="📥 프로파일 JSON",
+            data=json.dumps({**report, "history": history}, ensure_ascii=False, indent=2),
+            file_name=f"profile_{report['started_at'].replace(':', '')}.json",
+            mime="application/json",
+            use_container_width=True
+        )
@@ -0,0 +1,165 @@
+import io
+import os
+import csv
+import tempfile
+import threading
+import pandas as pd
+import pyarrow as pa
+from psycopg2 import sql
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+from frontend.services.parquet_export import BATCH_ROWS, write_dataset
+
+# 원본 데이터 테이블: {테이블: (화면 이름, 컬럼 스키마, keyset 정렬 키)}
+# (file_id, 정렬 키) 인덱스를 타므로 페이지 위치와 무관하게 조회 비용이 같음
+# (응답 테이블은 기본 키, 응답자는 마이그레이션 11번 인덱스)
+RAW_TABLES = {
+    "respondents": ("응답자", pa.schema([
+        ("respondent_id", pa.string()),
+        ("department", pa.string()),
+        ("gender", pa.string()),
+        ("age_group", pa.string()),
+        ("education_level", pa.string()),
+        ("major", pa.string()),
+        ("experience_innovation", pa.string()),
+        ("experience_total", pa.string()),
+        ("certifications", pa.string()),
+        ("programming_skills", pa.string()),
+        ("comments", pa.string())
+    ]), "respondent_id"),
+    "oci_responses": ("OCI 응답", pa.schema([
+        ("response_id", pa.int32()),
+        ("respondent_id", pa.string()),
+        ("survey_id", pa.string()),
+        ("response", pa.int32()),
+        ("response_meaning", pa.string())
+    ]), "response_id"),
+    "cgs_responses": ("CGS 응답", pa.schema([
+        ("response_id", pa.int32()),
+        ("respondent_id", pa.string()),
+        ("survey_id", pa.string()),
+        ("response", pa.int32()),
+        ("response_meaning", pa.string())
+    ]), "response_id")
+}
+PAGE_SIZES = (50, 100, 500, 1000)
+
+# 다운로드 파일은 이 크기까지 메모리, 넘으면 임시 파일에 씀
+SPOOL_BYTES = 32 * 1024 * 1024
+
+# 파일별 행 수 캐시 (업로드 후 원본 데이터는 바뀌지 않음)
+_counts = {}
+_lock = threading.Lock()
+
+def _select(table, where=sql.SQL("")):
+    _, schema, key = RAW_TABLES[table]
+    return sql.SQL("SELECT {columns} FROM {table} WHERE file_id = %s {where} ORDER BY {key}").format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, schema.names)),
+        table=sql.Identifier(table),
+        where=where,
+        key=sql.Identifier(key)
+    )
+
+def count_rows(file_id, table):
+    key = (int(file_id), table)
+    with _lock:
+        if key in _counts:
+            return _counts[key]
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(sql.SQL("SELECT COUNT(*) FROM {} WHERE file_id = %s").format(sql.Identifier(table)),
+                    (int(file_id),))
+        count = cur.fetchone()[0]
+    finally:
+        cur.close()
+        conn.close()
+    with _lock:
+        _counts[key] = count
+    return count
+
+@profiled(kind="db")
+def fetch_page(file_id, table, after=None, page_size=PAGE_SIZES[1]):
+    """keyset 페이지: after(이전 페이지 마지막 키)보다 큰 행 page_size개
+
+    OFFSET을 쓰지 않으므로 뒤쪽 페이지도 앞쪽과 같은 비용. 반환값: (DataFrame, 마지막 키, 다음 페이지 여부)
+    """
+    _, schema, key = RAW_TABLES[table]
+    where = sql.SQL("") if after is None else sql.SQL("AND {} > %s").format(sql.Identifier(key))
+    params = [int(file_id)] + ([] if after is None else [after]) + [page_size + 1]
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        query = sql.Composed([_select(table, where), sql.SQL(" LIMIT %s")])
+        cur.execute(query, params)
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+
+    has_more = len(rows) > page_size
+    df = pd.DataFrame(rows[:page_size], columns=schema.names)
+    last_key = df[key].iloc[-1] if not df.empty else after
+    return df, (last_key.item() if hasattr(last_key, "item") else last_key), has_more
+
+def _stream_connection():
+    # 서버 측(named) 커서는 트랜잭션 안에서만 열 수 있음
+    conn = get_db_connection()
+    conn.set_session(readonly=True, autocommit=False)
+    return conn
+
+@profiled(kind="db")
+def write_csv(file_id, table, out):
+    """서버 측 커서로 BATCH_ROWS개씩 읽어 CSV로 쓰기 (엑셀 호환 UTF-8 BOM), 행 수 반환"""
+    _, schema, _ = RAW_TABLES[table]
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(schema.names)
+
+    rows = 0
+    conn = _stream_connection()
+    cur = conn.cursor(name=f"raw_{table}")
+    cur.itersize = BATCH_ROWS
+    try:
+        cur.execute(_select(table), (int(file_id),))
+        while True:
+            batch = cur.fetchmany(BATCH_ROWS)
+            if not batch:
+                break
+            writer.writerows(batch)
+            rows += len(batch)
+        text.flush()
+    finally:
+        text.detach()
+        cur.close()
+        conn.rollback()
+        conn.close()
+    return rows
+
+@profiled(kind="db")
+def write_parquet(file_id, table, out):
+    """서버 측 커서로 읽어 Parquet 행 그룹 단위로 쓰기, 행 수 반환"""
+    _, schema, _ = RAW_TABLES[table]
+    conn = _stream_connection()
+    try:
+        query = _select(table).as_string(conn)
+        return write_dataset(conn, f"raw_{table}", query, schema, (int(file_id),), out)
+    finally:
+        conn.rollback()
+        conn.close()
+
+def download_builder(file_id, table, fmt):
+    """st.download_button data에 넘길 콜백: 클릭할 때만 전체 테이블을 스트리밍으로 만듦
+
+    DB 조회/인코딩은 배치 단위로 진행되고 중간 결과는 SPOOL_BYTES를 넘으면 임시 파일로 넘어감.
+    Streamlit이 완성된 파일을 메모리에 올려 전송하므로 마지막에 한 번만 bytes로 읽음
+    """
+    write = write_parquet if fmt == "parquet" else write_csv
+
+    def build():
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, dir=os.getenv("OCI_EXPORT_TMP")) as out:
+            write(file_id, table, out)
+            out.seek(0)
+            return out.read()
+    return build
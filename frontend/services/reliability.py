@@ -0,0 +1,175 @@
+import threading
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from frontend.database import get_db_connection
+
+INSTRUMENTS = ("oci", "cgs")
+
+# 프로세스 전역 캐시 {(file_id, instrument): (카테고리 DataFrame, 문항 DataFrame)}
+# 신뢰도는 업로드 시 한 번 계산되어 저장되고 바뀌지 않음
+_cache = {}
+_lock = threading.Lock()
+
+def create_reliability_tables(cur):
+    """카테고리/문항 신뢰도 테이블 (마이그레이션 7번)"""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS category_reliability (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            instrument VARCHAR(3),
+            question_category VARCHAR(100),
+            items INTEGER,
+            respondents INTEGER,   -- 카테고리 문항에 모두 응답한 응답자 수
+            cronbach_alpha DOUBLE PRECISION,
+            PRIMARY KEY (file_id, instrument, question_category)
+        );
+
+        CREATE TABLE IF NOT EXISTS item_reliability (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            instrument VARCHAR(3),
+            survey_id VARCHAR(50),
+            question_category VARCHAR(100),
+            item_total_corr DOUBLE PRECISION,   -- 수정된 문항-총점 상관 (자기 문항 제외)
+            alpha_if_deleted DOUBLE PRECISION,
+            PRIMARY KEY (file_id, instrument, survey_id)
+        );
+    """)
+
+def reliability_metrics(matrix):
+    """응답자 x 문항 행렬(결측 없음)의 Cronbach's alpha, 문항별 수정 문항-총점 상관, 문항 제거 시 alpha
+
+    공분산 행렬 하나에서 모두 계산함:
+    총점 분산 = sum(C), 문항 i를 뺀 총점 분산 = sum(C) - 2*sum(C[i]) + C[i,i]
+    """
+    n, k = matrix.shape
+    if n < 2 or k < 2:
+        return np.nan, np.full(k, np.nan), np.full(k, np.nan)
+
+    cov = np.cov(matrix, rowvar=False)
+    item_var = np.diag(cov)
+    total_var = cov.sum()
+    row_sums = cov.sum(axis=1)
+    rest_var = total_var - 2 * row_sums + item_var
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = k / (k - 1) * (1 - item_var.sum() / total_var)
+        item_total = (row_sums - item_var) / np.sqrt(item_var * rest_var)
+        if k > 2:
+            alpha_if_deleted = (k - 1) / (k - 2) * (1 - (item_var.sum() - item_var) / rest_var)
+        else:
+            alpha_if_deleted = np.full(k, np.nan)
+    return alpha, item_total, alpha_if_deleted
+
+def _response_matrix(cur, file_id, instrument):
+    """응답자 x 문항 응답 행렬 (결측 NaN)과 문항별 카테고리"""
+    cur.execute(f"""
+        SELECT r.respondent_id, r.survey_id, q.question_category, r.response
+        FROM {instrument}_responses r
+        JOIN {instrument}_questions q ON r.survey_id = q.survey_id
+        WHERE r.file_id = %s AND r.response IS NOT NULL
+    """, (int(file_id),))
+    rows = pd.DataFrame(cur.fetchall(),
+                        columns=["respondent_id", "survey_id", "question_category", "response"])
+
+    respondent_idx, _ = pd.factorize(rows["respondent_id"])
+    item_idx, items = pd.factorize(rows["survey_id"], sort=True)
+    matrix = np.full((respondent_idx.max() + 1 if len(rows) else 0, len(items)), np.nan)
+    matrix[respondent_idx, item_idx] = rows["response"].to_numpy(dtype=float)
+
+    categories = rows.drop_duplicates("survey_id").set_index("survey_id")["question_category"]
+    return matrix, pd.Series(categories.reindex(items).to_numpy(), index=items)
+
+def compute_file_reliability(cur, file_id, instrument):
+    """파일/진단도구의 카테고리별, 문항별 신뢰도 DataFrame"""
+    matrix, item_categories = _response_matrix(cur, file_id, instrument)
+    category_rows, item_rows = [], []
+    for category, positions in item_categories.groupby(item_categories, sort=True).indices.items():
+        block = matrix[:, positions]
+        # 카테고리 문항에 모두 응답한 응답자만 사용 (listwise)
+        block = block[~np.isnan(block).any(axis=1)]
+        alpha, item_total, alpha_if_deleted = reliability_metrics(block)
+        category_rows.append((category, len(positions), len(block), alpha))
+        for survey_id, corr, deleted in zip(item_categories.index[positions], item_total, alpha_if_deleted):
+            item_rows.append((survey_id, category, corr, deleted))
+
+    categories = pd.DataFrame(category_rows,
+                              columns=["question_category", "items", "respondents", "cronbach_alpha"])
+    items = pd.DataFrame(item_rows,
+                         columns=["survey_id", "question_category", "item_total_corr", "alpha_if_deleted"])
+    return categories, items
+
+def _nullable(value):
+    return None if pd.isna(value) else float(value)
+
+def refresh_file_reliability(cur, file_id):
+    """파일의 신뢰도 지표를 계산해 저장 (업로드 후처리에서 한 번 실행)"""
+    cur.execute("DELETE FROM category_reliability WHERE file_id = %s", (int(file_id),))
+    cur.execute("DELETE FROM item_reliability WHERE file_id = %s", (int(file_id),))
+    for instrument in INSTRUMENTS:
+        categories, items = compute_file_reliability(cur, file_id, instrument)
+        if not categories.empty:
+            execute_values(cur, """
+                INSERT INTO category_reliability (
+                    file_id, instrument, question_category, items, respondents, cronbach_alpha
+                ) VALUES %s
+            """, [
+                (int(file_id), instrument, row.question_category, int(row.items),
+                 int(row.respondents), _nullable(row.cronbach_alpha))
+                for row in categories.itertuples()
+            ])
+        if not items.empty:
+            execute_values(cur, """
+                INSERT INTO item_reliability (
+                    file_id, instrument, survey_id, question_category,
+                    item_total_corr, alpha_if_deleted
+                ) VALUES %s
+            """, [
+                (int(file_id), instrument, row.survey_id, row.question_category,
+                 _nullable(row.item_total_corr), _nullable(row.alpha_if_deleted))
+                for row in items.itertuples()
+            ])
+    with _lock:
+        for instrument in INSTRUMENTS:
+            _cache.pop((int(file_id), instrument), None)
+
+def get_reliability(file_id, instrument):
+    """저장된 신뢰도 (카테고리 DataFrame, 문항 DataFrame), 파일당 한 번만 조회"""
+    key = (int(file_id), instrument)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+
+    conn = get_db_connection()
+    try:
+        categories = pd.read_sql("""
+            SELECT question_category, items, respondents, cronbach_alpha
+            FROM category_reliability
+            WHERE file_id = %s AND instrument = %s
+            ORDER BY question_category
+        """, conn, params=[int(file_id), instrument])
+        items = pd.read_sql("""
+            SELECT survey_id, question_category, item_total_corr, alpha_if_deleted
+            FROM item_reliability
+            WHERE file_id = %s AND instrument = %s
+            ORDER BY question_category, survey_id
+        """, conn, params=[int(file_id), instrument])
+    finally:
+        conn.close()
+
+    with _lock:
+        _cache[key] = (categories, items)
+    return categories, items
+
+def alpha_label(alpha):
+    """Cronbach's alpha 해석 (0.9 / 0.8 / 0.7 / 0.6 기준)"""
+    if pd.isna(alpha):
+        return "계산 불가"
+    if alpha >= 0.9:
+        return "매우 높음"
+    if alpha >= 0.8:
+        return "높음"
+    if alpha >= 0.7:
+        return "수용 가능"
+    if alpha >= 0.6:
+        return "의문"
+    return "낮음"
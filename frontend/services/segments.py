@@ -0,0 +1,221 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from frontend.database import get_db_connection
+from frontend.services.profiler import profiled
+
+METHODS = ("kmeans", "gmm")
+
+# 세그먼트 수 / 미니배치 크기 / 반복 횟수 (시드 고정으로 같은 파일은 항상 같은 결과)
+DEFAULT_SEGMENTS = int(os.getenv("OCI_SEGMENTS", "4"))
+BATCH_SIZE = int(os.getenv("OCI_SEGMENT_BATCH_SIZE", "1024"))
+MAX_ITER = 200
+SEGMENT_SEED = 42
+_TOL = 1e-4
+_MIN_VAR = 1e-3
+
+# 프로세스 전역 캐시 {file_id: 응답자별 세그먼트 DataFrame}
+_cache = {}
+_lock = threading.Lock()
+
+def create_segment_table(cur):
+    """응답자별 문화 세그먼트 테이블 (마이그레이션 8번)"""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS respondent_segments (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            respondent_id VARCHAR(50),
+            segment SMALLINT,
+            method VARCHAR(10),
+            PRIMARY KEY (file_id, respondent_id)
+        );
+    """)
+
+def _squared_distances(x, centers):
+    """행 x 중심 제곱거리 행렬 (||x||^2 - 2 x.c + ||c||^2)"""
+    return np.clip(
+        (x ** 2).sum(axis=1)[:, None] - 2 * x @ centers.T + (centers ** 2).sum(axis=1)[None, :],
+        0, None
+    )
+
+def _kmeans_plus_plus(x, k, rng):
+    """k-means++ 초기 중심 (표본 BATCH_SIZE*4개 안에서 선택)"""
+    sample = x[rng.choice(len(x), min(len(x), BATCH_SIZE * 4), replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    closest = _squared_distances(sample, np.array(centers))[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(sample), p=closest / total) if total > 0 else rng.integers(len(sample))
+        centers.append(sample[index])
+        closest = np.minimum(closest, _squared_distances(sample, sample[index][None, :])[:, 0])
+    return np.array(centers)
+
+def minibatch_kmeans(x, k, batch_size=BATCH_SIZE, max_iter=MAX_ITER, seed=SEGMENT_SEED):
+    """미니배치 k-means (Sculley 2010): 배치마다 중심을 배치 평균 쪽으로 1/누적개수 비율만큼 이동
+
+    반환값: (중심 k x d, 전체 행의 세그먼트 번호)
+    """
+    rng = np.random.default_rng(seed)
+    centers = _kmeans_plus_plus(x, k, rng)
+    counts = np.zeros(k)
+    for _ in range(max_iter):
+        batch = x[rng.integers(0, len(x), min(batch_size, len(x)))]
+        labels = _squared_distances(batch, centers).argmin(axis=1)
+        batch_counts = np.bincount(labels, minlength=k).astype(float)
+        batch_sums = np.zeros_like(centers)
+        np.add.at(batch_sums, labels, batch)
+
+        counts += batch_counts
+        moved = batch_counts > 0
+        rate = np.divide(batch_counts, counts, out=np.zeros(k), where=counts > 0)
+        target = np.divide(batch_sums, batch_counts[:, None], out=centers.copy(),
+                           where=moved[:, None])
+        shift = rate[:, None] * (target - centers)
+        centers = centers + shift
+        if np.abs(shift).max() < _TOL:
+            break
+    return centers, _squared_distances(x, centers).argmin(axis=1)
+
+def _log_responsibilities(x, weights, means, variances):
+    """대각 공분산 가우시안 혼합의 로그 책임도 (행 x 성분)와 행별 로그우도"""
+    log_prob = -0.5 * (
+        ((x[:, None, :] - means[None, :, :]) ** 2 / variances[None, :, :]).sum(axis=2)
+        + np.log(2 * np.pi * variances).sum(axis=1)[None, :]
+    ) + np.log(weights)[None, :]
+    log_norm = np.logaddexp.reduce(log_prob, axis=1)
+    return log_prob - log_norm[:, None], log_norm
+
+def gaussian_mixture(x, k, batch_size=BATCH_SIZE, max_iter=MAX_ITER, seed=SEGMENT_SEED):
+    """대각 공분산 가우시안 혼합 (미니배치 stepwise EM, k-means 중심으로 초기화)
+
+    배치마다 충분통계량(가중치 합, 1차/2차 모멘트)을 step = (t + 2)^-0.7 비율로 갱신
+    반환값: (평균 k x d, 전체 행의 세그먼트 번호)
+    """
+    rng = np.random.default_rng(seed)
+    means, labels = minibatch_kmeans(x, k, batch_size, max_iter, seed)
+    s0 = np.bincount(labels, minlength=k) / len(x) + 1e-6
+    s1 = means * s0[:, None]
+    s2 = (np.var(x, axis=0)[None, :] + means ** 2) * s0[:, None]
+
+    for step in range(max_iter):
+        weights = s0 / s0.sum()
+        means = s1 / s0[:, None]
+        variances = np.clip(s2 / s0[:, None] - means ** 2, _MIN_VAR, None)
+
+        batch = x[rng.integers(0, len(x), min(batch_size, len(x)))]
+        log_resp, _ = _log_responsibilities(batch, weights, means, variances)
+        resp = np.exp(log_resp)
+        rate = (step + 2) ** -0.7
+        new_s0 = resp.mean(axis=0)
+        new_s1 = resp.T @ batch / len(batch)
+        new_s2 = resp.T @ batch ** 2 / len(batch)
+        shift = np.abs(rate * (new_s1 - s1)).max()
+        s0 = (1 - rate) * s0 + rate * new_s0 + 1e-10
+        s1 = (1 - rate) * s1 + rate * new_s1
+        s2 = (1 - rate) * s2 + rate * new_s2
+        if shift < _TOL:
+            break
+
+    weights = s0 / s0.sum()
+    means = s1 / s0[:, None]
+    variances = np.clip(s2 / s0[:, None] - means ** 2, _MIN_VAR, None)
+    log_resp, _ = _log_responsibilities(x, weights, means, variances)
+    return means, log_resp.argmax(axis=1)
+
+def _relabel(centers, labels):
+    """세그먼트 번호를 크기 내림차순으로 다시 매김 (0이 가장 큰 세그먼트)"""
+    order = np.argsort(-np.bincount(labels, minlength=len(centers)), kind="stable")
+    mapping = np.empty(len(order), dtype=int)
+    mapping[order] = np.arange(len(order))
+    return centers[order], mapping[labels]
+
+def _culture_matrix(cur, file_id):
+    """응답자 x OCI 카테고리 평균 점수 행렬 (결측은 카테고리 평균으로 대체)"""
+    cur.execute("""
+        SELECT r.respondent_id, q.question_category, AVG(CAST(r.response AS FLOAT))
+        FROM oci_responses r
+        JOIN oci_questions q ON r.survey_id = q.survey_id
+        WHERE r.file_id = %s AND r.response IS NOT NULL
+        GROUP BY r.respondent_id, q.question_category
+    """, (int(file_id),))
+    rows = pd.DataFrame(cur.fetchall(), columns=["respondent_id", "question_category", "score"])
+    matrix = rows.pivot(index="respondent_id", columns="question_category", values="score")
+    return matrix.fillna(matrix.mean())
+
+def segment_matrix(matrix, k=DEFAULT_SEGMENTS, method="kmeans"):
+    """행렬 행(응답자)별 세그먼트 번호 (크기 내림차순 번호)"""
+    x = matrix.to_numpy(dtype=float)
+    k = max(1, min(k, len(x)))
+    fit = gaussian_mixture if method == "gmm" else minibatch_kmeans
+    centers, labels = fit(x, k)
+    return _relabel(centers, labels)[1]
+
+@profiled(kind="db")
+def assign_segments(cur, file_id, k=DEFAULT_SEGMENTS, method="kmeans"):
+    """파일 응답자를 문화 세그먼트로 나누고 저장 (업로드 후처리 또는 재계산 시 실행), 응답자 수 반환"""
+    cur.execute("DELETE FROM respondent_segments WHERE file_id = %s", (int(file_id),))
+    matrix = _culture_matrix(cur, file_id)
+    if len(matrix) >= 2:
+        labels = segment_matrix(matrix, k, method)
+        execute_values(cur, """
+            INSERT INTO respondent_segments (file_id, respondent_id, segment, method)
+            VALUES %s
+        """, [
+            (int(file_id), respondent_id, int(label), method)
+            for respondent_id, label in zip(matrix.index, labels)
+        ])
+    with _lock:
+        _cache.pop(int(file_id), None)
+    return len(matrix)
+
+def resegment_file(file_id, k, method):
+    """세그먼트 다시 계산 (화면에서 세그먼트 수/방법 변경 시)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        return assign_segments(cur, file_id, k, method)
+    finally:
+        cur.close()
+        conn.close()
+
+def get_segments(file_id):
+    """저장된 응답자별 세그먼트 (respondent_id, segment, method), 파일당 한 번만 조회"""
+    key = int(file_id)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+
+    conn = get_db_connection()
+    try:
+        segments = pd.read_sql("""
+            SELECT respondent_id, segment, method
+            FROM respondent_segments
+            WHERE file_id = %s
+            ORDER BY respondent_id
+        """, conn, params=[key])
+    finally:
+        conn.close()
+
+    with _lock:
+        _cache[key] = segments
+    return segments
+
+def short_category(category):
+    """'인간적-도움 (Humanistic-Helpful)' -> '인간적-도움'"""
+    return str(category).split(" (")[0]
+
+def segment_profiles(scores, segments):
+    """세그먼트 x 카테고리 평균과 세그먼트 이름 (전체 평균 대비 가장 높은 카테고리)
+
+    scores: 응답자 x 카테고리 평균 점수 (respondent_id, question_category, score)
+    """
+    merged = scores.merge(segments[["respondent_id", "segment"]], on="respondent_id")
+    means = merged.pivot_table(index="segment", columns="question_category", values="score", aggfunc="mean")
+    sizes = merged.groupby("segment")["respondent_id"].nunique()
+    lift = means - merged.groupby("question_category")["score"].mean()
+    names = {
+        segment: f"S{segment + 1} · {short_category(lift.loc[segment].idxmax())} 우세"
+        for segment in means.index
+    }
+    return means, sizes, names
@@ -0,0 +1,367 @@
+import os
+import threading
+from collections import OrderedDict
+from math import exp, lgamma, log
+import numpy as np
+import pandas as pd
+from frontend.database import get_db_connection
+from frontend.services.dimensions import get_labels
+from frontend.services.profiler import profiled, profile_section
+
+# 유의성 판정 기준
+SIGNIFICANCE_LEVEL = 0.05
+
+# bootstrap 신뢰구간 설정 (시드 고정으로 같은 파일은 항상 같은 구간)
+BOOTSTRAP_RESAMPLES = int(os.getenv("OCI_BOOTSTRAP_RESAMPLES", "1000"))
+BOOTSTRAP_SEED = 42
+CONFIDENCE = 0.95
+# 한 번에 만드는 재표본 원소 수 상한 (재표본 x 응답 수 행렬을 이 크기 단위로 나눠 생성)
+_BOOTSTRAP_CHUNK = 4_000_000
+
+# 파일별 계산 결과 캐시 (파일 데이터는 업로드 후 바뀌지 않으므로 무효화 없이 LRU로만 제한)
+# {(file_id, instrument): {"scores": 응답자 점수, "tests": ..., "intervals": ...}}
+_MAX_ENTRIES = 32
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+# 불완전 베타/감마 함수 반복 설정 (scipy 없이 F/카이제곱 분포 p-value 계산)
+_MAX_ITER = 300
+_EPS = 3e-14
+_TINY = 1e-300
+
+def _beta_fraction(a, b, x):
+    """정규화 불완전 베타 함수의 연분수 (Lentz 방법)"""
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1 / (d if abs(d) > _TINY else _TINY)
+    h = d
+    for m in range(1, _MAX_ITER):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1 + aa * d
+            d = 1 / (d if abs(d) > _TINY else _TINY)
+            c = 1 + aa / c
+            c = c if abs(c) > _TINY else _TINY
+            delta = d * c
+            h *= delta
+        if abs(delta - 1) < _EPS:
+            break
+    return h
+
+def _betainc(a, b, x):
+    """정규화 불완전 베타 함수 I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = exp(lgamma(a + b) - lgamma(a) - lgamma(b) + a * log(x) + b * log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+def _gammaincc(a, x):
+    """정규화 상부 불완전 감마 함수 Q(a, x)"""
+    if x <= 0:
+        return 1.0
+    front = exp(-x + a * log(x) - lgamma(a))
+    if x < a + 1:
+        # 급수 전개
+        term = total = 1 / a
+        ap = a
+        for _ in range(_MAX_ITER):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * _EPS:
+                break
+        return max(0.0, 1 - total * front)
+    # 연분수 (Lentz 방법)
+    b = x + 1 - a
+    c = 1 / _TINY
+    d = 1 / b
+    h = d
+    for i in range(1, _MAX_ITER):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1 / (d if abs(d) > _TINY else _TINY)
+        c = b + an / c
+        c = c if abs(c) > _TINY else _TINY
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < _EPS:
+            break
+    return front * h
+
+def f_sf(f, df1, df2):
+    """F 분포 상단 꼬리 확률"""
+    if not np.isfinite(f) or df1 <= 0 or df2 <= 0:
+        return np.nan
+    return _betainc(df2 / 2, df1 / 2, df2 / (df2 + df1 * f))
+
+def chi2_sf(x, df):
+    """카이제곱 분포 상단 꼬리 확률"""
+    if not np.isfinite(x) or df <= 0:
+        return np.nan
+    return _gammaincc(df / 2, x / 2)
+
+def t_sf_two_sided(t, df):
+    """t 분포 양측 꼬리 확률"""
+    if not np.isfinite(t) or df <= 0:
+        return np.nan
+    return _betainc(df / 2, 0.5, df / (df + t * t))
+
+def _average_ranks(groups, values, n_groups):
+    """그룹별 오름차순 평균 순위(동점은 평균)와 그룹별 동점 보정항 sum(t^3 - t)"""
+    order = np.lexsort((values, groups))
+    sorted_groups, sorted_values = groups[order], values[order]
+
+    # 그룹 안에서의 1부터 시작하는 순위
+    starts = np.concatenate(([0], np.cumsum(np.bincount(groups, minlength=n_groups))[:-1]))
+    positions = np.arange(len(values)) - starts[sorted_groups] + 1
+
+    # (그룹, 값)이 같은 연속 구간 = 동점 묶음
+    new_tie = np.ones(len(values), dtype=bool)
+    new_tie[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_values[1:] != sorted_values[:-1])
+    tie_id = np.cumsum(new_tie) - 1
+    tie_sizes = np.bincount(tie_id)
+    tie_ranks = np.bincount(tie_id, weights=positions) / tie_sizes
+
+    ranks = np.empty(len(values))
+    ranks[order] = tie_ranks[tie_id]
+    tie_groups = sorted_groups[new_tie]
+    tie_terms = np.bincount(tie_groups, weights=tie_sizes.astype(float) ** 3 - tie_sizes,
+                            minlength=n_groups)
+    return ranks, tie_terms
+
+def department_tests(scores):
+    """모든 카테고리의 부서 간 차이 검정을 한 번에 계산
+
+    scores: 응답자 x 카테고리 평균 점수 (question_category, department_code, score)
+    카테고리 x 부서 칸의 n/합/제곱합/순위합을 bincount 한 번씩으로 구한 뒤
+    일원분산분석, Kruskal-Wallis, 부서쌍별 Cohen's d를 행렬 연산으로 계산함
+    반환값: (카테고리별 요약 DataFrame, 부서쌍별 효과크기 DataFrame)
+    """
+    scores = scores.dropna(subset=["department_code", "score"])
+    cat_idx, categories = pd.factorize(scores["question_category"], sort=True)
+    dept_idx, departments = pd.factorize(scores["department_code"].astype(int), sort=True)
+    values = scores["score"].to_numpy(dtype=float)
+    n_cat, n_dept = len(categories), len(departments)
+
+    cells = cat_idx * n_dept + dept_idx
+    shape = (n_cat, n_dept)
+    n = np.bincount(cells, minlength=n_cat * n_dept).reshape(shape).astype(float)
+    sums = np.bincount(cells, weights=values, minlength=n_cat * n_dept).reshape(shape)
+    squares = np.bincount(cells, weights=values ** 2, minlength=n_cat * n_dept).reshape(shape)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total_n = n.sum(axis=1)
+        groups = (n > 0).sum(axis=1)
+        means = sums / n
+        grand_mean = sums.sum(axis=1) / total_n
+
+        # 일원분산분석
+        ss_between = np.nansum(n * (means - grand_mean[:, None]) ** 2, axis=1)
+        ss_total = squares.sum(axis=1) - total_n * grand_mean ** 2
+        ss_within = np.clip(ss_total - ss_between, 0, None)
+        df_between, df_within = groups - 1, total_n - groups
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+        eta_sq = ss_between / ss_total
+
+        # Kruskal-Wallis (카테고리 안에서 순위, 동점 보정)
+        ranks, tie_terms = _average_ranks(cat_idx, values, n_cat)
+        rank_sums = np.bincount(cells, weights=ranks, minlength=n_cat * n_dept).reshape(shape)
+        h_stat = (12 / (total_n * (total_n + 1)) * np.nansum(rank_sums ** 2 / n, axis=1)
+                  - 3 * (total_n + 1))
+        h_stat = h_stat / (1 - tie_terms / (total_n ** 3 - total_n))
+        epsilon_sq = h_stat / (total_n - 1)
+
+        # 부서쌍별 Cohen's d (합동 표준편차 기준)
+        variances = np.where(n > 1, (squares - n * means ** 2) / (n - 1), np.nan)
+        pooled = (((n - 1) * variances)[:, :, None] + ((n - 1) * variances)[:, None, :]) / (
+            n[:, :, None] + n[:, None, :] - 2)
+        cohens_d = (means[:, :, None] - means[:, None, :]) / np.sqrt(pooled)
+
+    summary = pd.DataFrame({
+        "respondents": total_n.astype(int),
+        "departments": groups,
+        "f_stat": f_stat,
+        "anova_p": [f_sf(f, d1, d2) for f, d1, d2 in zip(f_stat, df_between, df_within)],
+        "eta_sq": eta_sq,
+        "h_stat": h_stat,
+        "kruskal_p": [chi2_sf(h, d) for h, d in zip(h_stat, df_between)],
+        "epsilon_sq": epsilon_sq
+    }, index=pd.Index(categories, name="question_category"))
+    summary["significant"] = (summary["anova_p"] < SIGNIFICANCE_LEVEL) | (
+        summary["kruskal_p"] < SIGNIFICANCE_LEVEL)
+
+    cat, first, second = np.nonzero(np.triu(np.isfinite(cohens_d), k=1))
+    effect_sizes = pd.DataFrame({
+        "question_category": categories[cat],
+        "department_code_a": departments[first],
+        "department_code_b": departments[second],
+        "mean_a": means[cat, first],
+        "mean_b": means[cat, second],
+        "n_a": n[cat, first].astype(int),
+        "n_b": n[cat, second].astype(int),
+        "cohens_d": cohens_d[cat, first, second]
+    })
+    return summary, effect_sizes
+
+def bootstrap_intervals(scores, resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE,
+                        seed=BOOTSTRAP_SEED):
+    """모든 카테고리 x 부서 평균의 percentile bootstrap 신뢰구간
+
+    응답을 칸(카테고리, 부서) 순으로 정렬해 두고, 재표본마다 각 응답 위치에서
+    같은 칸 안의 인덱스를 한꺼번에 뽑은 뒤 np.add.reduceat으로 칸별 합을 구함
+    (칸/재표본 단위 반복 없음, 메모리 제한을 위해 재표본 방향으로만 나눠 생성)
+    """
+    scores = scores.dropna(subset=["department_code", "score"])
+    columns = ["question_category", "department_code", "n", "mean", "ci_low", "ci_high"]
+    if scores.empty:
+        return pd.DataFrame(columns=columns)
+
+    keys = pd.MultiIndex.from_arrays(
+        [scores["question_category"], scores["department_code"].astype(int)]
+    )
+    cell_idx, cells = keys.factorize(sort=True)
+    order = np.argsort(cell_idx, kind="stable")
+    values = scores["score"].to_numpy(dtype=float)[order]
+    cell_of = cell_idx[order]
+    n = np.bincount(cell_of)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+
+    rng = np.random.default_rng(seed)
+    rows = max(1, _BOOTSTRAP_CHUNK // len(values))
+    means = np.empty((resamples, len(n)))
+    for begin in range(0, resamples, rows):
+        size = min(rows, resamples - begin)
+        picks = starts[cell_of] + (rng.random((size, len(values))) * n[cell_of]).astype(np.int64)
+        means[begin:begin + size] = np.add.reduceat(values[picks], starts, axis=1) / n
+
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail], axis=0)
+    intervals = cells.to_frame(index=False, name=["question_category", "department_code"])
+    intervals["n"] = n
+    intervals["mean"] = np.add.reduceat(values, starts) / n
+    intervals["ci_low"] = low
+    intervals["ci_high"] = high
+    return intervals[columns]
+
+@profiled(kind="sql")
+def _load_respondent_scores(file_id, instrument):
+    """응답자 x 카테고리 평균 점수 (모든 카테고리를 한 번에 조회)"""
+    conn = get_db_connection()
+    try:
+        return pd.read_sql(f"""
+            SELECT
+                r.respondent_id,
+                q.question_category,
+                d.department_code,
+                AVG(CAST(r.response AS FLOAT)) AS score
+            FROM {instrument}_responses r
+            JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+            JOIN {instrument}_questions q ON r.survey_id = q.survey_id
+            WHERE r.file_id = %s AND r.response IS NOT NULL
+            GROUP BY q.question_category, d.department_code, r.respondent_id
+        """, conn, params=[int(file_id)])
+    finally:
+        conn.close()
+
+def _with_labels(effect_sizes):
+    codes = pd.concat([effect_sizes["department_code_a"], effect_sizes["department_code_b"]])
+    labels = get_labels("department", codes.unique().tolist())
+    return effect_sizes.assign(
+        department_a=effect_sizes["department_code_a"].map(labels),
+        department_b=effect_sizes["department_code_b"].map(labels)
+    ).drop(columns=["department_code_a", "department_code_b"])
+
+def _cached(file_id, instrument, name, compute):
+    """파일 캐시 항목의 name 결과 반환 (없으면 compute(응답자 점수)로 계산해 저장)"""
+    key = (int(file_id), instrument)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            if name in entry:
+                return entry[name]
+
+    if entry is None:
+        entry = {"scores": _load_respondent_scores(file_id, instrument)}
+    with profile_section(name, kind="pandas"):
+        result = compute(entry["scores"])
+
+    with _lock:
+        entry[name] = result
+        _cache[key] = entry
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+def get_respondent_scores(file_id, instrument):
+    """응답자 x 카테고리 평균 점수 (respondent_id, question_category, department_code, score)"""
+    return _cached(file_id, instrument, "scores", lambda scores: scores)
+
+def get_department_statistics(file_id, instrument):
+    """파일의 카테고리별 부서 간 검정 결과 (프로세스 캐시, 파일당 쿼리 1회)"""
+    def compute(scores):
+        summary, effect_sizes = department_tests(scores)
+        return summary, _with_labels(effect_sizes)
+    return _cached(file_id, instrument, "department_tests", compute)
+
+def get_bootstrap_intervals(file_id, instrument):
+    """파일의 카테고리 x 부서 평균 bootstrap 신뢰구간 (프로세스 캐시, 부서 라벨 포함)"""
+    def compute(scores):
+        intervals = bootstrap_intervals(scores)
+        labels = get_labels("department", intervals["department_code"].unique().tolist())
+        return intervals.assign(department=intervals["department_code"].map(labels))
+    return _cached(file_id, instrument, "bootstrap_intervals", compute)
+
+def with_error_bars(df, file_id, instrument, category):
+    """부서별 평균 DataFrame(department, avg_score)에 신뢰구간 오차막대 컬럼 추가
+
+    error_plus/error_minus: px.bar의 error_y/error_y_minus에 그대로 넘기는 값
+    """
+    intervals = get_bootstrap_intervals(file_id, instrument)
+    intervals = intervals[intervals["question_category"] == category][
+        ["department", "ci_low", "ci_high"]]
+    merged = df.merge(intervals, on="department", how="left")
+    mean = merged["avg_score"].astype(float)
+    return merged.assign(
+        error_plus=(merged["ci_high"] - mean).clip(lower=0),
+        error_minus=(mean - merged["ci_low"]).clip(lower=0)
+    )
+
+def category_statistics(file_id, instrument, category):
+    """카테고리 하나의 검정 요약(Series 또는 None)과 효과크기가 큰 순의 부서쌍"""
+    summary, effect_sizes = get_department_statistics(file_id, instrument)
+    if category not in summary.index:
+        return None, effect_sizes.iloc[0:0]
+    pairs = effect_sizes[effect_sizes["question_category"] == category]
+    pairs = pairs.reindex(pairs["cohens_d"].abs().sort_values(ascending=False).index)
+    return summary.loc[category], pairs
+
+def effect_size_label(d):
+    """Cohen's d 크기 해석 (0.2 작음 / 0.5 중간 / 0.8 큼)"""
+    d = abs(d)
+    if d >= 0.8:
+        return "큼"
+    if d >= 0.5:
+        return "중간"
+    if d >= 0.2:
+        return "작음"
+    return "미미"
+
+def format_statistics(tests, pairs, limit=3):
+    """분석 텍스트용 검정 결과 요약"""
+    verdict = "유의함" if tests["significant"] else "유의하지 않음"
+    lines = [
+        f"부서 간 차이: {verdict} (ANOVA F={tests['f_stat']:.2f}, p={tests['anova_p']:.3f}, "
+        f"η²={tests['eta_sq']:.3f} / Kruskal-Wallis H={tests['h_stat']:.2f}, p={tests['kruskal_p']:.3f})"
+    ]
+    for _, row in pairs.head(limit).iterrows():
+        lines.append(f"- {row['department_a']} vs {row['department_b']}: "
+                     f"d={row['cohens_d']:+.2f} ({effect_size_label(row['cohens_d'])})")
+    return "\n".join(lines)
@@ -0,0 +1,274 @@
+import re
+import threading
+from collections import Counter
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from frontend.database import get_db_connection
+from frontend.services.dimensions import get_labels
+from frontend.services.profiler import profiled
+
+# 여러 값이 들어가는 항목 (자격증/기술) -> respondent_tags
+TAG_FIELDS = ("certifications", "programming_skills")
+TAG_SEPARATORS = re.compile(r"[,/;|\n·]+")
+# 빈 엑셀 셀이 'NaN' 문자열로 저장된 경우 등 결측 표기
+MISSING_VALUES = {"", "nan", "none", "null", "-", "없음", "해당없음"}
+
+# 자유 서술 항목 -> comment_terms / department_terms
+TEXT_FIELD = "comments"
+TOP_TERMS_PER_DEPARTMENT = 20
+
+# 한글/영문/숫자 토큰 (C++, C# 같은 표기 포함)
+_TOKEN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9+#.]*|[0-9]+")
+_HANGUL = re.compile(r"^[가-힣]+$")
+
+# 형태소 분석기 없이 떼어내는 조사/어미 (긴 것부터 비교)
+_SUFFIXES = sorted([
+    "습니다", "합니다", "됩니다", "입니다", "했으면", "되었으면", "하면", "하지", "해서",
+    "하고", "했다", "한다", "하는", "되는", "되어", "되었", "이었", "였으면", "으면", "면",
+    "에서", "에게", "한테", "으로", "부터", "까지", "보다", "처럼", "이나", "이고",
+    "은", "는", "이", "가", "을", "를", "에", "로", "와", "과", "의", "도", "만", "요", "고"
+], key=len, reverse=True)
+_STOPWORDS = {
+    "그리고", "하지만", "그러나", "너무", "매우", "정말", "조금", "많이", "좋겠", "않",
+    "있", "없", "같", "합니", "했으", "되었", "것", "수", "등", "및", "더", "잘", "좀",
+    "합니다", "입니다", "있습니다", "없습니다", "the", "and", "for", "with"
+}
+
+# 프로세스 전역 캐시 {(file_id, 이름): 결과}, 업로드 시 계산된 값은 바뀌지 않음
+_cache = {}
+_lock = threading.Lock()
+
+def create_text_tables(cur):
+    """태그/단어 색인 테이블 (마이그레이션 9번)"""
+    cur.execute("""
+        -- 자격증/기술 정규화 태그 (응답자 x 태그)
+        CREATE TABLE IF NOT EXISTS respondent_tags (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            respondent_id VARCHAR(50),
+            field VARCHAR(30),
+            tag VARCHAR(100),
+            PRIMARY KEY (file_id, field, tag, respondent_id)
+        );
+
+        -- 의견 단어 색인 (응답자 x 단어 빈도, 희소 행렬)
+        CREATE TABLE IF NOT EXISTS comment_terms (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            respondent_id VARCHAR(50),
+            term VARCHAR(100),
+            tf SMALLINT,
+            PRIMARY KEY (file_id, respondent_id, term)
+        );
+
+        -- 부서별 상위 TF-IDF 단어 (부서 = 문서, 0: 부서 미지정)
+        CREATE TABLE IF NOT EXISTS department_terms (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            department_code SMALLINT,
+            term VARCHAR(100),
+            tf INTEGER,
+            tfidf DOUBLE PRECISION,
+            rank SMALLINT,
+            PRIMARY KEY (file_id, department_code, term)
+        );
+        CREATE INDEX IF NOT EXISTS idx_comment_terms_file_term ON comment_terms (file_id, term);
+    """)
+
+def _is_missing(text):
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return True
+    return str(text).strip().casefold() in MISSING_VALUES
+
+def normalize_tag(value):
+    """공백 정리 + 영문 대소문자 통일용 키 (표시는 가장 많이 쓰인 표기)
+
+    구분자 없이 긴 항목은 respondent_tags.tag(VARCHAR(100)) 길이로 자름 (의견 단어와 동일)
+    """
+    value = re.sub(r"\s+", " ", str(value)).strip()[:100].rstrip()
+    return value, value.casefold()
+
+def split_tags(text):
+    """구분자(, / ; | 줄바꿈)로 나눈 정규화 태그 목록 (중복 제거)"""
+    if _is_missing(text):
+        return []
+    tags = {}
+    for part in TAG_SEPARATORS.split(str(text)):
+        display, key = normalize_tag(part)
+        if key not in MISSING_VALUES:
+            tags.setdefault(key, display)
+    return list(tags.items())
+
+def _strip_suffix(token):
+    # 한 글자 조사는 두 글자 이상 남을 때만 제거 ('평가' -> '평' 방지)
+    for suffix in _SUFFIXES:
+        keep = 2 if len(suffix) == 1 else 1
+        if len(token) >= len(suffix) + keep and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+def tokenize(text):
+    """한국어 의견 토큰화: 한글은 조사/어미 제거, 영문은 소문자, 불용어/한 글자 제외"""
+    if _is_missing(text):
+        return []
+    tokens = []
+    for token in _TOKEN.findall(str(text)):
+        token = _strip_suffix(token) if _HANGUL.match(token) else token.lower()
+        if len(token) >= 2 and token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+def _tag_rows(respondents):
+    rows, spellings = [], {}
+    for field in TAG_FIELDS:
+        for respondent_id, text in zip(respondents["respondent_id"], respondents[field]):
+            for key, display in split_tags(text):
+                rows.append((field, key, respondent_id))
+                counts = spellings.setdefault((field, key), {})
+                counts[display] = counts.get(display, 0) + 1
+    # 같은 키의 표기 중 가장 많이 쓰인 것으로 저장
+    canonical = {k: max(v.items(), key=lambda item: item[1])[0] for k, v in spellings.items()}
+    return sorted({(field, canonical[(field, key)], respondent_id) for field, key, respondent_id in rows})
+
+def department_tfidf(terms, top=TOP_TERMS_PER_DEPARTMENT):
+    """부서 x 단어 빈도 행렬로 부서별 TF-IDF 상위 단어 계산
+
+    terms: (department_code, term, tf) 응답자별 단어 빈도
+    idf = ln((1 + 부서 수) / (1 + 단어가 나온 부서 수)) + 1, tf는 부서 내 상대빈도
+    """
+    columns = ["department_code", "term", "tf", "tfidf", "rank"]
+    if terms.empty:
+        return pd.DataFrame(columns=columns)
+
+    dept_idx, departments = pd.factorize(terms["department_code"], sort=True)
+    term_idx, vocabulary = pd.factorize(terms["term"])
+    counts = np.zeros((len(departments), len(vocabulary)))
+    np.add.at(counts, (dept_idx, term_idx), terms["tf"].to_numpy(dtype=float))
+
+    doc_freq = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(departments)) / (1 + doc_freq)) + 1
+    tfidf = counts / counts.sum(axis=1, keepdims=True) * idf
+
+    rows = []
+    for d, department in enumerate(departments):
+        order = np.argsort(-tfidf[d], kind="stable")[:top]
+        order = order[counts[d, order] > 0]
+        for rank, t in enumerate(order, start=1):
+            rows.append((int(department), vocabulary[t], int(counts[d, t]), float(tfidf[d, t]), rank))
+    return pd.DataFrame(rows, columns=columns)
+
+def build_text_index(respondents):
+    """응답자 DataFrame(respondent_id, department_code, 태그 항목, 의견)에서 태그/단어 빈도/부서별 TF-IDF 계산
+
+    반환값: (태그 행 목록, 응답자별 단어 빈도 DataFrame, 부서별 상위 단어 DataFrame)
+    """
+    tags = _tag_rows(respondents)
+
+    term_rows = []
+    for respondent_id, department_code, text in zip(
+            respondents["respondent_id"], respondents["department_code"], respondents[TEXT_FIELD]):
+        for term, tf in Counter(term[:100] for term in tokenize(text)).items():
+            term_rows.append((respondent_id, int(department_code), term, tf))
+    terms = pd.DataFrame(term_rows, columns=["respondent_id", "department_code", "term", "tf"])
+    # 같은 respondent_id가 두 번 나오는 시트도 PK(file_id, respondent_id, term)가 겹치지 않도록 합산
+    terms = terms.groupby(["respondent_id", "department_code", "term"], as_index=False)["tf"].sum()
+    return tags, terms, department_tfidf(terms)
+
+@profiled(kind="db")
+def index_file_text(cur, file_id):
+    """응답자 자유 서술/다중값 항목을 태그, 단어 색인, 부서별 TF-IDF로 저장 (업로드 후처리)"""
+    file_id = int(file_id)
+    for table in ("respondent_tags", "comment_terms", "department_terms"):
+        cur.execute(f"DELETE FROM {table} WHERE file_id = %s", (file_id,))
+
+    cur.execute(f"""
+        SELECT respondent_id, COALESCE(department_code, 0), {", ".join(TAG_FIELDS)}, {TEXT_FIELD}
+        FROM respondents
+        WHERE file_id = %s
+    """, (file_id,))
+    respondents = pd.DataFrame(
+        cur.fetchall(), columns=["respondent_id", "department_code", *TAG_FIELDS, TEXT_FIELD]
+    )
+    tags, terms, top = build_text_index(respondents)
+
+    if tags:
+        execute_values(cur, """
+            INSERT INTO respondent_tags (file_id, field, tag, respondent_id) VALUES %s
+            ON CONFLICT DO NOTHING
+        """, [(file_id, *row) for row in tags])
+    if not terms.empty:
+        execute_values(cur, """
+            INSERT INTO comment_terms (file_id, respondent_id, term, tf) VALUES %s
+        """, [(file_id, r.respondent_id, r.term, min(int(r.tf), 32767)) for r in terms.itertuples()])
+        execute_values(cur, """
+            INSERT INTO department_terms (file_id, department_code, term, tf, tfidf, rank) VALUES %s
+        """, [(file_id, *row) for row in top.itertuples(index=False)])
+
+    with _lock:
+        for key in [key for key in _cache if key[0] == file_id]:
+            del _cache[key]
+    return {"tags": len(tags), "terms": len(terms)}
+
+def _cached_query(file_id, name, query, params):
+    key = (int(file_id), name)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+    conn = get_db_connection()
+    try:
+        df = pd.read_sql(query, conn, params=params)
+    finally:
+        conn.close()
+    with _lock:
+        _cache[key] = df
+    return df
+
+def get_tag_counts(file_id, field):
+    """태그별 보유 응답자 수와 비율(전체 태그 언급 대비 %)"""
+    return _cached_query(file_id, f"tags_{field}", """
+        SELECT
+            tag,
+            COUNT(*) AS count,
+            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) AS percentage
+        FROM respondent_tags
+        WHERE file_id = %s AND field = %s
+        GROUP BY tag
+        ORDER BY count DESC, tag
+    """, [int(file_id), field])
+
+def get_top_terms(file_id, limit=30):
+    """파일 전체 의견의 상위 단어 (빈도, 언급 응답자 수)"""
+    return _cached_query(file_id, f"terms_{limit}", """
+        SELECT term, SUM(tf) AS frequency, COUNT(*) AS respondents
+        FROM comment_terms
+        WHERE file_id = %s
+        GROUP BY term
+        ORDER BY frequency DESC, term
+        LIMIT %s
+    """, [int(file_id), int(limit)])
+
+def get_department_terms(file_id, limit=10):
+    """부서별 TF-IDF 상위 단어 (부서 라벨 포함)"""
+    df = _cached_query(file_id, f"department_terms_{limit}", """
+        SELECT department_code, term, tf, tfidf, rank
+        FROM department_terms
+        WHERE file_id = %s AND rank <= %s
+        ORDER BY department_code, rank
+    """, [int(file_id), int(limit)])
+    labels = get_labels("department", [c for c in df["department_code"].unique().tolist() if c])
+    return df.assign(department=df["department_code"].map(labels).fillna("미지정"))
+
+def build_text_summary(file_id, terms=10, tags=5, per_department=3):
+    """AI 프롬프트용 의견/자격증/기술 요약 (색인이 없으면 빈 문자열)"""
+    lines = []
+    top_terms = get_top_terms(file_id, terms)
+    if not top_terms.empty:
+        lines.append("- 의견 주요 단어: " + ", ".join(
+            f"{row.term}({row.frequency})" for row in top_terms.itertuples()))
+    for field, name in (("certifications", "자격증"), ("programming_skills", "기술")):
+        counts = get_tag_counts(file_id, field).head(tags)
+        if not counts.empty:
+            lines.append(f"- 주요 {name}: " + ", ".join(
+                f"{row.tag}({row.count}명)" for row in counts.itertuples()))
+    dept_terms = get_department_terms(file_id, per_department)
+    for department, group in dept_terms.groupby("department", sort=True):
+        lines.append(f"- {department} 특징 단어: " + ", ".join(group["term"]))
+    return "\n".join(lines)
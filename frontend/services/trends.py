@@ -0,0 +1,175 @@
+from math import erfc, sqrt
+import numpy as np
+import pandas as pd
+from frontend.database import get_db_connection
+from frontend.services.dimensions import decode
+from frontend.services.profiler import profiled
+
+INSTRUMENTS = ("oci", "cgs")
+
+# 조직 전체 행의 부서명 / 부서가 없는 응답자의 부서명
+TOTAL_LABEL = "전체"
+UNKNOWN_LABEL = "미지정"
+
+# 유의성 판정 기준 (양측 z-검정)
+SIGNIFICANCE_LEVEL = 0.05
+
+def create_score_index(cur):
+    """파일 x 진단도구 x 카테고리 x 부서 집계 인덱스 테이블 (마이그레이션 6번)"""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS file_category_scores (
+            file_id INTEGER REFERENCES uploaded_files(file_id) ON DELETE CASCADE,
+            instrument VARCHAR(3),
+            question_category VARCHAR(100),
+            department_code SMALLINT,  -- 0: 부서 미지정
+            n INTEGER,                 -- 응답자 수
+            sum_score DOUBLE PRECISION,  -- 응답자별 카테고리 평균의 합
+            sum_sq DOUBLE PRECISION,     -- 응답자별 카테고리 평균의 제곱합
+            PRIMARY KEY (file_id, instrument, question_category, department_code)
+        );
+    """)
+
+def refresh_file_scores(cur, file_id):
+    """파일의 집계 인덱스 다시 계산 (업로드 직후 한 번, 원본 응답은 이때만 스캔)"""
+    cur.execute("DELETE FROM file_category_scores WHERE file_id = %s", (int(file_id),))
+    for instrument in INSTRUMENTS:
+        cur.execute(f"""
+            INSERT INTO file_category_scores (
+                file_id, instrument, question_category, department_code,
+                n, sum_score, sum_sq
+            )
+            SELECT
+                %s, %s, question_category, department_code,
+                COUNT(*), SUM(avg_score), SUM(avg_score * avg_score)
+            FROM (
+                SELECT
+                    q.question_category,
+                    COALESCE(d.department_code, 0) AS department_code,
+                    r.respondent_id,
+                    AVG(CAST(r.response AS FLOAT)) AS avg_score
+                FROM {instrument}_responses r
+                JOIN respondents d ON r.respondent_id = d.respondent_id AND r.file_id = d.file_id
+                JOIN {instrument}_questions q ON r.survey_id = q.survey_id
+                WHERE r.file_id = %s AND r.response IS NOT NULL
+                GROUP BY q.question_category, COALESCE(d.department_code, 0), r.respondent_id
+            ) respondent_scores
+            GROUP BY question_category, department_code
+        """, (int(file_id), instrument, int(file_id)))
+
+def list_trend_files():
+    """비교 가능한(처리 완료) 파일 목록, 오래된 순"""
+    conn = get_db_connection()
+    try:
+        return pd.read_sql("""
+            SELECT file_id, file_name, uploaded_at
+            FROM uploaded_files
+            WHERE status = 'completed'
+            ORDER BY uploaded_at, file_id
+        """, conn)
+    finally:
+        conn.close()
+
+@profiled(kind="sql")
+def load_trend_scores(file_ids, instrument):
+    """선택한 파일들의 부서 x 카테고리 집계 (인덱스 테이블만 조회, 원본 응답 재스캔 없음)"""
+    conn = get_db_connection()
+    try:
+        scores = pd.read_sql("""
+            SELECT file_id, question_category, department_code, n, sum_score, sum_sq
+            FROM file_category_scores
+            WHERE file_id = ANY(%s) AND instrument = %s
+        """, conn, params=[[int(f) for f in file_ids], instrument])
+    finally:
+        conn.close()
+
+    scores = decode(scores, "department")
+    scores["department"] = scores["department"].fillna(UNKNOWN_LABEL)
+    return scores
+
+def _with_statistics(scores):
+    """n/합계/제곱합에서 평균과 표본분산 계산"""
+    n = scores["n"].to_numpy(dtype=float)
+    mean = scores["sum_score"].to_numpy() / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.where(n > 1, (scores["sum_sq"].to_numpy() - n * mean ** 2) / (n - 1), np.nan)
+    return scores.assign(mean=mean, var=np.clip(var, 0, None))
+
+def summarize_scores(scores):
+    """부서별 행 + 조직 전체 행(부서 합산)에 평균/분산 추가"""
+    totals = scores.groupby(["file_id", "question_category"], as_index=False)[
+        ["n", "sum_score", "sum_sq"]
+    ].sum()
+    totals["department"] = TOTAL_LABEL
+    combined = pd.concat([scores.drop(columns="department_code", errors="ignore"), totals],
+                         ignore_index=True)
+    return _with_statistics(combined)
+
+def compare_files(scores, base_file_id, target_file_id):
+    """두 파일의 부서 x 카테고리 평균 차이와 z-검정 유의성"""
+    summary = summarize_scores(scores)
+    keys = ["question_category", "department"]
+    columns = keys + ["n", "mean", "var"]
+    base = summary[summary["file_id"] == base_file_id][columns]
+    target = summary[summary["file_id"] == target_file_id][columns]
+    merged = base.merge(target, on=keys, suffixes=("_base", "_target"))
+
+    merged["delta"] = merged["mean_target"] - merged["mean_base"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = np.sqrt(merged["var_base"] / merged["n_base"] + merged["var_target"] / merged["n_target"])
+        merged["z"] = np.where(se > 0, merged["delta"] / se, np.nan)
+    merged["p_value"] = merged["z"].abs().map(
+        lambda z: erfc(z / sqrt(2)) if pd.notna(z) else np.nan
+    )
+    merged["significant"] = merged["p_value"] < SIGNIFICANCE_LEVEL
+    return merged.sort_values(keys).reset_index(drop=True)
+
+def category_trend(scores):
+    """파일별 조직 전체 카테고리 평균 (추세선용)"""
+    summary = summarize_scores(scores)
+    return summary[summary["department"] == TOTAL_LABEL][["file_id", "question_category", "n", "mean"]]
+
+def previous_file_id(file_id):
+    """file_id 바로 이전에 업로드된 처리 완료 파일 (없으면 None)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT p.file_id
+            FROM uploaded_files f
+            JOIN uploaded_files p
+              ON (p.uploaded_at, p.file_id) < (f.uploaded_at, f.file_id)
+            WHERE f.file_id = %s AND p.status = 'completed'
+            ORDER BY p.uploaded_at DESC, p.file_id DESC
+            LIMIT 1
+        """, (int(file_id),))
+        row = cur.fetchone()
+        return row[0] if row else None
+    finally:
+        cur.close()
+        conn.close()
+
+def format_trend_for_prompt(comparison, limit=10):
+    """리포트/프롬프트용 변화 요약 (조직 전체 + 유의한 부서 변화 상위 limit개)"""
+    lines = []
+    overall = comparison[comparison["department"] == TOTAL_LABEL]
+    for _, row in overall.iterrows():
+        flag = " (유의)" if row["significant"] else ""
+        lines.append(f"- 전체 {row['question_category']}: {row['mean_base']:.2f} → "
+                     f"{row['mean_target']:.2f} ({row['delta']:+.2f}){flag}")
+
+    departments = comparison[(comparison["department"] != TOTAL_LABEL) & comparison["significant"]]
+    top = departments.reindex(departments["delta"].abs().sort_values(ascending=False).index).head(limit)
+    for _, row in top.iterrows():
+        lines.append(f"- {row['department']} {row['question_category']}: {row['delta']:+.2f}점 "
+                     f"(p={row['p_value']:.3f})")
+    return "\n".join(lines)
+
+def build_trend_summary(file_id, instrument):
+    """이전 파일 대비 변화 요약 텍스트 (이전 파일이나 집계가 없으면 빈 문자열)"""
+    base_file_id = previous_file_id(file_id)
+    if base_file_id is None:
+        return ""
+    scores = load_trend_scores([base_file_id, file_id], instrument)
+    if scores.empty:
+        return ""
+    return format_trend_for_prompt(compare_files(scores, base_file_id, int(file_id)))